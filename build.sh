@@ -6,6 +6,6 @@ set -o errexit
 pip install --upgrade pip
 pip install -r requirements.txt
 
-# Run Django commands
-python manage.py collectstatic --no-input
-python manage.py migrate
+# Run Django commands against the project the Procfile serves
+python myproject/manage.py collectstatic --no-input
+python myproject/manage.py migrate
@@ -0,0 +1,167 @@
+"""
+Gunicorn configuration, passed with --config from the Procfile.
+
+The server runs from myproject/ rather than with --chdir: the repository
+root holds an older ``todos`` package that would shadow the app's.
+
+Sizing follows the CPU count unless overridden by the environment:
+
+- WEB_CONCURRENCY: worker processes (default 2 * CPUs + 1)
+- GUNICORN_THREADS: threads per worker (default 2 * CPUs, between 2 and
+  4); with more than one thread the gthread worker is used
+- GUNICORN_WORKER_CLASS: e.g. uvicorn.workers.UvicornWorker for asgi.py
+- GUNICORN_MAX_REQUESTS / GUNICORN_MAX_REQUESTS_JITTER: worker recycling
+- GUNICORN_PRELOAD, GUNICORN_WARM_UP: set to False to disable either
+- GUNICORN_WARM_UP_PATH: path requested once, unauthenticated, by every
+  new worker (default /api/)
+
+Django keeps one database connection per thread, so a deployment can
+hold up to workers * threads connections; keep that below the
+database's max_connections (Postgres defaults to 100) when raising
+either setting.
+
+The application is imported once in the master and shared copy-on-write
+by the workers. Every worker then warms itself up before accepting
+traffic, so the first requests after a deploy or a scale-up do not pay
+for URL resolver population and serializer field construction.
+Connections are not opened during the warm-up: they belong to the thread
+that opens them, and the gthread workers serve requests from other
+threads.
+"""
+import multiprocessing
+import os
+import sys
+import time
+
+cpu_count = multiprocessing.cpu_count()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', cpu_count * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', min(4, max(2, cpu_count * 2))))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync')
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'True') == 'True'
+warm_up = os.environ.get('GUNICORN_WARM_UP', 'True') == 'True'
+warm_up_path = os.environ.get('GUNICORN_WARM_UP_PATH', '/api/')
+
+# Recycle workers to bound memory growth; the jitter keeps them from all
+# restarting at the same moment
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = 30
+keepalive = 5
+
+accesslog = '-'
+errorlog = '-'
+
+
+def iter_view_classes(patterns):
+    """
+    Yield the class-based views reachable from a list of URL patterns
+    """
+    for pattern in patterns:
+        if hasattr(pattern, 'url_patterns'):
+            yield from iter_view_classes(pattern.url_patterns)
+            continue
+        view = getattr(pattern.callback, 'cls', None) or getattr(pattern.callback, 'view_class', None)
+        if view is not None:
+            yield view
+
+
+def warm_up_request(application, path):
+    """
+    Send one synthetic request through the whole middleware and view stack
+    """
+    from wsgiref.util import setup_testing_defaults
+
+    environ = {'PATH_INFO': path, 'HTTP_ACCEPT': 'application/json'}
+    setup_testing_defaults(environ)
+    response = application(environ, lambda status, headers, exc_info=None: None)
+    try:
+        for _ in response:
+            pass
+    finally:
+        if hasattr(response, 'close'):
+            response.close()
+
+
+def warm_up_worker(worker):
+    """
+    Do the per-process work Django and DRF otherwise do lazily on the
+    first requests
+    """
+    from django.db import connections
+    from django.urls import get_resolver
+
+    started = time.perf_counter()
+
+    # Import every URLconf and build the reverse lookup tables
+    resolver = get_resolver()
+    resolver.reverse_dict
+
+    # ModelSerializer builds its fields, and caches the model field
+    # mapping, the first time .fields is accessed
+    serializer_classes = set()
+    for view in iter_view_classes(resolver.url_patterns):
+        serializer_classes.add(getattr(view, 'serializer_class', None))
+        serializer_classes.update(getattr(view, 'read_serializer_classes', {}).values())
+    for serializer_class in serializer_classes - {None}:
+        if not hasattr(serializer_class, 'get_fields'):
+            continue
+        try:
+            serializer_class().fields
+        except Exception as exc:
+            worker.log.warning('Warm-up of %s failed: %s', serializer_class.__name__, exc)
+
+    # Loads middleware, authentication, content negotiation and renderers
+    if warm_up_path:
+        try:
+            warm_up_request(worker.app.wsgi(), warm_up_path)
+        except Exception as exc:
+            worker.log.warning('Warm-up request to %s failed: %s', warm_up_path, exc)
+
+    # Request threads never reuse this thread's connections, so do not
+    # keep any the warm-up request opened
+    connections.close_all()
+
+    worker.log.info('Worker warmed up in %.0f ms', (time.perf_counter() - started) * 1000)
+
+
+def on_starting(server):
+    # The task version markers live in the tasks cache; with a per-process
+    # cache a write handled by one worker would never invalidate the ETags
+    # and cached pages of the others
+    if server.cfg.workers < 2:
+        return
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+    from django.conf import settings
+
+    alias = getattr(settings, 'TASK_CACHE_ALIAS', 'default')
+    backend = settings.CACHES[alias]['BACKEND']
+    if backend.endswith('.LocMemCache'):
+        server.log.error(
+            'The %r cache uses %s, which is not shared between the %d workers; '
+            'set TASK_CACHE_BACKEND to a shared backend or WEB_CONCURRENCY=1',
+            alias, backend, server.cfg.workers
+        )
+        sys.exit(1)
+
+
+def pre_fork(server, worker):
+    # Connections opened while preloading must not be shared by children
+    if server.cfg.preload_app:
+        from django.db import connections
+        connections.close_all()
+
+
+def post_fork(server, worker):
+    if warm_up and server.cfg.preload_app:
+        warm_up_worker(worker)
+
+
+def post_worker_init(worker):
+    # Without preload the application is only imported after post_fork
+    if warm_up and not worker.cfg.preload_app:
+        warm_up_worker(worker)
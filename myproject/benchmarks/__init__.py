@@ -0,0 +1,2 @@
+# Performance benchmarks for the Todo API, run from the myproject directory:
+#   python -m benchmarks.<module> --help
@@ -0,0 +1,144 @@
+"""
+Concurrency benchmark for the sync and async task endpoints.
+
+Opens N keep-alive connections at once, each one sending requests with a
+pause between them like a slow or mostly idle client, and reports the
+throughput and latency of every server/endpoint pair at every level of
+concurrency. Start the servers first, from the myproject directory:
+
+    gunicorn myproject.wsgi:application -w 4 -b 127.0.0.1:8000
+    uvicorn myproject.asgi:application --workers 4 --port 8001
+    python manage.py issue_token <username>
+
+then compare them:
+
+    python -m benchmarks.bench_async --token <key> \\
+        --url http://127.0.0.1:8000/api/tasks/ \\
+        --url http://127.0.0.1:8001/api/async/tasks/ \\
+        --connections 10 100 1000
+
+With four sync workers, at most four connections are served at once and
+the others queue behind them; uvicorn keeps every connection open in
+each process's event loop.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from .common import print_table
+
+
+async def read_response(reader):
+    """
+    Read one HTTP/1.1 response and return its status code
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError('Connection closed by the server')
+    length = 0
+    chunked = False
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name = name.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'transfer-encoding' and 'chunked' in value.lower():
+            chunked = True
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if not size:
+                break
+    else:
+        await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+async def client(url, token, deadline, think, latencies, errors):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    request = (
+        f'GET {path} HTTP/1.1\r\n'
+        f'Host: {parts.netloc}\r\n'
+        f'Authorization: Token {token}\r\n'
+        'Accept: application/json\r\n'
+        '\r\n'
+    ).encode('latin-1')
+    try:
+        reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+    except OSError:
+        errors.append('connect')
+        return
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            await asyncio.sleep(think)
+    except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError):
+        errors.append('connection')
+    finally:
+        writer.close()
+
+
+async def run(url, token, connections, duration, think):
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(url, token, deadline, think, latencies, errors)
+        for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--url', action='append', required=True, help='Endpoint to load (repeatable)')
+    parser.add_argument('--token', required=True, help='API token of the user whose tasks are listed')
+    parser.add_argument('--connections', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per run')
+    parser.add_argument('--think', type=float, default=0.5, help='Idle seconds between requests of a client')
+    args = parser.parse_args()
+
+    rows = []
+    for url in args.url:
+        for connections in args.connections:
+            latencies, errors, elapsed = asyncio.run(
+                run(url, args.token, connections, args.duration, args.think)
+            )
+            rows.append((
+                url,
+                connections,
+                f'{len(latencies) / elapsed:.0f}',
+                f'{percentile(latencies, 0.5) * 1000:.1f}',
+                f'{percentile(latencies, 0.99) * 1000:.1f}',
+                f'{statistics.fmean(latencies) * 1000:.1f}' if latencies else 'nan',
+                len(errors),
+            ))
+
+    print_table(('url', 'connections', 'requests/s', 'p50 ms', 'p99 ms', 'mean ms', 'errors'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Compare requests/sec of BasicAuthentication and CachedTokenAuthentication.
+
+    python -m benchmarks.bench_auth --requests 200
+
+Every request hits GET /api/tasks/stats/ (one small query) through the
+full Django stack, so the difference is dominated by authentication:
+PBKDF2 per Basic request, one SHA-256 per token request, plus one token
+lookup per process and TTL window when the token cache is cold.
+"""
+import argparse
+import base64
+
+from .common import best_of, create_user, print_table, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from django.urls import reverse
+    from todos.authentication import issue_token, token_cache
+
+    user = create_user()
+    user.set_password('bench-password')
+    user.save()
+    _, key = issue_token(user, 'benchmark')
+    basic = base64.b64encode(b'bench:bench-password').decode('ascii')
+    url = reverse('task-stats')
+    client = Client()
+
+    def run(authorization, clear_cache=False):
+        def requests():
+            for _ in range(args.requests):
+                if clear_cache:
+                    token_cache.clear()
+                response = client.get(url, HTTP_AUTHORIZATION=authorization)
+                assert response.status_code == 200, response.status_code
+        return requests
+
+    scenarios = [
+        ('basic', run(f'Basic {basic}')),
+        ('token, cache cold', run(f'Token {key}', clear_cache=True)),
+        ('token, cache warm', run(f'Token {key}')),
+    ]
+    rows = []
+    baseline = None
+    for name, func in scenarios:
+        best, _, _ = best_of(func, args.repeat)
+        rate = args.requests / best
+        baseline = baseline or rate
+        rows.append((name, f'{rate:.0f}', f'{best * 1000 / args.requests:.2f}', f'{rate / baseline:.1f}x'))
+
+    print_table(('authentication', 'requests/s', 'ms/request', 'vs basic'), rows)
+
+
+if __name__ == '__main__':
+    main()
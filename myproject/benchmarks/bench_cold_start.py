@@ -0,0 +1,116 @@
+"""
+First-request latency of a freshly started gunicorn worker.
+
+    python -m benchmarks.bench_cold_start --runs 5
+
+Starts gunicorn with the repository's gunicorn.conf.py and a single
+worker, once with the post_fork warm-up and preloading disabled and once
+with both enabled. After the worker has booted, it times the first
+request, then the median of the following ones. The server uses a scratch
+SQLite database (DATABASE_URL) prepared with ``migrate``.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+from .common import print_table
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PROJECT = os.path.join(ROOT, 'myproject')
+
+CONFIGURATIONS = [
+    ('no preload, no warm-up', {'GUNICORN_PRELOAD': 'False', 'GUNICORN_WARM_UP': 'False'}),
+    ('preload + warm-up', {'GUNICORN_PRELOAD': 'True', 'GUNICORN_WARM_UP': 'True'}),
+]
+
+PREPARE = '''
+import django
+django.setup()
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from todos.authentication import issue_token
+call_command('migrate', verbosity=0)
+user, _ = User.objects.get_or_create(username='cold-start')
+print(issue_token(user)[1])
+'''
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def timed_get(url, key):
+    request = urllib.request.Request(url, headers={'Authorization': f'Token {key}'})
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def measure(env, key, settle, requests):
+    port = free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'gunicorn', 'myproject.wsgi:application',
+            '--config', os.path.join(ROOT, 'gunicorn.conf.py'),
+        ],
+        cwd=PROJECT,
+        env={**env, 'PORT': str(port), 'WEB_CONCURRENCY': '1'},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        time.sleep(settle)
+        # Different query strings so the list cache never answers
+        url = f'http://127.0.0.1:{port}/api/tasks/?limit={{}}'
+        first = timed_get(url.format(1), key)
+        rest = [timed_get(url.format(index + 2), key) for index in range(requests)]
+        return first, statistics.median(rest)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--runs', type=int, default=5, help='Server starts per configuration')
+    parser.add_argument('--requests', type=int, default=20, help='Warm requests timed after the first')
+    parser.add_argument('--settle', type=float, default=3.0, help='Seconds to let the worker boot')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'myproject.settings',
+            'DATABASE_URL': f"sqlite:///{os.path.join(directory, 'cold-start.sqlite3')}",
+        }
+        key = subprocess.run(
+            [sys.executable, '-c', PREPARE], cwd=PROJECT, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout.strip().splitlines()[-1]
+
+        rows = []
+        for name, overrides in CONFIGURATIONS:
+            results = [
+                measure({**env, **overrides}, key, args.settle, args.requests)
+                for _ in range(args.runs)
+            ]
+            first = statistics.median(result[0] for result in results)
+            warm = statistics.median(result[1] for result in results)
+            rows.append((name, f'{first * 1000:.1f}', f'{warm * 1000:.1f}', f'{first / warm:.1f}x'))
+
+    print_table(('configuration', 'first request ms', 'warm request ms', 'first / warm'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare response encodings and compression for large task lists.
+
+    python -m benchmarks.bench_rendering --size 10000
+
+Renders one list page of ``--size`` tasks, built by TaskReadSerializer
+like GET /api/tasks/ does, with DRF's JSONRenderer, ORJSONRenderer and
+MessagePackRenderer (when msgpack is installed), parses it back with the
+matching parsers, and reports the bytes on the wire and the compression
+time of each encoding the CompressionMiddleware can negotiate.
+"""
+import argparse
+import io
+from types import SimpleNamespace
+
+from .common import best_of, create_user, print_table, seed_tasks, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--size', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from todos.middleware import CompressionMiddleware
+    from todos.models import Task
+    from todos.parsers import MessagePackParser, ORJSONParser
+    from todos.renderers import MessagePackRenderer, ORJSONRenderer
+    from todos.serializers import TaskReadSerializer
+
+    user = create_user()
+    seed_tasks(user, args.size)
+    queryset = TaskReadSerializer.prepare_queryset(
+        Task.objects.filter(user=user).order_by('-timestamp', '-id')
+    )
+
+    def page(renderer):
+        # Serializers format datetimes according to the negotiated renderer
+        request = SimpleNamespace(user=user, accepted_renderer=renderer)
+        context = {'request': request}
+        return {'next': None, 'results': TaskReadSerializer(queryset, many=True, context=context).data}
+
+    formats = [
+        ('JSONRenderer', JSONRenderer(), JSONParser()),
+        ('ORJSONRenderer', ORJSONRenderer(), ORJSONParser()),
+    ]
+    if MessagePackRenderer.available:
+        formats.append(('MessagePackRenderer', MessagePackRenderer(), MessagePackParser()))
+
+    rows = []
+    bodies = {}
+    for name, renderer, parser in formats:
+        data = page(renderer)
+        render_best, _, body = best_of(lambda: renderer.render(data), args.repeat)
+        parse_best, _, _ = best_of(lambda: parser.parse(io.BytesIO(body)), args.repeat)
+        rows.append((name, f'{render_best * 1000:.1f}', f'{parse_best * 1000:.1f}', len(body)))
+        bodies[renderer.media_type] = body
+    print_table(('encoder', 'render ms', 'parse ms', 'bytes'), rows)
+    print()
+
+    middleware = CompressionMiddleware(lambda request: None)
+    rows = []
+    for media_type, body in bodies.items():
+        rows.append((media_type, 'identity', '0.0', len(body)))
+        for encoding in reversed(middleware.get_encodings()):
+            compress_best, _, compressed = best_of(
+                lambda: middleware.compress(encoding, body), args.repeat
+            )
+            rows.append((media_type, encoding, f'{compress_best * 1000:.1f}', len(compressed)))
+    print_table(('media type', 'encoding', 'compress ms', 'bytes'), rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare TaskSerializer with the values()-based TaskReadSerializer.
+
+    python -m benchmarks.bench_serializers --sizes 1000 10000 100000
+
+Both paths are timed end to end, SQL included, for one list page of the
+given size.
+"""
+import argparse
+from types import SimpleNamespace
+
+from .common import best_of, create_user, print_table, seed_tasks, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db.models import Prefetch
+    from todos.models import Task, Tag
+    from todos.serializers import TaskReadSerializer, TaskSerializer
+
+    user = create_user()
+    context = {'request': SimpleNamespace(user=user)}
+    rows = []
+    seeded = 0
+    for size in sorted(args.sizes):
+        seed_tasks(user, size - seeded)
+        seeded = size
+        queryset = Task.objects.filter(user=user).order_by('-timestamp', '-id')
+
+        def model_path():
+            tasks = queryset.prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.order_by('id'))
+            )
+            return TaskSerializer(tasks, many=True, context=context).data
+
+        def fast_path():
+            values = TaskReadSerializer.prepare_queryset(queryset)
+            return TaskReadSerializer(values, many=True, context=context).data
+
+        model_best, _, _ = best_of(model_path, args.repeat)
+        fast_best, _, _ = best_of(fast_path, args.repeat)
+        rows.append((
+            size,
+            f'{model_best * 1000:.1f}',
+            f'{fast_best * 1000:.1f}',
+            f'{model_best / fast_best:.1f}x',
+        ))
+
+    print_table(('rows', 'TaskSerializer ms', 'TaskReadSerializer ms', 'speedup'), rows)
+
+
+if __name__ == '__main__':
+    main()
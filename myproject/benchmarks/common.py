@@ -0,0 +1,87 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Each benchmark runs against a throw-away test database created the same
+way ``manage.py test`` does, so it never touches db.sqlite3.
+"""
+import os
+import statistics
+import time
+
+
+def setup_django(settings_module='myproject.settings'):
+    """
+    Configure Django and create a fresh test database
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+def best_of(func, repeat=3):
+    """
+    Run func repeat times and return (best seconds, median seconds, last result)
+    """
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings), result
+
+
+def create_user(username='bench'):
+    from django.contrib.auth.models import User
+    user, _ = User.objects.get_or_create(username=username)
+    return user
+
+
+def seed_tasks(user, count, tags_per_task=2, tag_pool=20, batch_size=5000):
+    """
+    Bulk create count tasks for user, each carrying a few tags
+    """
+    from django.utils import timezone
+    from todos.models import Task, Tag
+
+    tags = list(Tag.objects.filter(name__startswith='bench-'))
+    if not tags:
+        tags = Tag.objects.bulk_create([
+            Tag(name=f'bench-{i}') for i in range(tag_pool)
+        ])
+    statuses = [choice for choice, _ in Task.StatusChoices.choices]
+    now = timezone.now()
+
+    through = Task.tags.through
+    for start in range(0, count, batch_size):
+        tasks = Task.objects.bulk_create([
+            Task(
+                user=user,
+                title=f'Benchmark task {i}',
+                description='Generated for benchmarking ' * 4,
+                status=statuses[i % len(statuses)],
+                due_date=now if i % 3 else None,
+            )
+            for i in range(start, min(start + batch_size, count))
+        ])
+        through.objects.bulk_create([
+            through(task_id=task.id, tag_id=tags[(task.id + offset) % len(tags)].id)
+            for task in tasks
+            for offset in range(tags_per_task)
+        ], ignore_conflicts=True)
+
+
+def print_table(headers, rows):
+    widths = [
+        max(len(str(value)) for value in column)
+        for column in zip(headers, *rows)
+    ]
+    line = '  '.join(f'{{:>{width}}}' for width in widths)
+    print(line.format(*headers))
+    for row in rows:
+        print(line.format(*row))
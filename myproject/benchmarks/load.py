@@ -0,0 +1,410 @@
+"""
+Load test of the task API endpoints.
+
+    python -m benchmarks.load --users 20 --tasks-per-user 2000 \\
+        --concurrency 8 --duration 10 --output before.json
+    python -m benchmarks.load ... --output after.json --compare before.json
+
+Seeds a scratch database (or DATABASE_URL with --database-url) and serves
+myproject.wsgi in-process with Django's threaded development server on a
+free local port. Then each scenario runs for --duration seconds with
+--concurrency client threads, each holding one keep-alive connection.
+
+For every scenario it reports requests/s, p50/p95/p99 latency and the
+error count measured by the clients, plus the SQL query count and time
+per request measured inside the server. Results can be written as JSON
+and compared with the results of another commit.
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .common import print_table
+
+SCENARIO_HEADER = 'X-Bench-Scenario'
+
+
+@dataclass
+class Scenario:
+    """
+    One endpoint under load. ``build(rng, fixture, user)`` returns the
+    path and the JSON body (or None) of the next request; a None path
+    ends the client's run.
+    """
+    name: str
+    method: str
+    build: Callable
+    content_type: Optional[str] = None
+    accept: str = 'application/json'
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def build_scenarios():
+    def task_of(rng, fixture, user):
+        return rng.choice(fixture['tasks'][user['id']])
+
+    def list_first_page(rng, fixture, user):
+        return '/api/tasks/', None
+
+    def list_deep_page(rng, fixture, user):
+        return f"/api/tasks/?cursor={rng.choice(fixture['cursors'][user['id']])}", None
+
+    def list_filtered(rng, fixture, user):
+        status = rng.choice(['OPEN', 'WORKING', 'COMPLETED', 'OVERDUE'])
+        return f'/api/tasks/?status={status}&has_due_date=true', None
+
+    def search(rng, fixture, user):
+        return f"/api/tasks/?q={rng.choice(['benchmark', 'task', 'generated'])}", None
+
+    def retrieve(rng, fixture, user):
+        return f'/api/tasks/{task_of(rng, fixture, user)}/', None
+
+    def create(rng, fixture, user):
+        return '/api/tasks/', {'title': 'Load test', 'description': 'Created under load'}
+
+    def update(rng, fixture, user):
+        status = rng.choice(['OPEN', 'WORKING', 'COMPLETED'])
+        return f'/api/tasks/{task_of(rng, fixture, user)}/', {'status': status}
+
+    def delete(rng, fixture, user):
+        try:
+            return f"/api/tasks/{fixture['deletable'][user['id']].pop()}/", None
+        except IndexError:
+            return None, None
+
+    def batch(rng, fixture, user):
+        return '/api/tasks/batch/', {
+            'operations': [
+                {'op': 'create', 'data': {'title': f'Batch {index}', 'description': 'Batch'}}
+                for index in range(10)
+            ]
+        }
+
+    def stats(rng, fixture, user):
+        return '/api/tasks/stats/', None
+
+    def export(rng, fixture, user):
+        return '/api/tasks/export/?status=WORKING', None
+
+    return [
+        Scenario('list', 'GET', list_first_page),
+        Scenario('list-deep-page', 'GET', list_deep_page),
+        Scenario('list-filtered', 'GET', list_filtered),
+        Scenario('search', 'GET', search),
+        Scenario('retrieve', 'GET', retrieve),
+        Scenario('stats', 'GET', stats),
+        Scenario('export', 'GET', export, accept='application/x-ndjson'),
+        Scenario('create', 'POST', create, 'application/json'),
+        Scenario('update', 'PATCH', update, 'application/json'),
+        Scenario('batch', 'POST', batch, 'application/json'),
+        Scenario('delete', 'DELETE', delete),
+    ]
+
+
+class SQLStats:
+    """
+    Wraps the WSGI application to count the queries every request runs,
+    grouped by the scenario named in the X-Bench-Scenario header
+    """
+
+    def __init__(self, application):
+        self.application = application
+        self.lock = threading.Lock()
+        self.totals = {}
+
+    def __call__(self, environ, start_response):
+        from django.db import connection
+
+        counter = {'queries': 0, 'seconds': 0.0}
+
+        def count(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                counter['queries'] += 1
+                counter['seconds'] += time.perf_counter() - start
+
+        # Streaming responses run their queries while being iterated, so
+        # the body is consumed inside the wrapper
+        with connection.execute_wrapper(count):
+            response = self.application(environ, start_response)
+            try:
+                body = b''.join(response)
+            finally:
+                if hasattr(response, 'close'):
+                    response.close()
+
+        scenario = environ.get('HTTP_' + SCENARIO_HEADER.upper().replace('-', '_'), 'other')
+        with self.lock:
+            totals = self.totals.setdefault(scenario, {'requests': 0, 'queries': 0, 'seconds': 0.0})
+            totals['requests'] += 1
+            totals['queries'] += counter['queries']
+            totals['seconds'] += counter['seconds']
+        return [body]
+
+    def reset(self):
+        with self.lock:
+            self.totals = {}
+
+
+def start_server(application):
+    """
+    Serve ``application`` from a daemon thread and return (server, port)
+    """
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+    class QuietHandler(WSGIRequestHandler):
+        def setup(self):
+            super().setup()
+            # Headers and body are written separately; without this, Nagle's
+            # algorithm and the client's delayed ACK add ~40 ms per response
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=False)
+    server.daemon_threads = True
+    server.set_app(application)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, server.server_address[1]
+
+
+def seed(users, tasks_per_user, seed_value):
+    """
+    Create users with tokens and tasks, and return the fixture the
+    scenarios draw their requests from
+    """
+    from django.contrib.auth.models import User
+    from django.core.management import call_command
+    from todos.authentication import issue_token
+    from todos.models import Task
+    from todos.pagination import TaskCursorPagination
+    from todos.stats import rebuild_task_stats
+    from .common import seed_tasks
+
+    call_command('migrate', verbosity=0)
+    rng = random.Random(seed_value)
+    paginator = TaskCursorPagination()
+    fixture = {'users': [], 'tasks': {}, 'cursors': {}, 'deletable': {}}
+    for index in range(users):
+        user, created = User.objects.get_or_create(username=f'load-{index}')
+        if created or not Task.objects.filter(user=user).exists():
+            seed_tasks(user, tasks_per_user)
+        _, key = issue_token(user, 'load test')
+        ids = list(Task.objects.filter(user=user).values_list('id', flat=True))
+        fixture['users'].append({'id': user.pk, 'token': key})
+        fixture['tasks'][user.pk] = rng.sample(ids, min(len(ids), 1000))
+        # Cursors pointing halfway and three quarters down the user's list
+        rows = list(Task.objects.filter(user=user).order_by('-timestamp', '-id').values('timestamp', 'id'))
+        fixture['cursors'][user.pk] = [
+            paginator.encode_cursor(paginator.get_position(rows[len(rows) * depth // 4]))
+            for depth in (2, 3) if rows
+        ] or ['']
+        # Tasks the delete scenario may remove without touching the others
+        fixture['deletable'][user.pk] = [
+            task.id for task in Task.objects.bulk_create(
+                Task(user=user, title='Delete me', description='Load test') for _ in range(2000)
+            )
+        ]
+    rebuild_task_stats()
+    return fixture
+
+
+def run_scenario(scenario, fixture, port, concurrency, duration, seed_value):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index):
+        rng = random.Random(seed_value * 1000 + index)
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        connection.connect()
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        own_latencies, own_errors = [], 0
+        while time.perf_counter() < deadline:
+            user = rng.choice(fixture['users'])
+            path, body = scenario.build(rng, fixture, user)
+            if path is None:
+                break
+            headers = {
+                'Authorization': f"Token {user['token']}",
+                'Accept': scenario.accept,
+                SCENARIO_HEADER: scenario.name,
+            }
+            payload = None
+            if body is not None:
+                payload = json.dumps(body).encode('utf-8')
+                headers['Content-Type'] = scenario.content_type
+            start = time.perf_counter()
+            try:
+                connection.request(scenario.method, path, body=payload, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                status = None
+            own_latencies.append(time.perf_counter() - start)
+            if status is None or status >= 400:
+                own_errors += 1
+        connection.close()
+        with lock:
+            latencies.extend(own_latencies)
+            errors.append(own_errors)
+
+    threads = [threading.Thread(target=client, args=(index,)) for index in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sorted(latencies), sum(errors), time.perf_counter() - started
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    """
+    Print the change of each scenario against a previous results file
+    """
+    previous = {row['scenario']: row for row in baseline['scenarios']}
+    rows = []
+    for row in results['scenarios']:
+        before = previous.get(row['scenario'])
+        if before is None or not before['requests_per_second'] or not before['p95_ms']:
+            continue
+        rows.append((
+            row['scenario'],
+            f"{before['requests_per_second']:.0f} -> {row['requests_per_second']:.0f}",
+            f"{(row['requests_per_second'] / before['requests_per_second'] - 1) * 100:+.0f}%",
+            f"{before['p95_ms']:.1f} -> {row['p95_ms']:.1f}",
+            f"{before['queries_per_request']:.1f} -> {row['queries_per_request']:.1f}",
+        ))
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    print_table(('scenario', 'requests/s', 'change', 'p95 ms', 'queries/request'), rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--tasks-per-user', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per scenario')
+    parser.add_argument('--scenarios', nargs='+', help='Only run these scenarios')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--database-url', help='Use this database instead of a scratch SQLite file')
+    parser.add_argument('--list-cache', action='store_true', help='Enable the server-side list cache')
+    parser.add_argument('--output', help='Write the results to this JSON file')
+    parser.add_argument('--compare', help='Results file of a previous run to compare with')
+    args = parser.parse_args()
+
+    directory = tempfile.TemporaryDirectory()
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(directory.name, 'load.sqlite3')}"
+    os.environ['TASK_LIST_CACHE_ENABLED'] = str(args.list_cache)
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.core.wsgi import get_wsgi_application
+
+    scenarios = build_scenarios()
+    if args.scenarios:
+        unknown = set(args.scenarios) - {scenario.name for scenario in scenarios}
+        if unknown:
+            parser.error(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+        scenarios = [scenario for scenario in scenarios if scenario.name in args.scenarios]
+
+    print(f'Seeding {args.users} users x {args.tasks_per_user} tasks...', file=sys.stderr)
+    fixture = seed(args.users, args.tasks_per_user, args.seed)
+    application = SQLStats(get_wsgi_application())
+    server, port = start_server(application)
+
+    results = {
+        'commit': git_commit(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'database': settings.DATABASES['default']['ENGINE'],
+        'config': {
+            key: getattr(args, key)
+            for key in ('users', 'tasks_per_user', 'concurrency', 'duration', 'seed', 'list_cache')
+        },
+        'scenarios': [],
+    }
+    try:
+        for scenario in scenarios:
+            print(f'Running {scenario.name}...', file=sys.stderr)
+            application.reset()
+            latencies, errors, elapsed = run_scenario(
+                scenario, fixture, port, args.concurrency, args.duration, args.seed
+            )
+            sql = application.totals.get(scenario.name, {'requests': 0, 'queries': 0, 'seconds': 0.0})
+            served = sql['requests'] or 1
+            results['scenarios'].append({
+                'scenario': scenario.name,
+                'requests': len(latencies),
+                'errors': errors,
+                'requests_per_second': len(latencies) / elapsed,
+                'p50_ms': (percentile(latencies, 0.50) or 0) * 1000,
+                'p95_ms': (percentile(latencies, 0.95) or 0) * 1000,
+                'p99_ms': (percentile(latencies, 0.99) or 0) * 1000,
+                'queries_per_request': sql['queries'] / served,
+                'sql_ms_per_request': sql['seconds'] * 1000 / served,
+            })
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    print_table(
+        ('scenario', 'requests/s', 'p50 ms', 'p95 ms', 'p99 ms', 'queries/req', 'SQL ms/req', 'errors'),
+        [
+            (
+                row['scenario'],
+                f"{row['requests_per_second']:.0f}",
+                f"{row['p50_ms']:.1f}",
+                f"{row['p95_ms']:.1f}",
+                f"{row['p99_ms']:.1f}",
+                f"{row['queries_per_request']:.1f}",
+                f"{row['sql_ms_per_request']:.2f}",
+                row['errors'],
+            )
+            for row in results['scenarios']
+        ]
+    )
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+    if args.compare:
+        with open(args.compare) as handle:
+            compare(results, json.load(handle))
+    directory.cleanup()
+
+
+if __name__ == '__main__':
+    main()
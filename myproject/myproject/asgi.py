@@ -3,6 +3,18 @@ ASGI config for myproject project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Served over ASGI, the async task endpoints under /api/async/tasks/ hold a
+slow or idle keep-alive connection without occupying a worker. Run it from
+the myproject directory with uvicorn:
+
+    uvicorn myproject.asgi:application --workers 4
+
+or under gunicorn's process management with uvicorn workers:
+
+    gunicorn myproject.asgi:application -k uvicorn.workers.UvicornWorker -w 4
+
+The DRF endpoints under /api/ keep working and run in a thread pool.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -14,3 +26,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
 
 application = get_asgi_application()
+
+# Optional periodic overdue detection, enabled by TASK_OVERDUE_INTERVAL
+from todos.overdue import start_overdue_scheduler  # noqa: E402
+
+start_overdue_scheduler()
@@ -10,7 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
+import os
+import tempfile
+import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -20,18 +24,22 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-hr4gc=@@-gzt-jsdr&u5cl5!+(p4a=)*1nhgjypcnv56_-%u-9'
+SECRET_KEY = os.environ.get('SECRET_KEY', 'django-insecure-hr4gc=@@-gzt-jsdr&u5cl5!+(p4a=)*1nhgjypcnv56_-%u-9')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DEBUG', 'False') == 'True'
 
-ALLOWED_HOSTS = []
+# Comma-separated, e.g. ALLOWED_HOSTS=api.example.com,.onrender.com
+ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', 'localhost,127.0.0.1,.onrender.com').split(',')
 
 
 # Application definition
 
+# API-only processes (DJANGO_API_ONLY=True) leave out the admin, so neither
+# it nor the apps' admin modules are imported when a worker starts
+API_ONLY = os.environ.get('DJANGO_API_ONLY', 'False') == 'True'
+
 INSTALLED_APPS = [
-    'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -40,9 +48,13 @@ INSTALLED_APPS = [
     'rest_framework',
     'todos',
 ]
+if not API_ONLY:
+    INSTALLED_APPS.insert(0, 'django.contrib.admin')
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Ahead of everything that may change the body, see TASK_COMPRESSION_*
+    'todos.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -50,6 +62,10 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+# Serves collectstatic's output (the admin's assets) when DEBUG is off;
+# it answers before CompressionMiddleware with its own compressed files
+if find_spec('whitenoise') is not None:
+    MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')
 
 ROOT_URLCONF = 'myproject.urls'
 
@@ -74,14 +90,88 @@ WSGI_APPLICATION = 'myproject.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+#
+# Configured from DATABASE_URL (SQLite file next to manage.py when unset).
+# DB_CONN_MAX_AGE keeps connections open across requests and
+# DB_CONN_HEALTH_CHECKS pings a reused connection before the request uses
+# it. For PostgreSQL, DB_POOL=True switches to psycopg 3's connection pool
+# (sized by DB_POOL_MIN_SIZE/DB_POOL_MAX_SIZE), which replaces persistent
+# connections. SQLite connections get WAL and the pragmas below unless
+# SQLITE_TUNING=False.
 
 DATABASES = {
+    'default': dj_database_url.config(
+        default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+        conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        conn_health_checks=os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+    )
+}
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    if os.environ.get('DB_POOL', 'False') == 'True':
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        }
+elif (DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3'
+        and os.environ.get('SQLITE_TUNING', 'True') == 'True'):
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        # WAL lets readers run alongside the single writer; NORMAL only
+        # syncs at checkpoints, which is durable enough in WAL mode
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            f"PRAGMA mmap_size={os.environ.get('SQLITE_MMAP_SIZE', '134217728')};"
+            f"PRAGMA busy_timeout={os.environ.get('SQLITE_BUSY_TIMEOUT', '5000')};"
+            'PRAGMA temp_store=MEMORY;'
+        ),
+        # Take the write lock when the transaction starts, so two
+        # transactions never deadlock upgrading their read locks
+        'transaction_mode': 'IMMEDIATE',
+    })
+
+
+# Caches
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+#
+# The tasks cache holds per-user version markers and serialized task list
+# pages, and every process serving the API must see the same markers: a
+# write handled by one worker has to invalidate the ETags and pages of all
+# of them. The default file cache is shared by the workers of one host; set
+# TASK_CACHE_BACKEND to the database cache or a Redis/Memcached server when
+# several hosts serve the API. Local memory is per process and only fits a
+# single worker (gunicorn.conf.py refuses to start more with it).
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'tasks': {
+        'BACKEND': os.environ.get(
+            'TASK_CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.environ.get(
+            'TASK_CACHE_LOCATION',
+            os.path.join(tempfile.gettempdir(), 'todos-task-cache')
+        ),
+        # Entries expire after TIMEOUT seconds and the oldest are culled
+        # once MAX_ENTRIES is reached
+        'TIMEOUT': int(os.environ.get('TASK_CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.environ.get('TASK_CACHE_MAX_ENTRIES', 10000)),
+        },
+    },
 }
 
+TASK_CACHE_ALIAS = 'tasks'
+# Off by default: only enable the server-side page cache once TASK_CACHE_BACKEND
+# is shared by every process serving the API, or a worker that missed a
+# write keeps serving its cached page
+TASK_LIST_CACHE_ENABLED = os.environ.get('TASK_LIST_CACHE_ENABLED', 'False') == 'True'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -118,6 +208,7 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 STATIC_URL = 'static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -127,10 +218,67 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Add DRF authentication settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        'todos.authentication.CachedTokenAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # orjson-backed JSON with the output of DRF's JSONRenderer/JSONParser
+    'DEFAULT_RENDERER_CLASSES': [
+        'todos.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'todos.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
+
+# Response compression: bodies below this many bytes are sent as is, and
+# the brotli quality (0-11) used when the brotli package is installed
+TASK_COMPRESSION_MIN_SIZE = 1024
+TASK_BROTLI_QUALITY = 4
+
+# Upper bound in milliseconds for importing and setting up the project in a
+# fresh process, checked by manage.py startup_profile
+STARTUP_BUDGET_MS = int(os.environ.get('STARTUP_BUDGET_MS', '1500'))
+
+# Verified API tokens kept per process, and how many seconds a revocation
+# made by another process may take to be noticed
+TASK_TOKEN_CACHE_SIZE = 1024
+TASK_TOKEN_CACHE_TTL = 60
+
+# Tag name -> id entries kept per process for resolving tags written by
+# name, and how many seconds a deletion made by another process may take
+# to be noticed
+TASK_TAG_CACHE_SIZE = 4096
+TASK_TAG_CACHE_TTL = 300
+
+# Seconds before the tag autocomplete index is reloaded to pick up tags
+# written by other processes, and before cached tag facet counts expire
+TASK_TAG_INDEX_TTL = 300
+TASK_TAG_FACETS_TTL = 30
+
+# Task list pagination: default page size and the hard maximum a client
+# may request through ?limit=
+TASK_PAGE_SIZE = 50
+TASK_MAX_PAGE_SIZE = 500
+
+# Batch endpoint: largest accepted batch and whether a batch is
+# all-or-nothing unless the request says otherwise
+TASK_BATCH_MAX_OPERATIONS = 1000
+TASK_BATCH_ATOMIC = True
+
+# Number of tasks held in memory at a time while streaming an export
+TASK_EXPORT_CHUNK_SIZE = 2000
+
+# Rows validated and inserted per transaction by the bulk importer
+TASK_IMPORT_BATCH_SIZE = 1000
+
+# Overdue job: tasks moved per transaction, and the interval in seconds of
+# the optional in-process scheduler started by wsgi.py (off when unset)
+TASK_OVERDUE_BATCH_SIZE = 1000
+TASK_OVERDUE_INTERVAL = int(os.environ['TASK_OVERDUE_INTERVAL']) if os.environ.get('TASK_OVERDUE_INTERVAL') else None
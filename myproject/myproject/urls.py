@@ -14,16 +14,26 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from todos.views import TaskViewSet
+from todos.async_views import AsyncTaskDetailView, AsyncTaskListView
+from todos.views import TagViewSet, TaskViewSet
 
 # Create a router and register our viewsets
 router = DefaultRouter()
 router.register(r'tasks', TaskViewSet)
+router.register(r'tags', TagViewSet)
 
 urlpatterns = [
-    path('admin/', admin.site.urls),
     path('api/', include(router.urls)),
+    # Async variants of the task endpoints, meant to be served over ASGI
+    path('api/async/tasks/', AsyncTaskListView.as_view(), name='async-task-list'),
+    path('api/async/tasks/<int:pk>/', AsyncTaskDetailView.as_view(), name='async-task-detail'),
 ]
+
+# Left out of API-only processes, see API_ONLY in settings
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.append(path('admin/', admin.site.urls))
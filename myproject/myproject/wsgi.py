@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
 
 application = get_wsgi_application()
+
+# Optional periodic overdue detection, enabled by TASK_OVERDUE_INTERVAL
+from todos.overdue import start_overdue_scheduler  # noqa: E402
+
+start_overdue_scheduler()
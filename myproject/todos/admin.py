@@ -1,6 +1,95 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
-from .models import Task, Tag
+from .models import APIToken, Task, Tag
+from .search import get_search_backend
+from .stats import set_task_status
+
+
+def estimate_row_count(model, using='default'):
+    """
+    Return the planner's estimate of the number of rows of ``model``'s
+    table, or None when the database keeps no statistics
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+            elif connection.vendor == 'sqlite':
+                # Only filled in by ANALYZE; the first number is the row count
+                cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+            else:
+                return None
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if row is None:
+        return None
+    estimate = int(str(row[0]).split()[0])
+    # PostgreSQL reports -1 for tables never analyzed
+    return estimate if estimate >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never counts more than ``max_count`` rows.
+
+    Up to the cap the count is exact. Past it, an unfiltered changelist
+    shows the planner's estimate, and a filtered one stops at the cap, so
+    the pages past it are not reachable from the page links.
+    """
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        count = queryset.order_by()[:self.max_count + 1].count()
+        if count <= self.max_count:
+            return count
+        if not queryset.query.has_filters():
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None:
+                return max(estimate, count)
+        return self.max_count
+
+
+class TagListFilter(admin.SimpleListFilter):
+    """
+    Filters tasks by one tag without loading every tag into the sidebar.
+
+    Only the first ``max_choices`` tags by name are listed, plus the
+    selected one; any other tag can be picked with ``?tag=<id>``.
+    """
+    title = _('tag')
+    parameter_name = 'tag'
+    max_choices = 20
+
+    def get_tag_id(self):
+        try:
+            return int(self.value())
+        except (TypeError, ValueError):
+            raise IncorrectLookupParameters(f'Invalid tag id {self.value()!r}')
+
+    def lookups(self, request, model_admin):
+        choices = list(Tag.objects.order_by('name').values_list('id', 'name')[:self.max_choices])
+        if self.value() is not None:
+            tag_id = self.get_tag_id()
+            if tag_id not in {choice_id for choice_id, _ in choices}:
+                choices += Tag.objects.filter(id=tag_id).values_list('id', 'name')
+        return [(str(tag_id), name) for tag_id, name in choices]
+
+    def queryset(self, request, queryset):
+        if self.value() is None:
+            return queryset
+        return queryset.filter(tags__id=self.get_tag_id())
+
 
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
@@ -14,10 +103,26 @@ class TagAdmin(admin.ModelAdmin):
     # Changelist view configuration
     list_display = ('name', 'get_task_count')
     search_fields = ('name',)
-    
+    ordering = ('name',)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith('changelist'):
+            # A correlated subquery is only evaluated for the rows of the
+            # page, where a JOIN + GROUP BY would aggregate every task first
+            usage = (
+                Task.tags.through.objects.filter(tag_id=OuterRef('pk'))
+                .order_by().values('tag_id').annotate(count=Count('*')).values('count')
+            )
+            queryset = queryset.annotate(
+                task_count=Coalesce(Subquery(usage, output_field=IntegerField()), 0)
+            )
+        return queryset
+
     def get_task_count(self, obj):
-        return obj.task_set.count()
+        return obj.task_count
     get_task_count.short_description = 'Number of Tasks'
+    get_task_count.admin_order_field = 'task_count'
 
 @admin.register(Task)
 class TaskAdmin(admin.ModelAdmin):
@@ -51,19 +156,63 @@ class TaskAdmin(admin.ModelAdmin):
         'status', 
         'timestamp', 
         'due_date', 
-        'tags'
+        TagListFilter
     )
     search_fields = ('title', 'description')
-    
+    actions = ['mark_open', 'mark_working', 'mark_completed', 'mark_cancelled']
+
     # Read-only fields to prevent editing
     readonly_fields = ('timestamp',)
-    
-    # Many-to-many field display
-    filter_horizontal = ('tags',)
-    
+
+    # Tags are searched as you type rather than all loaded into the form
+    autocomplete_fields = ('tags',)
+
+    # Counting millions of rows costs more than rendering the page: the
+    # paginator stops counting at a cap, the unfiltered total is not
+    # counted and the filters show no per-choice counts
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    def get_queryset(self, request):
+        # One query for the tags of every task on the page
+        return super().get_queryset(request).prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.only('id', 'name'))
+        )
+
     def display_tags(self, obj):
         return ", ".join([tag.name for tag in obj.tags.all()])
     display_tags.short_description = 'Tags'
+
+    def set_status(self, request, queryset, status):
+        changed = set_task_status(queryset, status)
+        self.message_user(
+            request,
+            f'{changed} task(s) marked {Task.StatusChoices(status).label}.',
+            messages.SUCCESS
+        )
+
+    @admin.action(description='Mark selected tasks as open')
+    def mark_open(self, request, queryset):
+        self.set_status(request, queryset, Task.StatusChoices.OPEN)
+
+    @admin.action(description='Mark selected tasks as working')
+    def mark_working(self, request, queryset):
+        self.set_status(request, queryset, Task.StatusChoices.WORKING)
+
+    @admin.action(description='Mark selected tasks as completed')
+    def mark_completed(self, request, queryset):
+        self.set_status(request, queryset, Task.StatusChoices.COMPLETED)
+
+    @admin.action(description='Mark selected tasks as cancelled')
+    def mark_cancelled(self, request, queryset):
+        self.set_status(request, queryset, Task.StatusChoices.CANCELLED)
+
+    def get_search_results(self, request, queryset, search_term):
+        # Use the same full-text backend as the API instead of icontains scans
+        if not search_term.strip():
+            return queryset, False
+        return get_search_backend().filter(queryset, search_term), False
     
     # Custom change form
     def get_readonly_fields(self, request, obj=None):
@@ -77,3 +226,22 @@ class TaskAdmin(admin.ModelAdmin):
     # Optional: Custom list filter
     def get_list_filter(self, request):
         return self.list_filter
+
+
+@admin.register(APIToken)
+class APITokenAdmin(admin.ModelAdmin):
+    # Keys are only shown once by issue_token; the admin can list and revoke
+    list_display = ('prefix', 'name', 'user', 'created', 'revoked')
+    list_filter = ('revoked',)
+    search_fields = ('prefix', 'name', 'user__username')
+    readonly_fields = ('prefix', 'created', 'revoked')
+    actions = ['revoke_tokens']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Revoke selected tokens')
+    def revoke_tokens(self, request, queryset):
+        # Save one by one so the token cache receivers run
+        for token in queryset.filter(revoked__isnull=True):
+            token.revoke()
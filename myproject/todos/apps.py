@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TodosConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'todos'
+
+    def ready(self):
+        # Register the cache invalidation and counter receivers
+        from . import signals  # noqa: F401
@@ -0,0 +1,251 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.authentication import BasicAuthentication, SessionAuthentication
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+from .authentication import CachedTokenAuthentication
+from .caching import (
+    aget_task_version, etag_matches, finalize_conditional_response, make_etag, task_list_cache
+)
+from .models import Task
+from .serializers import TaskReadSerializer, TaskSerializer, get_field_selection
+from .views import TaskViewSet
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncTaskView(View):
+    """
+    Base class of the async task endpoints.
+
+    Mirrors what DRF's APIView does for ``TaskViewSet`` (authentication,
+    permission check, content parsing and negotiation, exception handling
+    and rendering) without leaving the event loop, because DRF itself only
+    runs synchronous views. The same ``?fields=``, ``?expand=``, Accept
+    headers and ``?format=`` give the same responses as /api/tasks/. Database access goes through Django's async
+    ORM; model saves and deletes still run their signal receivers, which
+    keep the version markers and the status counters up to date.
+    """
+    parser_classes = TaskViewSet.parser_classes
+    # The browsable API needs a DRF view, so it is left out
+    renderer_classes = [
+        renderer for renderer in TaskViewSet.renderer_classes if renderer.format != 'api'
+    ]
+    content_negotiation_class = api_settings.DEFAULT_CONTENT_NEGOTIATION_CLASS
+    # Set by the GET handlers, like TaskViewSet.sparse_field_actions
+    field_selection = None
+
+    # Same scheme order as TaskViewSet; the first one names the
+    # WWW-Authenticate challenge of 401 responses
+    token_authentication = CachedTokenAuthentication()
+    basic_authentication = BasicAuthentication()
+    session_authentication = SessionAuthentication()
+
+    # Shared with TaskViewSet so both APIs accept the same query parameters
+    filter_backends = TaskViewSet.filter_backends
+    pagination_class = TaskViewSet.pagination_class
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.request = Request(request, parsers=[parser() for parser in self.parser_classes])
+        # Renders errors raised before negotiation, as DRF does
+        self.renderer = self.renderer_classes[0]()
+        try:
+            self.perform_content_negotiation(self.request)
+            self.request.user = await self.authenticate(self.request)
+            if not self.request.user.is_authenticated:
+                raise exceptions.NotAuthenticated()
+            handler = getattr(self, request.method.lower(), None)
+            if request.method.lower() not in self.http_method_names or handler is None:
+                raise exceptions.MethodNotAllowed(request.method)
+            return await handler(self.request, *args, **kwargs)
+        except (exceptions.APIException, Http404) as exc:
+            return self.handle_exception(exc)
+
+    def perform_content_negotiation(self, request):
+        renderers = [renderer() for renderer in self.renderer_classes]
+        self.renderer, request.accepted_media_type = (
+            self.content_negotiation_class().select_renderer(request, renderers)
+        )
+        request.accepted_renderer = self.renderer
+
+    async def authenticate(self, request):
+        """
+        Return the authenticated user, or AnonymousUser
+        """
+        result = await self.token_authentication.aauthenticate(request)
+        if result is None:
+            # PBKDF2 is CPU bound, so keep it off the event loop
+            result = await sync_to_async(self.basic_authentication.authenticate)(request)
+        if result is not None:
+            return result[0]
+
+        user = await request._request.auser()
+        if user.is_active:
+            # Like SessionAuthentication, unsafe methods need a CSRF token
+            self.session_authentication.enforce_csrf(request)
+        return user
+
+    def handle_exception(self, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            exc.auth_header = self.token_authentication.authenticate_header(self.request)
+        response = exception_handler(exc, {'view': self, 'request': self.request})
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name in ('WWW-Authenticate', 'Retry-After')
+        }
+        return self.render(response.data, status=response.status_code, headers=headers)
+
+    def render(self, data, status=status.HTTP_200_OK, headers=None):
+        if data is None:
+            response = HttpResponse(status=status)
+        else:
+            response = HttpResponse(
+                self.renderer.render(data, getattr(self.request, 'accepted_media_type', None)),
+                status=status,
+                content_type=self.renderer.media_type
+            )
+        for name, value in (headers or {}).items():
+            response[name] = value
+        return response
+
+    def get_serializer_context(self):
+        return {'request': self.request, 'view': self, 'fields': self.field_selection}
+
+    def get_queryset(self):
+        return Task.objects.filter(user=self.request.user)
+
+    async def get_object(self, pk):
+        try:
+            return await self.get_queryset().aget(pk=pk)
+        except Task.DoesNotExist:
+            raise Http404('No Task matches the given query.')
+
+    async def represent(self, rows):
+        serializer = TaskReadSerializer(context=self.get_serializer_context())
+        return await serializer.ato_representation(rows)
+
+    async def represent_task(self, task):
+        return (await self.represent([TaskReadSerializer.row_from_instance(task)]))[0]
+
+    def get_write_data(self, request):
+        data = request.data.copy()
+        # The timestamp is set by the model and never taken from the client
+        data.pop('timestamp', None)
+        return data
+
+    async def save(self, serializer, **kwargs):
+        """
+        Validate and save ``serializer``, returning the task.
+
+        Writes carrying tags resolve and store them with blocking queries,
+        so they are validated and saved in a worker thread as a whole.
+        """
+        if 'tags' in serializer.initial_data:
+            return await sync_to_async(self.save_with_tags)(serializer, **kwargs)
+        serializer.is_valid(raise_exception=True)
+        task = serializer.instance or Task(**kwargs)
+        for name, value in serializer.validated_data.items():
+            setattr(task, name, value)
+        await task.asave()
+        return task
+
+    def save_with_tags(self, serializer, **kwargs):
+        serializer.is_valid(raise_exception=True)
+        return serializer.save(**kwargs)
+
+    async def conditional(self, request, render):
+        """
+        ETag handling of ``ConditionalGetMixin`` for the async views
+        """
+        etag = make_etag(
+            await aget_task_version(request.user.pk),
+            request.user.pk,
+            request.get_full_path(),
+            self.renderer.media_type,
+        )
+        if etag_matches(request, etag):
+            response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = await render()
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            finalize_conditional_response(response, etag)
+        return response
+
+
+class AsyncTaskListView(AsyncTaskView):
+    """
+    GET lists tasks one cursor page at a time, POST creates a task.
+    Responses match GET/POST /api/tasks/.
+    """
+
+    async def get(self, request):
+        self.field_selection = get_field_selection(request.query_params)
+        return await self.conditional(request, lambda: self.list(request))
+
+    async def list(self, request):
+        cache_enabled = getattr(settings, 'TASK_LIST_CACHE_ENABLED', False)
+        if cache_enabled:
+            key = await task_list_cache.aget_key(request)
+            data = await task_list_cache.aget(key)
+            if data is not None:
+                return self.render(data, headers={'X-Cache': 'HIT'})
+
+        # Same order as TaskViewSet: values() first, so that annotations
+        # added by the filter backends (search_rank) stay in the rows
+        queryset = TaskReadSerializer.prepare_queryset(self.get_queryset(), self.field_selection)
+        for backend in self.filter_backends:
+            queryset = backend().filter_queryset(request, queryset, self)
+        paginator = self.pagination_class()
+        rows = await paginator.apaginate_queryset(queryset, request, view=self)
+        data = paginator.get_paginated_response(await self.represent(rows)).data
+
+        if not cache_enabled:
+            return self.render(data)
+        await task_list_cache.aset(key, data)
+        return self.render(data, headers={'X-Cache': 'MISS'})
+
+    async def post(self, request):
+        serializer = TaskSerializer(data=self.get_write_data(request), context=self.get_serializer_context())
+        task = await self.save(serializer, user=request.user)
+        return self.render(await self.represent_task(task), status=status.HTTP_201_CREATED)
+
+
+class AsyncTaskDetailView(AsyncTaskView):
+    """
+    GET, PUT, PATCH and DELETE of one task, matching /api/tasks/{id}/
+    """
+
+    async def get(self, request, pk):
+        self.field_selection = get_field_selection(request.query_params)
+
+        async def retrieve():
+            task = await self.get_object(pk)
+            return self.render(await self.represent_task(task))
+        return await self.conditional(request, retrieve)
+
+    async def put(self, request, pk):
+        return await self.update(request, pk, partial=False)
+
+    async def patch(self, request, pk):
+        return await self.update(request, pk, partial=True)
+
+    async def update(self, request, pk, partial):
+        task = await self.get_object(pk)
+        serializer = TaskSerializer(
+            task,
+            data=self.get_write_data(request),
+            partial=partial,
+            context=self.get_serializer_context()
+        )
+        task = await self.save(serializer)
+        return self.render(await self.represent_task(task))
+
+    async def delete(self, request, pk):
+        task = await self.get_object(pk)
+        await task.adelete()
+        return self.render(None, status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,167 @@
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication, get_authorization_header
+from .models import APIToken
+
+
+def hash_key(key):
+    """
+    Return the digest stored for a raw token key.
+
+    Keys carry 256 bits of randomness, so unlike passwords they need no
+    slow key derivation function to resist guessing.
+    """
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def issue_token(user, name=''):
+    """
+    Create a token for ``user`` and return (token, raw key).
+
+    The raw key is not stored anywhere and cannot be recovered later.
+    """
+    key = secrets.token_urlsafe(32)
+    token = APIToken.objects.create(
+        user=user, name=name, prefix=key[:8], digest=hash_key(key)
+    )
+    return token, key
+
+
+class TokenCache:
+    """
+    Bounded LRU of verified tokens, keyed by digest, with a TTL.
+
+    The cache is per process: revocations and user changes made in this
+    process evict entries immediately through signals, while other
+    processes notice them at the latest after ``ttl`` seconds.
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, 'TASK_TOKEN_CACHE_SIZE', 1024)
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'TASK_TOKEN_CACHE_TTL', 60)
+
+    def get(self, digest):
+        with self.lock:
+            entry = self.entries.get(digest)
+            if entry is None:
+                return None
+            expires, user, token = entry
+            if expires <= time.monotonic():
+                del self.entries[digest]
+                return None
+            self.entries.move_to_end(digest)
+            return user, token
+
+    def set(self, digest, user, token):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        with self.lock:
+            self.entries[digest] = (time.monotonic() + self.ttl, user, token)
+            self.entries.move_to_end(digest)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def discard(self, digest):
+        with self.lock:
+            self.entries.pop(digest, None)
+
+    def discard_user(self, user_id):
+        with self.lock:
+            for digest in [
+                digest for digest, (_, user, _) in self.entries.items()
+                if user.pk == user_id
+            ]:
+                del self.entries[digest]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    ``Authorization: Token <key>`` authentication against ``APIToken``.
+
+    A request costs one SHA-256 of the key and, on a cache hit, no query
+    at all, instead of the PBKDF2 run BasicAuthentication does on every
+    call.
+    """
+    model = APIToken
+
+    def get_key(self, request):
+        """
+        Return the key of an ``Authorization: Token`` header, if any
+        """
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) == 1:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. No credentials provided.'))
+        if len(auth) > 2:
+            raise exceptions.AuthenticationFailed(_('Invalid token header. Token string should not contain spaces.'))
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Invalid token header. Token string should not contain invalid characters.')
+            )
+
+    def authenticate(self, request):
+        key = self.get_key(request)
+        return None if key is None else self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        """
+        Async counterpart of ``authenticate`` for the ASGI views
+        """
+        key = self.get_key(request)
+        return None if key is None else await self.aauthenticate_credentials(key)
+
+    def get_token_queryset(self, digest):
+        return APIToken.objects.select_related('user').filter(digest=digest, revoked__isnull=True)
+
+    def check_token(self, digest, token):
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        token_cache.set(digest, token.user, token)
+        return token.user, token
+
+    def authenticate_credentials(self, key):
+        digest = hash_key(key)
+        cached = token_cache.get(digest)
+        if cached is not None:
+            return cached
+        return self.check_token(digest, self.get_token_queryset(digest).first())
+
+    async def aauthenticate_credentials(self, key):
+        digest = hash_key(key)
+        cached = token_cache.get(digest)
+        if cached is not None:
+            return cached
+        return self.check_token(digest, await self.get_token_queryset(digest).afirst())
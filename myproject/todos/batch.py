@@ -0,0 +1,252 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Prefetch
+from rest_framework import serializers, status
+from .caching import bump_task_version
+from .models import Task, Tag
+from .serializers import TaskSerializer
+from .stats import StatusDeltas
+from .tags import clean_tag_refs, create_tags, lookup_tag_map, set_task_tags
+
+
+class BatchOperationSerializer(serializers.Serializer):
+    """
+    A single create, update or delete inside a batch request
+    """
+    OP_CREATE = 'create'
+    OP_UPDATE = 'update'
+    OP_DELETE = 'delete'
+
+    op = serializers.ChoiceField(choices=[OP_CREATE, OP_UPDATE, OP_DELETE])
+    id = serializers.IntegerField(required=False)
+    data = serializers.DictField(required=False, default=dict)
+
+    def validate(self, attrs):
+        if attrs['op'] != self.OP_CREATE and 'id' not in attrs:
+            raise serializers.ValidationError({'id': 'This field is required.'})
+        return attrs
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """
+    Envelope of a batch request.
+
+    ``atomic`` selects the partial-failure semantics: when true nothing is
+    written unless every operation is valid, when false the valid
+    operations are applied and the invalid ones are reported.
+    """
+    atomic = serializers.BooleanField(required=False)
+    operations = BatchOperationSerializer(many=True, allow_empty=False)
+
+    def validate_operations(self, operations):
+        limit = getattr(settings, 'TASK_BATCH_MAX_OPERATIONS', 1000)
+        if len(operations) > limit:
+            raise serializers.ValidationError(
+                f'A batch may contain at most {limit} operations.'
+            )
+        return operations
+
+    def get_atomic(self):
+        return self.validated_data.get(
+            'atomic', getattr(settings, 'TASK_BATCH_ATOMIC', True)
+        )
+
+
+class TaskBatch:
+    """
+    Validates and applies a list of task operations for one user.
+
+    Every operation is validated up front with ``TaskSerializer`` against
+    instances loaded in a single query. The valid operations are then
+    written with ``bulk_create``, ``bulk_update``, one ``DELETE`` and a bulk
+    diff of the ``Task.tags`` through table, all in one transaction.
+    """
+
+    def __init__(self, user, operations, context=None):
+        self.user = user
+        self.operations = operations
+        self.context = context or {}
+        self.results = [
+            {'index': index, 'op': operation['op']}
+            for index, operation in enumerate(operations)
+        ]
+        self.pending = []
+
+    @property
+    def failed(self):
+        return any('errors' in result for result in self.results)
+
+    def fail(self, index, code, errors):
+        self.results[index].update({'status': code, 'errors': errors})
+
+    def validate(self):
+        """
+        Validate every operation, recording errors on the results
+        """
+        targets = {
+            operation['id'] for operation in self.operations
+            if operation['op'] != BatchOperationSerializer.OP_CREATE
+        }
+        instances = Task.objects.filter(user=self.user, id__in=targets).in_bulk()
+
+        # Look up the tags of every operation at once and hand the map to
+        # the per-operation serializers; missing tags are only created by
+        # execute(), so a rejected batch writes nothing
+        refs = []
+        for operation in self.operations:
+            try:
+                refs.extend(clean_tag_refs(operation['data'].get('tags') or []))
+            except ValidationError:
+                # Reported against the operation below
+                pass
+        try:
+            refs = list(dict.fromkeys(refs))
+            tag_ids = lookup_tag_map(refs)
+            tag_ids.update((ref, None) for ref in refs if ref not in tag_ids)
+        except ValidationError:
+            # Unknown ids: each operation resolves and reports its own
+            tag_ids = {}
+        context = {**self.context, 'tag_ids': tag_ids}
+
+        seen = set()
+        for index, operation in enumerate(self.operations):
+            op = operation['op']
+            instance = None
+            if op != BatchOperationSerializer.OP_CREATE:
+                task_id = operation['id']
+                if task_id in seen:
+                    self.fail(index, status.HTTP_400_BAD_REQUEST, {
+                        'id': 'Task is targeted by more than one operation.'
+                    })
+                    continue
+                seen.add(task_id)
+                instance = instances.get(task_id)
+                if instance is None:
+                    self.fail(index, status.HTTP_404_NOT_FOUND, {'detail': 'Not found.'})
+                    continue
+                if op == BatchOperationSerializer.OP_DELETE:
+                    self.pending.append((index, op, instance, None, None))
+                    continue
+
+            serializer = TaskSerializer(
+                instance,
+                data=operation['data'],
+                partial=op == BatchOperationSerializer.OP_UPDATE,
+                context=context
+            )
+            if not serializer.is_valid():
+                self.fail(index, status.HTTP_400_BAD_REQUEST, serializer.errors)
+                continue
+            validated_data = serializer.validated_data
+            tags = validated_data.pop('tags', None)
+            self.pending.append((index, op, instance, validated_data, tags))
+
+    def execute(self):
+        """
+        Write every pending operation in one transaction
+        """
+        creates, updates, deletes = [], [], []
+        tag_sets = {}
+        # Instances loaded by validate() may be stale, so each one only
+        # writes the fields its own operation sets: one bulk_update per
+        # distinct field set, never the union of all of them
+        update_groups = {}
+        # Bulk writes bypass the signals maintaining TaskStats
+        deltas = StatusDeltas()
+
+        for index, op, instance, validated_data, tags in self.pending:
+            if op == BatchOperationSerializer.OP_CREATE:
+                instance = Task(user=self.user, **validated_data)
+                creates.append((index, instance, tags))
+                deltas.add(self.user.pk, instance.status)
+            elif op == BatchOperationSerializer.OP_UPDATE:
+                old_status = instance.status
+                for field, value in validated_data.items():
+                    setattr(instance, field, value)
+                if validated_data:
+                    update_groups.setdefault(tuple(sorted(validated_data)), []).append(instance)
+                updates.append((index, instance, tags))
+                deltas.move(self.user.pk, old_status, instance.status)
+            else:
+                deletes.append((index, instance))
+
+        with transaction.atomic():
+            if creates:
+                Task.objects.bulk_create([instance for _, instance, _ in creates])
+            for fields, instances in update_groups.items():
+                Task.objects.bulk_update(instances, fields)
+            if deletes:
+                Task.objects.filter(
+                    user=self.user,
+                    id__in=[instance.id for _, instance in deletes]
+                ).delete()
+
+            missing = {
+                ref for _, _, tags in creates + updates if tags is not None
+                for ref, tag_id in tags.items() if tag_id is None
+            }
+            created = create_tags(sorted(missing)) if missing else {}
+            for _, instance, tags in creates + updates:
+                if tags is not None:
+                    tag_sets[instance.id] = [
+                        created[ref] if tag_id is None else tag_id
+                        for ref, tag_id in tags.items()
+                    ]
+            set_task_tags(tag_sets)
+            deltas.apply()
+            # Bulk writes send no model signals
+            bump_task_version(self.user.pk)
+
+        touched = [instance.id for _, instance, _ in creates + updates]
+        rendered = self.render(touched)
+        for index, instance, _ in creates:
+            self.results[index].update({
+                'status': status.HTTP_201_CREATED,
+                'id': instance.id,
+                'data': rendered[instance.id],
+            })
+        for index, instance, _ in updates:
+            self.results[index].update({
+                'status': status.HTTP_200_OK,
+                'id': instance.id,
+                'data': rendered[instance.id],
+            })
+        for index, instance in deletes:
+            self.results[index].update({
+                'status': status.HTTP_204_NO_CONTENT,
+                'id': instance.id,
+            })
+
+    def render(self, task_ids):
+        """
+        Serialize the written tasks with a constant number of queries
+        """
+        if not task_ids:
+            return {}
+        tasks = Task.objects.filter(id__in=task_ids).prefetch_related(
+            Prefetch('tags', queryset=Tag.objects.order_by('id'))
+        )
+        return {
+            task.id: TaskSerializer(task, context=self.context).data
+            for task in tasks
+        }
+
+    def run(self, atomic=True):
+        """
+        Validate and apply the batch, returning the per-operation results.
+
+        In atomic mode a single invalid operation aborts the whole batch and
+        the remaining operations are reported as not applied.
+        """
+        self.validate()
+        if self.failed and atomic:
+            for result in self.results:
+                if 'errors' not in result:
+                    result.update({
+                        'status': status.HTTP_424_FAILED_DEPENDENCY,
+                        'errors': {'detail': 'Not applied because the batch failed.'},
+                    })
+            return self.results
+        self.execute()
+        return self.results
@@ -0,0 +1,251 @@
+import hashlib
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+VERSION_KEY = 'todos:task-version:{user_id}'
+LIST_KEY = 'todos:task-list:{user_id}:{version}:{digest}'
+
+
+def get_task_cache():
+    """
+    Return the cache holding task version markers and cached list pages
+    """
+    return caches[getattr(settings, 'TASK_CACHE_ALIAS', 'default')]
+
+
+def get_task_version(user_id):
+    """
+    Return the opaque marker that changes whenever any of a user's tasks does.
+
+    Markers are random rather than counters so that a marker lost to cache
+    eviction can never come back with a value a client has already seen.
+    """
+    cache = get_task_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        # add() lets concurrent first readers settle on a single marker
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key) or version
+    return version
+
+
+async def aget_task_version(user_id):
+    """
+    Async counterpart of ``get_task_version``
+    """
+    cache = get_task_cache()
+    key = VERSION_KEY.format(user_id=user_id)
+    version = await cache.aget(key)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not await cache.aadd(key, version, timeout=None):
+            version = await cache.aget(key) or version
+    return version
+
+
+def _set_new_versions(user_ids):
+    get_task_cache().set_many(
+        {VERSION_KEY.format(user_id=user_id): uuid.uuid4().hex for user_id in user_ids},
+        timeout=None
+    )
+
+
+def bump_task_version(*user_ids):
+    """
+    Invalidate every version marker of the given users.
+
+    The marker is replaced immediately and again once the surrounding
+    transaction commits, so a reader that saw uncommitted-away rows in
+    between cannot pin them under the new marker.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    _set_new_versions(user_ids)
+    transaction.on_commit(lambda: _set_new_versions(user_ids))
+
+
+def make_etag(*parts):
+    """
+    Build a strong ETag from the given parts
+    """
+    digest = hashlib.sha1(
+        '|'.join(str(part) for part in parts).encode('utf-8')
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+def strip_weak(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def etag_matches(request, etag):
+    """
+    Tell whether ``If-None-Match`` lists ``etag`` (or ``*``).
+
+    The comparison is weak, as RFC 9110 requires for If-None-Match, since
+    compressed responses carry the weak form of the ETag.
+    """
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    etags = parse_etags(header)
+    return '*' in etags or strip_weak(etag) in {strip_weak(tag) for tag in etags}
+
+
+def finalize_conditional_response(response, etag):
+    response['ETag'] = etag
+    # Clients must revalidate, and shared caches must not store per-user data
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    Adds strong ETags and ``If-None-Match`` handling to list and retrieve.
+
+    The ETag is derived from the per-user version marker, the requested
+    URL and the negotiated media type, so a matching request is answered
+    with 304 Not Modified without touching the tasks table or serializing
+    anything.
+    """
+
+    def get_etag(self, request):
+        return make_etag(
+            get_task_version(request.user.pk),
+            request.user.pk,
+            request.get_full_path(),
+            request.accepted_media_type,
+        )
+
+    def etag_matches(self, request, etag):
+        return etag_matches(request, etag)
+
+    def finalize_conditional_response(self, response, etag):
+        return finalize_conditional_response(response, etag)
+
+    def conditional(self, request, render):
+        """
+        Answer with 304 when the client's ETag is current, else call ``render``
+        """
+        etag = self.get_etag(request)
+        if self.etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = render()
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            self.finalize_conditional_response(response, etag)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(
+            request, lambda: super(ConditionalGetMixin, self).list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(
+            request, lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs)
+        )
+
+
+class TaskListCache:
+    """
+    Server-side cache of serialized task list pages.
+
+    Entries are keyed by user, version marker and request, so bumping the
+    version makes every cached page of that user unreachable at once. The
+    stale entries are then dropped by the backend's own TTL and size-capped
+    culling (``TIMEOUT`` and ``MAX_ENTRIES`` of the ``TASK_CACHE_ALIAS``
+    cache). Hit and miss counters are kept per process.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, request, version):
+        digest = hashlib.sha1('|'.join([
+            request.get_host(),
+            request.get_full_path(),
+            request.accepted_media_type,
+        ]).encode('utf-8')).hexdigest()
+        return LIST_KEY.format(user_id=request.user.pk, version=version, digest=digest)
+
+    def get_key(self, request):
+        return self.make_key(request, get_task_version(request.user.pk))
+
+    async def aget_key(self, request):
+        return self.make_key(request, await aget_task_version(request.user.pk))
+
+    def count(self, data):
+        with self.lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def get(self, key):
+        return self.count(get_task_cache().get(key))
+
+    async def aget(self, key):
+        return self.count(await get_task_cache().aget(key))
+
+    def set(self, key, data):
+        get_task_cache().set(key, data)
+
+    async def aset(self, key, data):
+        await get_task_cache().aset(key, data)
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+    def reset_stats(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+
+
+task_list_cache = TaskListCache()
+
+
+class CachedListMixin:
+    """
+    Serves list responses from ``task_list_cache`` when enabled.
+
+    The ``X-Cache`` response header reports whether the page was a hit.
+    """
+
+    def list(self, request, *args, **kwargs):
+        if not getattr(settings, 'TASK_LIST_CACHE_ENABLED', False):
+            return super().list(request, *args, **kwargs)
+
+        key = task_list_cache.get_key(request)
+        data = task_list_cache.get(key)
+        if data is not None:
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK:
+            task_list_cache.set(key, response.data)
+        response['X-Cache'] = 'MISS'
+        return response
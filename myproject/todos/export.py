@@ -0,0 +1,25 @@
+from itertools import islice
+
+from django.conf import settings
+from .serializers import TaskReadSerializer
+
+
+def get_export_chunk_size():
+    return getattr(settings, 'TASK_EXPORT_CHUNK_SIZE', 2000)
+
+
+def iter_task_rows(queryset, context=None, chunk_size=None):
+    """
+    Yield serialized tasks one at a time with bounded memory.
+
+    ``queryset`` must be a Task queryset; it is walked with a chunked
+    values() iterator and each chunk's tags are fetched with one grouped
+    query, so at most ``chunk_size`` tasks are held in memory at once.
+    """
+    chunk_size = chunk_size or get_export_chunk_size()
+    rows = TaskReadSerializer.prepare_queryset(queryset).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from TaskReadSerializer(chunk, many=True, context=context).data
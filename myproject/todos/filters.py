@@ -0,0 +1,109 @@
+import datetime
+
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+from .models import Task
+
+TRUE_VALUES = ('1', 'true', 'yes')
+FALSE_VALUES = ('0', 'false', 'no')
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Query-parameter filtering for task lists.
+
+    - ``status``: one or more statuses, repeated or comma separated
+    - ``due_date_before`` / ``due_date_after``: ISO date or datetime bounds
+      (before is exclusive, after is inclusive)
+    - ``has_due_date``: ``true`` or ``false``
+    - ``tags``: comma separated tag ids, matched according to
+      ``tags_match=any`` (default) or ``tags_match=all``
+
+    Every filter keeps ``user`` as the leading equality so the composite
+    indexes on ``Task`` apply.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        statuses = self.get_list(params, 'status')
+        if statuses:
+            valid = set(Task.StatusChoices.values)
+            invalid = [value for value in statuses if value not in valid]
+            if invalid:
+                raise ValidationError({'status': f'Unknown status: {", ".join(invalid)}'})
+            queryset = queryset.filter(status__in=statuses)
+
+        before = self.get_datetime(params, 'due_date_before')
+        if before is not None:
+            queryset = queryset.filter(due_date__lt=before)
+        after = self.get_datetime(params, 'due_date_after')
+        if after is not None:
+            queryset = queryset.filter(due_date__gte=after)
+
+        has_due_date = self.get_boolean(params, 'has_due_date')
+        if has_due_date is not None:
+            queryset = queryset.filter(due_date__isnull=not has_due_date)
+
+        tags = self.get_list(params, 'tags')
+        if tags:
+            queryset = self.filter_tags(queryset, tags, params.get('tags_match', 'any'))
+
+        return queryset
+
+    def get_list(self, params, name):
+        values = []
+        for value in params.getlist(name):
+            values.extend(part.strip() for part in value.split(',') if part.strip())
+        return values
+
+    def get_boolean(self, params, name):
+        value = params.get(name)
+        if value is None:
+            return None
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        raise ValidationError({name: 'Expected true or false.'})
+
+    def get_datetime(self, params, name):
+        value = params.get(name)
+        if not value:
+            return None
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None:
+                date = parse_date(value)
+                if date is not None:
+                    parsed = datetime.datetime.combine(date, datetime.time.min)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: 'Expected an ISO 8601 date or datetime.'})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def filter_tags(self, queryset, tags, match):
+        try:
+            tag_ids = sorted({int(tag_id) for tag_id in tags})
+        except ValueError:
+            raise ValidationError({'tags': 'Expected comma separated tag ids.'})
+        if match not in ('any', 'all'):
+            raise ValidationError({'tags_match': 'Expected any or all.'})
+
+        # Semi-joins on the through table's tag_id index; unlike a plain
+        # join they never duplicate task rows
+        through = Task.tags.through.objects
+        if match == 'any':
+            return queryset.filter(
+                id__in=through.filter(tag_id__in=tag_ids).values('task_id')
+            )
+        for tag_id in tag_ids:
+            queryset = queryset.filter(
+                id__in=through.filter(tag_id=tag_id).values('task_id')
+            )
+        return queryset
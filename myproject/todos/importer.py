@@ -0,0 +1,239 @@
+import csv
+import json
+import os
+from functools import partial
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from .caching import bump_task_version
+from .models import Task, Tag
+from .stats import StatusDeltas
+from .tags import resolve_tag_map
+
+FORMATS = ('csv', 'ndjson')
+
+
+def detect_format(filename, default='ndjson'):
+    """
+    Guess the input format from a file name
+    """
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    return default
+
+
+def read_rows(stream, fmt):
+    """
+    Lazily yield (row number, dict) pairs from a text stream
+    """
+    if fmt == 'csv':
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            yield number, row
+        return
+
+    number = 0
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            row = {'__error__': f'Invalid JSON: {exc}'}
+        if not isinstance(row, dict):
+            row = {'__error__': 'Expected a JSON object.'}
+        yield number, row
+
+
+class Checkpoint:
+    """
+    JSON file recording how many input rows have been committed, so an
+    interrupted import can resume where it stopped
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        try:
+            with open(self.path) as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {'rows': 0, 'created': 0}
+
+    def save(self, state):
+        # Write then rename so a crash never leaves a truncated checkpoint
+        temporary = f'{self.path}.tmp'
+        with open(temporary, 'w') as handle:
+            json.dump(state, handle)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class TaskImporter:
+    """
+    Streams task rows into the database in batches.
+
+    Rows are validated against the ``Task`` field rules without building a
+    serializer per row, tag names are resolved through the shared tag
+    cache (missing tags are created in bulk) and every batch is
+    written with ``bulk_create`` plus one through-table insert inside its
+    own transaction. After each batch the optional ``progress`` callback
+    is called with the running totals and the optional checkpoint is
+    advanced once the batch has committed.
+    """
+    fields = ('title', 'description', 'status', 'due_date')
+    tag_separator = '|'
+    max_reported_errors = 100
+
+    def __init__(self, user, batch_size=None, checkpoint=None, progress=None):
+        self.user = user
+        self.batch_size = batch_size or getattr(settings, 'TASK_IMPORT_BATCH_SIZE', 1000)
+        self.checkpoint = checkpoint
+        self.progress = progress
+        self.rows = 0
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def clean_row(self, row):
+        """
+        Return (task kwargs, tag names) for a row or raise ValidationError
+        """
+        if '__error__' in row:
+            raise ValidationError({'row': [row['__error__']]})
+
+        data = {}
+        errors = {}
+        for name in self.fields:
+            field = Task._meta.get_field(name)
+            value = row.get(name)
+            if value in (None, '') and field.has_default():
+                value = field.get_default()
+            elif value == '' and field.null:
+                value = None
+            try:
+                value = field.clean(value, None)
+                if isinstance(value, str) and field.max_length and len(value) > field.max_length:
+                    raise ValidationError(
+                        f'Ensure this value has at most {field.max_length} characters.'
+                    )
+            except ValidationError as exc:
+                errors[name] = exc.messages
+                continue
+            if name == 'due_date' and value is not None and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            data[name] = value
+
+        try:
+            tags = self.clean_tags(row.get('tags'))
+        except ValidationError as exc:
+            errors['tags'] = exc.messages
+
+        if errors:
+            raise ValidationError(errors)
+        return data, tags
+
+    def clean_tags(self, value):
+        """
+        Accept "a|b" strings, lists of names or the exported tag objects
+        """
+        if value in (None, ''):
+            return []
+        if isinstance(value, str):
+            value = value.split(self.tag_separator)
+        if not isinstance(value, list):
+            raise ValidationError('Expected a list of tag names.')
+
+        names = []
+        max_length = Tag._meta.get_field('name').max_length
+        for tag in value:
+            name = tag.get('name') if isinstance(tag, dict) else tag
+            if not isinstance(name, str) or not name.strip():
+                raise ValidationError('Tag names must be non-empty strings.')
+            name = name.strip()
+            if len(name) > max_length:
+                raise ValidationError(f'Tag names are limited to {max_length} characters.')
+            names.append(name)
+        return list(dict.fromkeys(names))
+
+    def write_batch(self, batch):
+        """
+        Validate and insert one batch of (row number, row) pairs
+        """
+        tasks, tag_names = [], []
+        for number, row in batch:
+            try:
+                data, tags = self.clean_row(row)
+            except ValidationError as exc:
+                self.failed += 1
+                if len(self.errors) < self.max_reported_errors:
+                    self.errors.append({'row': number, 'errors': exc.message_dict})
+                continue
+            tasks.append(Task(user=self.user, **data))
+            tag_names.append(tags)
+
+        with transaction.atomic():
+            tag_ids = resolve_tag_map(sorted({name for names in tag_names for name in names}))
+            Task.objects.bulk_create(tasks)
+            through = Task.tags.through
+            through.objects.bulk_create([
+                through(task_id=task.id, tag_id=tag_ids[name])
+                for task, names in zip(tasks, tag_names)
+                for name in names
+            ])
+            deltas = StatusDeltas()
+            for task in tasks:
+                deltas.add(self.user.pk, task.status)
+            deltas.apply()
+
+        self.rows += len(batch)
+        self.created += len(tasks)
+        if self.checkpoint is not None:
+            # Only record rows once they are durable; when the import runs
+            # inside an outer transaction that is when it commits
+            transaction.on_commit(partial(self.checkpoint.save, self.get_state()))
+        if tasks:
+            bump_task_version(self.user.pk)
+        if self.progress is not None:
+            self.progress(self.get_state())
+
+    def get_state(self):
+        return {'rows': self.rows, 'created': self.created, 'failed': self.failed}
+
+    def run(self, stream, fmt):
+        """
+        Import every row of ``stream`` and return a summary
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f'Unsupported format {fmt!r}, expected one of {FORMATS}')
+
+        rows = read_rows(stream, fmt)
+        if self.checkpoint is not None:
+            state = self.checkpoint.load()
+            self.rows = state.get('rows', 0)
+            self.created = state.get('created', 0)
+            self.failed = state.get('failed', 0)
+            # Skip the rows committed by a previous run
+            for _ in islice(rows, self.rows):
+                pass
+
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                break
+            self.write_batch(batch)
+
+        return {**self.get_state(), 'errors': self.errors}
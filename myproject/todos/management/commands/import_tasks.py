@@ -0,0 +1,62 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from todos.importer import FORMATS, Checkpoint, TaskImporter, detect_format
+
+
+class Command(BaseCommand):
+    help = 'Stream tasks from a CSV or NDJSON file into the database in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' for standard input")
+        parser.add_argument('--user', required=True, help='Username owning the imported tasks')
+        parser.add_argument('--format', choices=FORMATS, help='Input format (default: from the file extension)')
+        parser.add_argument('--batch-size', type=int, help='Rows validated and inserted per transaction')
+        parser.add_argument(
+            '--checkpoint',
+            help='File recording committed rows; rerun with the same file to resume'
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']!r} does not exist")
+
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        checkpoint = Checkpoint(options['checkpoint']) if options['checkpoint'] else None
+        importer = TaskImporter(
+            user,
+            batch_size=options['batch_size'],
+            checkpoint=checkpoint,
+            progress=self.report_progress
+        )
+
+        if path == '-':
+            summary = importer.run(sys.stdin, fmt)
+        else:
+            try:
+                with open(path, newline='', encoding='utf-8') as stream:
+                    summary = importer.run(stream, fmt)
+            except OSError as exc:
+                raise CommandError(str(exc))
+
+        for error in summary['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {summary['created']} tasks from {summary['rows']} rows "
+            f"({summary['failed']} rejected)"
+        ))
+        if checkpoint is not None:
+            checkpoint.clear()
+
+    def report_progress(self, state):
+        if self.verbosity >= 1:
+            self.stdout.write(
+                f"  {state['rows']} rows processed, {state['created']} created, "
+                f"{state['failed']} rejected"
+            )
@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from todos.authentication import issue_token
+
+
+class Command(BaseCommand):
+    help = 'Issue an API token for a user and print its key once'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Owner of the new token')
+        parser.add_argument('--name', default='', help='Label shown in the admin')
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']!r} does not exist")
+
+        token, key = issue_token(user, options['name'])
+        self.stderr.write(f'Issued token {token.prefix}… for {user}; it will not be shown again')
+        self.stdout.write(key)
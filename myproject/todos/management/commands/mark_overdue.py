@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from todos.overdue import mark_overdue
+
+
+class Command(BaseCommand):
+    help = 'Move active tasks past their due date to OVERDUE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Tasks updated per transaction')
+        parser.add_argument(
+            '--every',
+            type=float,
+            metavar='SECONDS',
+            help='Keep running, repeating the job at this interval'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            count = mark_overdue(batch_size=options['batch_size'])
+            elapsed = time.monotonic() - started
+            self.stdout.write(self.style.SUCCESS(
+                f'Marked {count} tasks overdue in {elapsed:.2f}s'
+            ))
+            if not options['every']:
+                return
+            time.sleep(options['every'])
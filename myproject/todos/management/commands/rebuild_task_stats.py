@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from todos.stats import rebuild_task_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-user task status counters from the tasks table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            action='append',
+            dest='usernames',
+            help='Only rebuild the counters of this user (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        user_ids = None
+        if options['usernames']:
+            User = get_user_model()
+            users = dict(
+                User.objects.filter(username__in=options['usernames'])
+                .values_list('username', 'id')
+            )
+            unknown = set(options['usernames']) - set(users)
+            if unknown:
+                raise CommandError(f"Unknown users: {', '.join(sorted(unknown))}")
+            user_ids = list(users.values())
+
+        drifted = rebuild_task_stats(user_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt task stats, {drifted} counters had drifted'
+        ))
@@ -0,0 +1,74 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from todos.seeding import REFERENCE_TIME, seed_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate a deterministic synthetic dataset of users, tasks and '
+        'Zipf-distributed tags with bulk inserts'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100, help='Number of users')
+        parser.add_argument('--tasks-per-user', type=int, default=1000, help='Tasks generated for each user')
+        parser.add_argument('--tags', type=int, default=200, help='Size of the tag vocabulary')
+        parser.add_argument('--zipf', type=float, default=1.1, help='Exponent of the tag popularity distribution')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same seed gives the same data')
+        parser.add_argument(
+            '--reference-time',
+            default=REFERENCE_TIME.isoformat(),
+            help='ISO 8601 time the generated timestamps and due dates are placed around, '
+                 'or "now" for data that looks current (default: %(default)s)'
+        )
+        parser.add_argument('--workers', type=int, default=1, help='Processes writing user shards in parallel')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Tasks inserted per transaction')
+        parser.add_argument('--prefix', default='seed', help='Prefix of the generated usernames')
+
+    def handle(self, *args, **options):
+        for name in ('users', 'tasks_per_user', 'workers', 'batch_size'):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be at least 1")
+        self.verbosity = options['verbosity']
+        if options['workers'] > 1 and connection.vendor == 'sqlite':
+            # Writers would only queue up behind SQLite's single write lock
+            self.stderr.write('SQLite has a single writer, seeding with one worker')
+            options['workers'] = 1
+        reference_time = self.parse_reference_time(options['reference_time'])
+        started = time.monotonic()
+        created = seed_tasks(
+            options['users'],
+            options['tasks_per_user'],
+            tags=options['tags'],
+            seed=options['seed'],
+            zipf=options['zipf'],
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            prefix=options['prefix'],
+            now=reference_time,
+            progress=self.report_progress,
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {created} tasks for {options['users']} users in {elapsed:.1f}s "
+            f"({created / max(elapsed, 1e-9):.0f} tasks/s)"
+        ))
+
+    def parse_reference_time(self, value):
+        if value == 'now':
+            return timezone.now()
+        try:
+            parsed = parse_datetime(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise CommandError(f'--reference-time must be an ISO 8601 datetime or "now", not {value!r}')
+        return timezone.make_aware(parsed) if timezone.is_naive(parsed) else parsed
+
+    def report_progress(self, state):
+        if self.verbosity >= 1:
+            self.stdout.write(f"  {state['users']} users, {state['tasks']} tasks written")
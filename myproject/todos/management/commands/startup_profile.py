@@ -0,0 +1,70 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from todos.startup import profile_startup
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure how long a fresh web worker takes to import and set up the '
+        'project, broken down by phase, app and module'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--api-only',
+            action='store_true',
+            help='Profile with DJANGO_API_ONLY=True, as API-only workers run'
+        )
+        parser.add_argument('--top', type=int, default=15, help='Number of apps and modules listed')
+        parser.add_argument(
+            '--budget',
+            type=float,
+            metavar='MS',
+            help='Fail when the total exceeds this many milliseconds '
+                 '(default: STARTUP_BUDGET_MS)'
+        )
+        parser.add_argument('--json', action='store_true', help='Print the raw report as JSON')
+
+    def handle(self, *args, **options):
+        env = {'DJANGO_API_ONLY': 'True'} if options['api_only'] else {}
+        try:
+            report = profile_startup(os.environ['DJANGO_SETTINGS_MODULE'], env=env)
+        except RuntimeError as exc:
+            raise CommandError(str(exc))
+
+        budget = options['budget'] or getattr(settings, 'STARTUP_BUDGET_MS', None)
+        total = report['phases']['total']
+
+        if options['json']:
+            self.stdout.write(json.dumps({**report, 'budget_ms': budget}, indent=2))
+        else:
+            self.write_report(report, options['top'])
+
+        if budget is not None and total > budget:
+            raise CommandError(f'Startup took {total:.0f} ms, over the {budget:.0f} ms budget')
+        if not options['json']:
+            self.stdout.write(self.style.SUCCESS(
+                f'Startup took {total:.0f} ms'
+                + (f', within the {budget:.0f} ms budget' if budget is not None else '')
+            ))
+
+    def write_report(self, report, top):
+        self.stdout.write('Phases (ms):')
+        for name, elapsed in report['phases'].items():
+            self.stdout.write(f'  {name:<20} {elapsed:8.1f}')
+
+        self.stdout.write(f"\nImport time by app or package, {report['import_ms']:.1f} ms in total (ms):")
+        for owner, elapsed in list(report['by_owner'].items())[:top]:
+            self.stdout.write(f'  {owner:<40} {elapsed:8.1f}')
+
+        # Modules imported through importlib.import_module (settings, app
+        # and models modules) are not reported by -X importtime themselves,
+        # only what they import
+        self.stdout.write('\nSlowest imports, including what they import (ms):')
+        slowest = sorted(report['modules'], key=lambda module: module[2], reverse=True)
+        for name, _, cumulative, _ in slowest[:top]:
+            self.stdout.write(f'  {name:<40} {cumulative / 1000:8.1f}')
+        self.stdout.write('')
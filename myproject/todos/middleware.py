@@ -0,0 +1,182 @@
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class CompressorStream:
+    """
+    Incremental compressor for streamed responses.
+
+    Chunks are fed to the compressor as they come, but its output is only
+    flushed once ``flush_size`` bytes of input have gone in since the last
+    flush: flushing after every chunk of a row-per-chunk export restarts
+    the compressed blocks so often that the body ends up several times
+    larger. The bound still lets slow streams reach the client steadily.
+    """
+    flush_size = 32 * 1024
+
+    def __init__(self):
+        self.unflushed = 0
+
+    def process(self, chunk):
+        data = self.compress(chunk)
+        self.unflushed += len(chunk)
+        if self.unflushed >= self.flush_size:
+            self.unflushed = 0
+            data += self.flush()
+        return data
+
+
+class GzipStream(CompressorStream):
+    def __init__(self):
+        super().__init__()
+        self.compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, chunk):
+        return self.compressor.compress(chunk)
+
+    def flush(self):
+        return self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self.compressor.flush()
+
+
+class BrotliStream(CompressorStream):
+    def __init__(self, quality):
+        super().__init__()
+        self.compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk):
+        return self.compressor.process(chunk)
+
+    def flush(self):
+        return self.compressor.flush()
+
+    def finish(self):
+        return self.compressor.finish()
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compresses responses with brotli or gzip, whichever the client's
+    ``Accept-Encoding`` prefers; brotli wins ties and is only offered
+    when the ``brotli`` package is installed.
+
+    Otherwise it works like Django's GZipMiddleware: bodies shorter
+    than ``TASK_COMPRESSION_MIN_SIZE`` bytes and already encoded responses
+    are left alone, ``Vary: Accept-Encoding`` is added, strong ETags become
+    weak and gzipped bodies get the same random-length header against
+    BREACH. Streaming responses (sync or async) are compressed chunk by
+    chunk. Brotli runs at ``TASK_BROTLI_QUALITY``, as the highest
+    qualities cost far too much CPU for dynamic responses.
+    """
+    max_random_bytes = 100
+
+    @property
+    def min_size(self):
+        return getattr(settings, 'TASK_COMPRESSION_MIN_SIZE', 1024)
+
+    @property
+    def brotli_quality(self):
+        return getattr(settings, 'TASK_BROTLI_QUALITY', 4)
+
+    def get_encodings(self):
+        """
+        Return the supported encodings, most preferred first
+        """
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def choose_encoding(self, header):
+        """
+        Return the supported encoding with the highest q-value in an
+        ``Accept-Encoding`` header, or None
+        """
+        qualities = {}
+        for part in header.split(','):
+            coding, *params = part.split(';')
+            coding = coding.strip().lower()
+            if not coding:
+                continue
+            quality = 1.0
+            for param in params:
+                name, _, value = param.partition('=')
+                if name.strip().lower() == 'q':
+                    try:
+                        quality = float(value)
+                    except ValueError:
+                        quality = 0.0
+            qualities[coding] = quality
+
+        best, best_quality = None, 0.0
+        for encoding in self.get_encodings():
+            quality = qualities.get(encoding, qualities.get('*', 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def compress(self, encoding, content):
+        if encoding == 'br':
+            return brotli.compress(content, quality=self.brotli_quality)
+        return compress_string(content, max_random_bytes=self.max_random_bytes)
+
+    def get_stream(self, encoding):
+        if encoding == 'br':
+            return BrotliStream(self.brotli_quality)
+        return GzipStream()
+
+    def compress_stream(self, stream, chunks):
+        for chunk in chunks:
+            data = stream.process(chunk)
+            if data:
+                yield data
+        yield stream.finish()
+
+    async def acompress_stream(self, stream, chunks):
+        async for chunk in chunks:
+            data = stream.process(chunk)
+            if data:
+                yield data
+        yield stream.finish()
+
+    def process_response(self, request, response):
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self.choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            stream = self.get_stream(encoding)
+            if response.is_async:
+                response.streaming_content = self.acompress_stream(stream, response.streaming_content)
+            else:
+                response.streaming_content = self.compress_stream(stream, response.streaming_content)
+            # The compressed length is not known before the end of the stream
+            del response.headers['Content-Length']
+        else:
+            compressed = self.compress(encoding, response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # A strong ETag would claim the encoded body is byte-identical to
+        # other encodings of it (RFC 9110, section 8.8.1)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,82 @@
+from django.db import migrations
+
+# SQLite: an external-content FTS5 index over todos_task kept in sync by
+# triggers. Note that schema changes which make Django rebuild todos_task
+# on SQLite drop these triggers; such migrations must recreate them.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE todos_task_fts USING fts5(
+        title, description,
+        content='todos_task', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER todos_task_fts_insert AFTER INSERT ON todos_task BEGIN
+        INSERT INTO todos_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todos_task_fts_delete AFTER DELETE ON todos_task BEGIN
+        INSERT INTO todos_task_fts(todos_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER todos_task_fts_update AFTER UPDATE OF title, description ON todos_task BEGIN
+        INSERT INTO todos_task_fts(todos_task_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO todos_task_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO todos_task_fts(todos_task_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    'DROP TRIGGER IF EXISTS todos_task_fts_update',
+    'DROP TRIGGER IF EXISTS todos_task_fts_delete',
+    'DROP TRIGGER IF EXISTS todos_task_fts_insert',
+    'DROP TABLE IF EXISTS todos_task_fts',
+]
+
+# PostgreSQL: a generated tsvector column (title weighted above the
+# description) with a GIN index
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE todos_task ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX todos_task_search_idx ON todos_task USING GIN (search_vector)',
+]
+
+POSTGRES_REVERSE = [
+    'DROP INDEX IF EXISTS todos_task_search_idx',
+    'ALTER TABLE todos_task DROP COLUMN IF EXISTS search_vector',
+]
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        vendor_statements = statements.get(schema_editor.connection.vendor, [])
+        for statement in vendor_statements:
+            schema_editor.execute(statement)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0004_task_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+    ]
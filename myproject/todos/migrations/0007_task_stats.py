@@ -0,0 +1,42 @@
+# Generated by Django 5.1.3 on 2026-10-18 05:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_task_stats(apps, schema_editor):
+    Task = apps.get_model('todos', 'Task')
+    TaskStats = apps.get_model('todos', 'TaskStats')
+    rows = Task.objects.order_by().values('user_id', 'status').annotate(
+        count=models.Count('id')
+    )
+    TaskStats.objects.bulk_create([
+        TaskStats(user_id=row['user_id'], status=row['status'], count=row['count'])
+        for row in rows
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todos', '0006_overdue_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('OPEN', 'Open'), ('WORKING', 'Working'), ('PENDING_REVIEW', 'Pending Review'), ('COMPLETED', 'Completed'), ('OVERDUE', 'Overdue'), ('CANCELLED', 'Cancelled')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'task stats',
+                'constraints': [models.UniqueConstraint(fields=('user', 'status'), name='todos_taskstats_user_status_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_task_stats, migrations.RunPython.noop),
+    ]
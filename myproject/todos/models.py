@@ -41,4 +41,91 @@ class Task(models.Model):
         return self.title
 
     class Meta:
-        ordering = ['-timestamp']
+        # id breaks ties between tasks created in the same instant so that
+        # the ordering is total, which keyset pagination relies on
+        ordering = ['-timestamp', '-id']
+        indexes = [
+            models.Index(
+                fields=['user', 'timestamp', 'id'],
+                name='todos_task_user_ts_id_idx'
+            ),
+            # Serve the status and due date filters of the task list
+            models.Index(
+                fields=['user', 'status', 'due_date'],
+                name='todos_task_user_status_due_idx'
+            ),
+            models.Index(
+                fields=['user', 'due_date'],
+                name='todos_task_user_due_idx'
+            ),
+            # Serves the default ordering across all users, as the admin
+            # changelist pages through it
+            models.Index(
+                fields=['timestamp', 'id'],
+                name='todos_task_ts_id_idx'
+            ),
+            # Lets the overdue job find open tasks past their due date
+            # across all users
+            models.Index(
+                fields=['status', 'due_date'],
+                name='todos_task_status_due_idx'
+            ),
+        ]
+
+
+class TaskStats(models.Model):
+    """
+    Number of tasks a user has in one status, maintained incrementally
+    by todos.stats so dashboards never need a GROUP BY over all tasks
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='task_stats'
+    )
+    status = models.CharField(max_length=20, choices=Task.StatusChoices.choices)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'status'],
+                name='todos_taskstats_user_status_uniq'
+            ),
+        ]
+        verbose_name_plural = 'task stats'
+
+    def __str__(self):
+        return f'{self.user_id} {self.status}: {self.count}'
+
+
+class APIToken(models.Model):
+    """
+    Bearer credential for the API. Only the SHA-256 digest of the key is
+    stored; the key itself is shown once, when the token is issued.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='api_tokens'
+    )
+    name = models.CharField(max_length=100, blank=True)
+    # First characters of the key, so a token can be recognised in the admin
+    prefix = models.CharField(max_length=8, editable=False)
+    digest = models.CharField(max_length=64, unique=True, editable=False)
+    created = models.DateTimeField(auto_now_add=True)
+    revoked = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'API token'
+
+    def __str__(self):
+        return f'{self.prefix}… ({self.name or self.user})'
+
+    @property
+    def is_active(self):
+        return self.revoked is None
+
+    def revoke(self):
+        self.revoked = timezone.now()
+        self.save(update_fields=['revoked'])
@@ -0,0 +1,104 @@
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+from .models import Task
+from .stats import set_task_status
+
+logger = logging.getLogger(__name__)
+
+# Statuses a task can still be overdue from
+ACTIVE_STATUSES = (
+    Task.StatusChoices.OPEN,
+    Task.StatusChoices.WORKING,
+    Task.StatusChoices.PENDING_REVIEW,
+)
+
+
+def mark_overdue(now=None, batch_size=None):
+    """
+    Move active tasks whose due date has passed to OVERDUE.
+
+    Works in bounded batches: each batch reads up to ``batch_size`` ids,
+    in no particular order, from the (status, due_date) index and moves
+    them with one UPDATE in its own transaction. Every run re-scans all due dates before ``now``; tasks
+    leave the active statuses once moved, so the index range only holds
+    rows still to transition, including tasks created, reopened or
+    edited with a past due date since the previous run.
+
+    Returns the number of tasks transitioned.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, 'TASK_OVERDUE_BATCH_SIZE', 1000)
+    candidates = Task.objects.filter(status__in=ACTIVE_STATUSES, due_date__lt=now)
+
+    total = 0
+    while True:
+        # Transitioned rows leave the status set, so every query sees the
+        # next batch. Any order would make the database sort every late
+        # task on each batch instead of stopping after batch_size index rows
+        batch = list(candidates.order_by().values_list('id', flat=True)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic():
+            total += set_task_status(
+                Task.objects.filter(id__in=batch, status__in=ACTIVE_STATUSES),
+                Task.StatusChoices.OVERDUE
+            )
+    return total
+
+
+class OverdueScheduler:
+    """
+    Runs ``mark_overdue`` every ``interval`` seconds on a daemon thread
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            close_old_connections()
+            try:
+                count = mark_overdue()
+            except Exception:
+                logger.exception('Marking overdue tasks failed')
+            else:
+                if count:
+                    logger.info('Marked %d tasks overdue', count)
+            finally:
+                close_old_connections()
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.run, name='overdue-scheduler', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+
+_scheduler = None
+
+
+def start_overdue_scheduler():
+    """
+    Start the in-process scheduler if TASK_OVERDUE_INTERVAL is set.
+
+    Meant to be called once per serving process (see wsgi.py and
+    asgi.py); every worker running it is safe because the UPDATE only
+    touches rows that are still active.
+    """
+    global _scheduler
+    interval = getattr(settings, 'TASK_OVERDUE_INTERVAL', None)
+    if interval and _scheduler is None:
+        _scheduler = OverdueScheduler(interval).start()
+    return _scheduler
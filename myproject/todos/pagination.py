@@ -0,0 +1,211 @@
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class TaskCursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a unique ordering such as (timestamp, id).
+
+    Each page is fetched with a ``WHERE (timestamp, id) < (last seen)``
+    predicate instead of an OFFSET, so with a matching index every page
+    costs the same no matter how deep the client has scrolled. Cursors are
+    opaque base64 tokens encoding the position of the last row returned.
+    """
+    # The last field must be unique so that every row has a distinct position
+    ordering = ('-timestamp', '-id')
+    cursor_query_param = 'cursor'
+    limit_query_param = 'limit'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_default_limit(self):
+        return getattr(settings, 'TASK_PAGE_SIZE', 50)
+
+    def get_max_limit(self):
+        return getattr(settings, 'TASK_MAX_PAGE_SIZE', 500)
+
+    def get_limit(self, request):
+        """
+        Read ``?limit=`` from the request, clamped to the hard maximum
+        """
+        try:
+            limit = int(request.query_params[self.limit_query_param])
+        except (KeyError, ValueError):
+            return self.get_default_limit()
+        if limit <= 0:
+            return self.get_default_limit()
+        return min(limit, self.get_max_limit())
+
+    def get_ordering(self, view=None):
+        """
+        Views may override the keyset by exposing ``pagination_ordering``
+        """
+        return tuple(getattr(view, 'pagination_ordering', None) or self.ordering)
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Order and narrow ``queryset`` to the rows of the requested page,
+        plus one extra row telling whether another page exists
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(view)
+        self.limit = self.get_limit(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request)
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position))
+        return queryset[:self.limit + 1]
+
+    def get_page(self, rows):
+        self.has_next = len(rows) > self.limit
+        page = rows[:self.limit]
+        self.next_position = self.get_position(page[-1]) if self.has_next else None
+        return page
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.get_page(list(self.get_page_queryset(queryset, request, view)))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async counterpart of ``paginate_queryset`` for the ASGI views
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+        return self.get_page([row async for row in queryset])
+
+    def get_position(self, item):
+        """
+        Extract the ordering values from a model instance or a values() row
+        """
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            value = item[name] if isinstance(item, dict) else getattr(item, name)
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            position.append(value)
+        return position
+
+    def get_position_filter(self, position):
+        """
+        Build the lexicographic "comes after" predicate for a position.
+
+        For ``('-timestamp', '-id')`` this is
+        ``timestamp < ts OR (timestamp = ts AND id < pk)``.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def encode_cursor(self, position):
+        payload = json.dumps(position, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            position = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        except (TypeError, ValueError, UnicodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return self.parse_position(position)
+        except (TypeError, ValueError, OverflowError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def parse_position(self, position):
+        """
+        Convert the JSON values of a cursor back to the types of their
+        ordering fields, so a tampered cursor never reaches the database
+        """
+        parsers = {'timestamp': self.parse_timestamp, 'id': self.parse_id}
+        return [
+            # Other keys, such as search_rank, are numbers
+            parsers.get(field.lstrip('-'), self.parse_number)(value)
+            for field, value in zip(self.ordering, position)
+        ]
+
+    def parse_timestamp(self, value):
+        if not isinstance(value, str):
+            raise TypeError(value)
+        parsed = parse_datetime(value)
+        if parsed is None or timezone.is_naive(parsed):
+            raise ValueError(value)
+        return parsed
+
+    def parse_id(self, value):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise TypeError(value)
+        return value
+
+    def parse_number(self, value):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise TypeError(value)
+        return float(value)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(
+            self.base_url,
+            self.cursor_query_param,
+            self.encode_cursor(self.next_position)
+        )
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.limit_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
@@ -0,0 +1,60 @@
+import io
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from .renderers import MessagePackRenderer, ORJSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser that decodes request bodies with orjson.
+
+    Accepts and rejects the same documents as JSONParser: orjson refuses
+    NaN and Infinity like strict mode does, and a body orjson cannot
+    decode (e.g. one holding escaped lone surrogates) is handed to
+    JSONParser, which either accepts it or raises its usual ParseError.
+    Non UTF-8 request encodings, non-strict mode and a missing orjson
+    fall back to JSONParser altogether.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or not self.strict or encoding.lower().replace('_', '-') != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class MessagePackParser(BaseParser):
+    """
+    Parses ``application/msgpack`` request bodies.
+
+    Timestamp extension values become aware datetimes, which the
+    serializers' DateTimeFields accept like ISO 8601 strings.
+    """
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+    available = msgpack is not None
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), timestamp=3)
+        except (ValueError, TypeError) as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -0,0 +1,157 @@
+import csv
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class Echo:
+    """
+    File-like object whose write() returns the value instead of storing it,
+    letting csv.writer produce lines for a streaming response
+    """
+    def write(self, value):
+        return value
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson, producing the same bytes.
+
+    Datetimes, dates and times, and everything else orjson has no native
+    encoding for, go through DRF's JSONEncoder, so aware datetimes keep
+    the ``Z`` suffix and lazy strings, decimals and querysets render as
+    before. Choices are str or int subclasses and encode as their value.
+    Data orjson refuses (e.g. integers beyond 64 bits) is rendered by
+    JSONRenderer, as are indented responses such as the browsable API's.
+    One difference remains: NaN and infinite floats render as null where
+    strict JSONRenderer raises.
+    """
+    options = 0
+    if orjson is not None:
+        options = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+            | orjson.OPT_NON_STR_KEYS
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escaped like JSONRenderer does, to stay a strict JavaScript subset
+        if b'\xe2\x80' in ret:
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON: one rendered object per line.
+
+    ``render`` handles ordinary responses such as errors, ``stream``
+    renders an iterable of rows lazily for StreamingHttpResponse.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+    json_renderer_class = ORJSONRenderer
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self.json_renderer_class().render(data) + b'\n'
+
+    def stream(self, rows):
+        json_renderer = self.json_renderer_class()
+        for row in rows:
+            yield json_renderer.render(row) + b'\n'
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Flat CSV rendering of task rows, tags joined by ``tag_separator``
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+    header = ['id', 'user', 'timestamp', 'title', 'description', 'due_date', 'tags', 'status']
+    tag_separator = '|'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        # Only non-streamed bodies such as error details end up here
+        if isinstance(data, dict):
+            rows = [[key, value] for key, value in data.items()]
+        else:
+            rows = [[value] for value in data]
+        writer = csv.writer(Echo())
+        return ''.join(writer.writerow(row) for row in rows).encode(self.charset)
+
+    def flatten(self, task):
+        return [
+            task['id'],
+            task['user']['username'],
+            task['timestamp'],
+            task['title'],
+            task['description'],
+            task['due_date'] or '',
+            self.tag_separator.join(tag['name'] for tag in task['tags']),
+            task['status'],
+        ]
+
+    def stream(self, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(self.header).encode(self.charset)
+        for row in rows:
+            yield writer.writerow(self.flatten(row)).encode(self.charset)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack rendering, negotiated as ``application/msgpack``.
+
+    Serializers leave datetimes unformatted for this renderer (see
+    ``native_datetimes``), and they are packed with the timestamp
+    extension type instead of as ISO 8601 strings. Values MessagePack has
+    no type for go through DRF's JSONEncoder, as with JSON. ``stream``
+    writes one packed object per row, the MessagePack counterpart of
+    NDJSON, which ``msgpack.Unpacker`` reads back incrementally.
+
+    Only offered when the msgpack package is installed, see ``available``.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    native_datetimes = True
+    available = msgpack is not None
+
+    def get_packer(self):
+        return msgpack.Packer(datetime=True, default=JSONEncoder().default)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self.get_packer().pack(data)
+
+    def stream(self, rows):
+        packer = self.get_packer()
+        for row in rows:
+            yield packer.pack(row)
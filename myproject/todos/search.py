@@ -0,0 +1,139 @@
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework.filters import BaseFilterBackend
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class BaseSearchBackend:
+    """
+    Full-text search over Task.title and Task.description.
+
+    ``filter`` narrows a Task queryset to matching rows; ``search`` also
+    annotates ``search_rank`` and ``ordering`` tells the paginator how to
+    order ranked results (best first, id breaking ties).
+    """
+    rank_field = 'search_rank'
+    ordering = ('-search_rank', '-id')
+
+    def filter(self, queryset, query):
+        raise NotImplementedError
+
+    def rank(self, query):
+        raise NotImplementedError
+
+    def search(self, queryset, query):
+        return self.filter(queryset, query).annotate(**{self.rank_field: self.rank(query)})
+
+
+class SQLiteFTS5SearchBackend(BaseSearchBackend):
+    """
+    Uses the ``todos_task_fts`` FTS5 table that migration 0005 keeps in
+    sync with triggers. bm25() scores are lower for better matches.
+    """
+    table = 'todos_task_fts'
+    ordering = ('search_rank', '-id')
+    # bm25 column weights: a hit in the title counts more than the description
+    weights = (10.0, 1.0)
+
+    def to_match(self, query):
+        # Quote every token so user input can never be read as FTS5 syntax
+        tokens = TOKEN_RE.findall(query)
+        return ' '.join('"{}"'.format(token.replace('"', '""')) for token in tokens)
+
+    def filter(self, queryset, query):
+        match = self.to_match(query)
+        if not match:
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s',
+            (match,)
+        ))
+
+    def rank(self, query):
+        weights = ', '.join(str(weight) for weight in self.weights)
+        return RawSQL(
+            f'SELECT bm25({self.table}, {weights}) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND rowid = todos_task.id',
+            (self.to_match(query),),
+            output_field=FloatField()
+        )
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """
+    Uses the generated ``search_vector`` tsvector column and its GIN
+    index added by migration 0005. The column is not declared on the
+    model, so it never appears in Django's INSERTs or UPDATEs.
+    """
+    config = 'english'
+
+    def filter(self, queryset, query):
+        return queryset.filter(RawSQL(
+            'todos_task.search_vector @@ websearch_to_tsquery(%s, %s)',
+            (self.config, query),
+            output_field=BooleanField()
+        ))
+
+    def rank(self, query):
+        return RawSQL(
+            'ts_rank(todos_task.search_vector, websearch_to_tsquery(%s, %s))',
+            (self.config, query),
+            output_field=FloatField()
+        )
+
+
+class ContainsSearchBackend(BaseSearchBackend):
+    """
+    Unindexed fallback for other databases: every term must appear in
+    the title or description. Results are ordered newest first.
+    """
+    ordering = ('-timestamp', '-id')
+
+    def filter(self, queryset, query):
+        for token in TOKEN_RE.findall(query):
+            queryset = queryset.filter(Q(title__icontains=token) | Q(description__icontains=token))
+        return queryset
+
+    def rank(self, query):
+        return Value(0.0, output_field=FloatField())
+
+
+VENDOR_BACKENDS = {
+    'sqlite': SQLiteFTS5SearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_search_backend():
+    """
+    Return the backend named by TASK_SEARCH_BACKEND, or the one matching
+    the database vendor
+    """
+    path = getattr(settings, 'TASK_SEARCH_BACKEND', None)
+    if path:
+        return import_string(path)()
+    return VENDOR_BACKENDS.get(connection.vendor, ContainsSearchBackend)()
+
+
+class TaskSearchFilter(BaseFilterBackend):
+    """
+    Ranked full-text search through ``?q=``.
+
+    Switches the view's keyset pagination to the backend's rank ordering,
+    so search results stay cursor-paginated.
+    """
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        backend = get_search_backend()
+        view.pagination_ordering = backend.ordering
+        return backend.search(queryset, query)
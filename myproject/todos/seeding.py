@@ -0,0 +1,260 @@
+import bisect
+import itertools
+import math
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connections, transaction
+from .caching import bump_task_version
+from .models import Task, Tag
+from .stats import rebuild_task_stats
+
+# Share of generated tasks in each status
+STATUS_WEIGHTS = {
+    Task.StatusChoices.OPEN: 35,
+    Task.StatusChoices.WORKING: 20,
+    Task.StatusChoices.PENDING_REVIEW: 8,
+    Task.StatusChoices.COMPLETED: 27,
+    Task.StatusChoices.OVERDUE: 5,
+    Task.StatusChoices.CANCELLED: 5,
+}
+
+# Share of generated tasks carrying 0, 1, 2... tags
+TAG_COUNT_WEIGHTS = (15, 35, 30, 15, 5)
+
+# Time the generated data is relative to unless another one is given, so
+# that a seed always reproduces the same rows
+REFERENCE_TIME = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# Task columns in the order of the generated rows
+COLUMNS = ('user', 'timestamp', 'title', 'description', 'due_date', 'status')
+
+VERBS = ('Write', 'Review', 'Fix', 'Plan', 'Call', 'Email', 'Update', 'Prepare', 'Clean', 'Book')
+NOUNS = (
+    'report', 'invoice', 'release notes', 'dentist', 'budget', 'slides',
+    'backlog', 'garage', 'flights', 'contract', 'newsletter', 'roadmap',
+)
+
+
+class TaskGenerator:
+    """
+    Deterministic source of synthetic tasks.
+
+    Every user draws from its own random generator seeded with the seed
+    and the user's index, so a user's tasks do not depend on how users
+    are split between processes. Tags are picked with Zipf-distributed
+    popularity: the tag of rank k is used in proportion to 1 / k ** zipf.
+    Timestamps and due dates are placed around ``now``, which defaults to
+    the fixed REFERENCE_TIME rather than the clock.
+    """
+
+    def __init__(self, seed, tag_ids, zipf=1.1, due_date_ratio=0.7, now=REFERENCE_TIME,
+                 history=timedelta(days=365)):
+        self.seed = seed
+        self.tag_ids = list(tag_ids)
+        self.due_date_ratio = due_date_ratio
+        self.now = now
+        self.history = history
+        self.tag_weights = list(itertools.accumulate(
+            1 / rank ** zipf for rank in range(1, len(self.tag_ids) + 1)
+        ))
+        self.statuses = list(STATUS_WEIGHTS)
+        self.status_weights = list(itertools.accumulate(STATUS_WEIGHTS.values()))
+
+    def get_random(self, user_index):
+        return random.Random(f'{self.seed}:{user_index}')
+
+    def pick_tags(self, rng):
+        if not self.tag_ids:
+            return []
+        count = min(
+            len(self.tag_ids),
+            rng.choices(range(len(TAG_COUNT_WEIGHTS)), TAG_COUNT_WEIGHTS)[0]
+        )
+        picked = set()
+        while len(picked) < count:
+            rank = bisect.bisect(self.tag_weights, rng.random() * self.tag_weights[-1])
+            picked.add(self.tag_ids[min(rank, len(self.tag_ids) - 1)])
+        return sorted(picked)
+
+    def pick_due_date(self, rng, status):
+        if rng.random() >= self.due_date_ratio:
+            return None
+        if status == Task.StatusChoices.OVERDUE:
+            days = -rng.uniform(1, 60)
+        elif status in (Task.StatusChoices.COMPLETED, Task.StatusChoices.CANCELLED):
+            days = rng.uniform(-90, 30)
+        else:
+            # Active tasks past their due date would be OVERDUE already
+            days = rng.uniform(1, 60)
+        return self.now + timedelta(days=days)
+
+    def pick_timestamp(self, rng, number, count):
+        # Creation times rise with the row number over the past year, so
+        # ids and timestamps sort the same way as for real data
+        step = self.history / count
+        return self.now - self.history + step * (number + rng.random())
+
+    def generate(self, user_id, user_index, count):
+        """
+        Yield (task row, tag ids) pairs for one user, where the row holds
+        the values of COLUMNS
+        """
+        rng = self.get_random(user_index)
+        for number in range(count):
+            status = rng.choices(self.statuses, cum_weights=self.status_weights)[0]
+            title = f'{rng.choice(VERBS)} {rng.choice(NOUNS)} #{number}'
+            row = (
+                user_id,
+                self.pick_timestamp(rng, number, count),
+                title,
+                f'{title} for user {user_index}. ' * rng.randint(1, 4),
+                self.pick_due_date(rng, status),
+                status,
+            )
+            yield row, self.pick_tags(rng)
+
+
+def get_or_create_users(count, prefix='seed'):
+    """
+    Return [(index, user id)] for users named <prefix>-<index>, creating
+    the missing ones with unusable passwords
+    """
+    User = get_user_model()
+    names = [f'{prefix}-{index:06d}' for index in range(count)]
+    existing = dict(User.objects.filter(username__in=names).values_list('username', 'id'))
+    User.objects.bulk_create(
+        [User(username=name, password=make_password(None)) for name in names if name not in existing],
+        ignore_conflicts=True
+    )
+    existing.update(User.objects.filter(username__in=names).values_list('username', 'id'))
+    return [(index, existing[name]) for index, name in enumerate(names)]
+
+
+def get_or_create_tags(count, prefix='tag'):
+    """
+    Return the ids of tags named <prefix>-<rank>, most popular first
+    """
+    names = [f'{prefix}-{rank}' for rank in range(1, count + 1)]
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    ids = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+    return [ids[name] for name in names]
+
+
+def write_tasks(generator, users, tasks_per_user, batch_size=5000):
+    """
+    Insert the tasks of ``users`` in batches and return how many were created.
+
+    Each batch is one transaction. Tasks go in as multi-row INSERT ...
+    RETURNING statements built directly from value tuples, since creating
+    and preparing a model instance per row costs several times more than
+    the database spends on it; their tags follow with one executemany.
+    """
+    connection = connections[Task.objects.db]
+    quote = connection.ops.quote_name
+    columns = [Task._meta.get_field(name) for name in COLUMNS]
+    datetime_columns = [
+        index for index, field in enumerate(columns)
+        if field.get_internal_type() == 'DateTimeField'
+    ]
+    chunk_size = connection.ops.bulk_batch_size(columns, [None] * batch_size)
+    row_sql = f"({', '.join(['%s'] * len(columns))})"
+    insert_sql = (
+        f'INSERT INTO {quote(Task._meta.db_table)} '
+        f"({', '.join(quote(field.column) for field in columns)}) VALUES "
+    )
+    through = Task.tags.through._meta
+    through_sql = (
+        f'INSERT INTO {quote(through.db_table)} '
+        f"({quote(through.get_field('task').column)}, {quote(through.get_field('tag').column)}) "
+        'VALUES (%s, %s)'
+    )
+
+    rows = itertools.chain.from_iterable(
+        generator.generate(user_id, index, tasks_per_user) for index, user_id in users
+    )
+    created = 0
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            break
+        params = []
+        for row, _ in batch:
+            row = list(row)
+            for index in datetime_columns:
+                row[index] = connection.ops.adapt_datetimefield_value(row[index])
+            params.append(row)
+
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            task_ids = []
+            for start in range(0, len(params), chunk_size):
+                chunk = params[start:start + chunk_size]
+                cursor.execute(
+                    insert_sql + ', '.join([row_sql] * len(chunk)) + f" RETURNING {quote('id')}",
+                    [value for row in chunk for value in row]
+                )
+                task_ids.extend(task_id for task_id, in cursor.fetchall())
+            cursor.executemany(through_sql, [
+                (task_id, tag_id)
+                for task_id, (_, tag_ids) in zip(task_ids, batch)
+                for tag_id in tag_ids
+            ])
+        created += len(batch)
+    return created
+
+
+def _write_shard(generator, users, tasks_per_user, batch_size):
+    try:
+        return write_tasks(generator, users, tasks_per_user, batch_size)
+    finally:
+        connections.close_all()
+
+
+def seed_tasks(users, tasks_per_user, tags=200, seed=0, zipf=1.1, workers=1,
+               batch_size=5000, prefix='seed', now=REFERENCE_TIME, progress=None):
+    """
+    Generate ``users`` users with ``tasks_per_user`` tasks each and return
+    the number of tasks created. The same seed and ``now`` reproduce the
+    same tasks.
+
+    With more than one worker, users are split into shards written by a
+    pool of forked processes, each on its own database connection. Bulk
+    inserts send no signals, so the TaskStats counters of the seeded users
+    are rebuilt and their version markers bumped once at the end.
+    """
+    user_rows = get_or_create_users(users, prefix)
+    generator = TaskGenerator(seed, get_or_create_tags(tags), zipf=zipf, now=now)
+    # A few shards per worker keep the pool balanced and the progress moving
+    shard_size = max(1, math.ceil(len(user_rows) / (workers * 4)))
+    shards = [user_rows[start:start + shard_size] for start in range(0, len(user_rows), shard_size)]
+
+    created = done = 0
+    if workers > 1:
+        # Forked children must not share the parent's connections
+        connections.close_all()
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as pool:
+            futures = [
+                pool.submit(_write_shard, generator, shard, tasks_per_user, batch_size)
+                for shard in shards
+            ]
+            for shard, future in zip(shards, futures):
+                created += future.result()
+                done += len(shard)
+                if progress is not None:
+                    progress({'users': done, 'tasks': created})
+    else:
+        for shard in shards:
+            created += write_tasks(generator, shard, tasks_per_user, batch_size)
+            done += len(shard)
+            if progress is not None:
+                progress({'users': done, 'tasks': created})
+
+    user_ids = [user_id for _, user_id in user_rows]
+    for start in range(0, len(user_ids), 500):
+        rebuild_task_stats(user_ids[start:start + 500])
+    bump_task_version(*user_ids)
+    return created
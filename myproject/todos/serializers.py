@@ -1,20 +1,127 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from .models import Task, Tag
+from .tags import clean_tag_refs, lookup_tag_map, replace_task_tags, resolve_tag_refs
+
+# Shared by the fast read path so datetimes are formatted exactly like
+# the DateTimeField instances ModelSerializer builds for Task
+datetime_field = serializers.DateTimeField()
+# Leaves datetimes as they are, for renderers that encode them natively
+native_datetime_field = serializers.DateTimeField(format=None)
+
+
+def uses_native_datetimes(context):
+    """
+    Tell whether the renderer negotiated for the request encodes datetimes
+    itself (see MessagePackRenderer) instead of as ISO 8601 strings
+    """
+    renderer = getattr(context.get('request'), 'accepted_renderer', None)
+    return getattr(renderer, 'native_datetimes', False)
+
+# Fields of a rendered task, in rendering order, and those holding nested
+# objects that a sparse ?fields= selection only includes when expanded
+TASK_FIELDS = ('id', 'user', 'timestamp', 'title', 'description', 'due_date', 'tags', 'status')
+EXPANDABLE_FIELDS = ('user', 'tags')
+
+
+def get_field_selection(params):
+    """
+    Return the task fields selected by ``?fields=`` and ``?expand=``, in
+    rendering order, or None when every field is wanted.
+
+    ``fields`` lists the fields to render, ``expand`` adds nested user
+    and tags to that list; both take comma separated names.
+    """
+    def get_list(name):
+        return [
+            part.strip() for value in params.getlist(name)
+            for part in value.split(',') if part.strip()
+        ]
+
+    fields, expand = get_list('fields'), get_list('expand')
+    errors = {}
+    unknown = [name for name in fields if name not in TASK_FIELDS]
+    if unknown:
+        errors['fields'] = f'Unknown field: {", ".join(unknown)}'
+    unknown = [name for name in expand if name not in EXPANDABLE_FIELDS]
+    if unknown:
+        errors['expand'] = f'Cannot expand: {", ".join(unknown)}'
+    if errors:
+        raise serializers.ValidationError(errors)
+    if not fields:
+        return None
+    selected = set(fields) | set(expand)
+    return tuple(name for name in TASK_FIELDS if name in selected)
+
+
+def get_task_columns(fields):
+    """
+    Return the Task model fields needed to render ``fields``
+    """
+    return ['id'] + [
+        name for name in fields
+        if name not in ('id', 'tags')
+    ]
 
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['id', 'username']
 
+class OwnerSerializer(UserSerializer):
+    """
+    Renders the task owner, reusing request.user instead of loading the
+    user row once per task
+    """
+    def get_attribute(self, instance):
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated and instance.user_id == user.pk:
+            return user
+        return super().get_attribute(instance)
+
 class TagSerializer(serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ['id', 'name']
 
+class TagListField(serializers.Field):
+    """
+    Tags rendered as ``[{'id': ..., 'name': ...}]`` ordered by id, and
+    written as a list of names (or ids, or the rendered objects).
+    Validation only looks names up; missing tags are created when the task
+    is saved, inside its transaction, so an invalid request leaves no tags
+    behind. Callers that looked the names up already pass the map as
+    ``tag_ids`` in the serializer context.
+    """
+    default_error_messages = {
+        'invalid': 'Expected a list of tag names.',
+    }
+
+    def to_representation(self, value):
+        return [
+            {'id': tag.id, 'name': tag.name}
+            for tag in sorted(value.all(), key=lambda tag: tag.id)
+        ]
+
+    def to_internal_value(self, data):
+        """
+        Return an ordered {reference: tag id} map, where names of tags that
+        do not exist yet map to None; see ``resolve_tag_refs``
+        """
+        try:
+            refs = clean_tag_refs(data)
+            resolved = lookup_tag_map(refs, known=self.context.get('tag_ids'))
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(exc.messages)
+        return {ref: resolved.get(ref) for ref in refs}
+
+
 class TaskSerializer(serializers.ModelSerializer):
-    tags = TagSerializer(many=True, read_only=True)
-    user = UserSerializer(read_only=True)
+    tags = TagListField(required=False)
+    user = OwnerSerializer(read_only=True)
     
     class Meta:
         model = Task
@@ -29,3 +136,187 @@ class TaskSerializer(serializers.ModelSerializer):
             'status'
         ]
         read_only_fields = ['timestamp', 'user']
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Sparse fieldset chosen by the view, see get_field_selection()
+        selected = self.context.get('fields')
+        if selected is not None:
+            for name in set(self.fields) - set(selected):
+                self.fields.pop(name)
+        if uses_native_datetimes(self.context):
+            for field in self.fields.values():
+                if isinstance(field, serializers.DateTimeField):
+                    field.format = None
+
+    def create(self, validated_data):
+        tags = validated_data.pop('tags', None)
+        with transaction.atomic():
+            task = super().create(validated_data)
+            if tags:
+                replace_task_tags(task, resolve_tag_refs(tags))
+        return task
+
+    def update(self, instance, validated_data):
+        tags = validated_data.pop('tags', None)
+        with transaction.atomic():
+            task = super().update(instance, validated_data)
+            if tags is not None:
+                replace_task_tags(task, resolve_tag_refs(tags))
+        return task
+
+
+class TaskReadSerializer(serializers.BaseSerializer):
+    """
+    Read-only serializer that renders a page of tasks from values() rows.
+
+    Produces exactly the JSON of ``TaskSerializer(many=True)`` while
+    skipping the per-field machinery of ModelSerializer: the task columns
+    come from one values() query, the tags of the whole page from one
+    grouped query on the through table, and the owner from request.user.
+
+    A sparse fieldset passed as ``fields`` in the context renders only
+    those fields, and the columns and tags nobody asked for are not read.
+    """
+    value_fields = ('id', 'user_id', 'timestamp', 'title', 'description', 'due_date', 'status')
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        # The serializer always renders a whole page, so no ListSerializer
+        return cls(*args, **kwargs)
+
+    # Always read: pagination builds its cursor from them
+    key_fields = ('id', 'timestamp')
+
+    @classmethod
+    def prepare_queryset(cls, queryset, fields=None):
+        """
+        Turn a Task queryset into the values() rows this serializer renders,
+        reading only the columns of ``fields`` when given
+        """
+        if fields is None:
+            return queryset.values(*cls.value_fields)
+        columns = dict.fromkeys(cls.key_fields)
+        columns.update(
+            (f'{name}_id' if name == 'user' else name, None)
+            for name in get_task_columns(fields)
+        )
+        return queryset.values(*columns)
+
+    @classmethod
+    def row_from_instance(cls, task):
+        """
+        Build the values() row of a Task instance that is already loaded
+        """
+        return {field: getattr(task, field) for field in cls.value_fields}
+
+    def get_tag_rows(self, task_ids):
+        return (
+            Task.tags.through.objects
+            .filter(task_id__in=task_ids)
+            .order_by('task_id', 'tag_id')
+            .values_list('task_id', 'tag_id', 'tag__name')
+        )
+
+    def group_tags(self, task_ids, rows):
+        tags = {task_id: [] for task_id in task_ids}
+        for task_id, tag_id, name in rows:
+            tags[task_id].append({'id': tag_id, 'name': name})
+        return tags
+
+    def get_tags(self, task_ids):
+        """
+        Return {task id: [tag dicts ordered by id]} using a single query
+        """
+        return self.group_tags(task_ids, self.get_tag_rows(task_ids))
+
+    async def aget_tags(self, task_ids):
+        rows = [row async for row in self.get_tag_rows(task_ids)]
+        return self.group_tags(task_ids, rows)
+
+    def get_known_users(self):
+        users = {}
+        request = self.context.get('request')
+        current = getattr(request, 'user', None)
+        if current is not None and current.is_authenticated:
+            users[current.pk] = {'id': current.pk, 'username': current.username}
+        return users
+
+    def get_users(self, user_ids):
+        """
+        Return {user id: user dict}, taken from request.user where possible
+        """
+        users = self.get_known_users()
+        missing = set(user_ids) - set(users)
+        if missing:
+            for user in User.objects.filter(id__in=missing).values('id', 'username'):
+                users[user['id']] = user
+        return users
+
+    async def aget_users(self, user_ids):
+        users = self.get_known_users()
+        missing = set(user_ids) - set(users)
+        if missing:
+            async for user in User.objects.filter(id__in=missing).values('id', 'username'):
+                users[user['id']] = user
+        return users
+
+    def get_datetime_field(self):
+        if uses_native_datetimes(self.context):
+            return native_datetime_field
+        return datetime_field
+
+    def get_selected_fields(self):
+        return self.context.get('fields')
+
+    def render_sparse_rows(self, rows, tags, users, fields):
+        format_datetime = self.get_datetime_field().to_representation
+        renderers = {
+            'id': lambda row: row['id'],
+            'user': lambda row: users[row['user_id']],
+            'timestamp': lambda row: format_datetime(row['timestamp']),
+            'title': lambda row: row['title'],
+            'description': lambda row: row['description'],
+            'due_date': lambda row: format_datetime(row['due_date']),
+            'tags': lambda row: tags[row['id']],
+            'status': lambda row: row['status'],
+        }
+        renderers = [(name, renderers[name]) for name in fields]
+        return [{name: render(row) for name, render in renderers} for row in rows]
+
+    def render_rows(self, rows, tags, users):
+        fields = self.get_selected_fields()
+        if fields is not None:
+            return self.render_sparse_rows(rows, tags, users, fields)
+        format_datetime = self.get_datetime_field().to_representation
+        return [
+            {
+                'id': row['id'],
+                'user': users[row['user_id']],
+                'timestamp': format_datetime(row['timestamp']),
+                'title': row['title'],
+                'description': row['description'],
+                'due_date': format_datetime(row['due_date']),
+                'tags': tags[row['id']],
+                'status': row['status'],
+            }
+            for row in rows
+        ]
+
+    def renders(self, name):
+        fields = self.get_selected_fields()
+        return fields is None or name in fields
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        tags = self.get_tags([row['id'] for row in rows]) if self.renders('tags') else {}
+        users = self.get_users({row['user_id'] for row in rows}) if self.renders('user') else {}
+        return self.render_rows(rows, tags, users)
+
+    async def ato_representation(self, rows):
+        """
+        Async counterpart of ``to_representation`` for a list of rows
+        """
+        tags = await self.aget_tags([row['id'] for row in rows]) if self.renders('tags') else {}
+        users = await self.aget_users({row['user_id'] for row in rows}) if self.renders('user') else {}
+        return self.render_rows(rows, tags, users)
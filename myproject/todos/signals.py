@@ -0,0 +1,120 @@
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_init, post_save, pre_delete, pre_save
+)
+from django.conf import settings
+from django.db import transaction
+from django.dispatch import receiver
+from .authentication import token_cache
+from .caching import bump_task_version
+from .models import APIToken, Task, Tag
+from .stats import StatusDeltas
+from .tags import tag_cache, tag_index
+
+
+def users_with_tag(tag):
+    """
+    Return the ids of users owning at least one task carrying ``tag``
+    """
+    return set(
+        Task.objects.filter(tags=tag).values_list('user_id', flat=True).distinct()
+    )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+def task_changed(sender, instance, **kwargs):
+    bump_task_version(instance.user_id)
+
+
+@receiver(m2m_changed, sender=Task.tags.through)
+def task_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        # task.tags.add()/remove()/clear(): a single owner is affected
+        if action.startswith('post_'):
+            bump_task_version(instance.user_id)
+        return
+
+    # tag.task_set.add()/remove()/clear(): the owners of the touched tasks
+    if action == 'pre_clear':
+        instance._affected_task_users = users_with_tag(instance)
+    elif action == 'post_clear':
+        bump_task_version(*getattr(instance, '_affected_task_users', ()))
+    elif action in ('post_add', 'post_remove') and pk_set:
+        bump_task_version(*set(
+            Task.objects.filter(id__in=pk_set).values_list('user_id', flat=True)
+        ))
+
+
+@receiver(post_save, sender=Tag)
+def tag_saved(sender, instance, created, **kwargs):
+    tag_id, name = instance.pk, instance.name
+    transaction.on_commit(lambda: tag_index.add_many({tag_id: name}))
+    # A renamed tag changes the rendered tasks of everybody using it
+    if not created:
+        tag_cache.discard_tag(instance.pk)
+        bump_task_version(*users_with_tag(instance))
+
+
+@receiver(pre_delete, sender=Tag)
+def tag_deleting(sender, instance, **kwargs):
+    # The through rows are gone by post_delete, so collect owners now
+    instance._affected_task_users = users_with_tag(instance)
+
+
+@receiver(post_delete, sender=Tag)
+def tag_deleted(sender, instance, **kwargs):
+    tag_id = instance.pk
+    tag_cache.discard_tag(tag_id)
+    transaction.on_commit(lambda: tag_index.discard(tag_id))
+    bump_task_version(*getattr(instance, '_affected_task_users', ()))
+
+
+@receiver(post_init, sender=Task)
+def remember_stored_status(sender, instance, **kwargs):
+    # Read through __dict__ so a deferred status is not loaded here
+    instance._stored_status = instance.__dict__.get('status')
+
+
+@receiver(pre_save, sender=Task)
+def load_stored_status(sender, instance, **kwargs):
+    # The status was deferred when loaded but has been assigned since
+    if (not instance._state.adding and instance._stored_status is None
+            and 'status' in instance.__dict__):
+        instance._stored_status = (
+            Task.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender, instance, created, **kwargs):
+    status = instance.__dict__.get('status')
+    deltas = StatusDeltas()
+    if created:
+        deltas.add(instance.user_id, status)
+    elif status is not None and instance._stored_status is not None:
+        deltas.move(instance.user_id, instance._stored_status, status)
+    deltas.apply()
+    instance._stored_status = status
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender, instance, **kwargs):
+    status = instance._stored_status or instance.__dict__.get('status')
+    if status is not None:
+        deltas = StatusDeltas()
+        deltas.remove(instance.user_id, status)
+        deltas.apply()
+
+
+@receiver(post_save, sender=APIToken)
+@receiver(post_delete, sender=APIToken)
+def api_token_changed(sender, instance, **kwargs):
+    # A revoked or deleted token must stop authenticating right away
+    token_cache.discard(instance.digest)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def token_user_changed(sender, instance, **kwargs):
+    # Cached tokens hold the user object, e.g. a deactivated user
+    token_cache.discard_user(instance.pk)
@@ -0,0 +1,93 @@
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import Counter
+
+# Runs in a fresh interpreter so nothing is imported yet. Each phase is
+# timed separately, then the timings and the installed apps are printed
+# as one JSON line.
+PROFILE_SCRIPT = '''
+import json, time
+started = time.perf_counter()
+phases = {}
+
+def phase(name, func):
+    start = time.perf_counter()
+    result = func()
+    phases[name] = (time.perf_counter() - start) * 1000
+    return result
+
+import importlib
+django = phase('import django', lambda: importlib.import_module('django'))
+phase('settings', lambda: importlib.import_module('django.conf').settings.INSTALLED_APPS)
+phase('django.setup()', django.setup)
+phase('WSGI handler', lambda: importlib.import_module('%(wsgi)s').application)
+phase('URLconf', lambda: importlib.import_module('django.urls').get_resolver().url_patterns)
+phases['total'] = (time.perf_counter() - started) * 1000
+apps = [app.name for app in importlib.import_module('django.apps').apps.get_app_configs()]
+print(json.dumps({'phases': phases, 'apps': apps}))
+'''
+
+IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_importtime(output):
+    """
+    Return [(module, self us, cumulative us, depth)] from -X importtime output
+    """
+    modules = []
+    for line in output.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules.append((name, int(own), int(cumulative), len(indent) // 2))
+    return modules
+
+
+def get_owner(module, packages):
+    """
+    Return the longest entry of ``packages`` that ``module`` belongs to
+    """
+    for package in packages:
+        if module == package or module.startswith(f'{package}.'):
+            return package
+    return module.split('.')[0]
+
+
+def profile_startup(settings_module=None, wsgi_module=None, env=None):
+    """
+    Start a fresh interpreter that sets Django up the way a web worker
+    does and return where its startup time went.
+
+    Import time is attributed to the installed app owning each module
+    (``django.contrib.admin``, ``rest_framework``, ``todos``...), other
+    modules are grouped by top-level package.
+    """
+    settings_module = settings_module or os.environ.get('DJANGO_SETTINGS_MODULE')
+    wsgi_module = wsgi_module or f"{settings_module.rsplit('.', 1)[0]}.wsgi"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROFILE_SCRIPT % {'wsgi': wsgi_module}],
+        env={**os.environ, **(env or {}), 'DJANGO_SETTINGS_MODULE': settings_module},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise RuntimeError(f'Startup failed:\n{result.stderr[-2000:]}')
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    modules = parse_importtime(result.stderr)
+    # Longest names first so that django.contrib.admin wins over django
+    packages = sorted(set(report['apps']) | {'django'}, key=len, reverse=True)
+
+    by_owner = Counter()
+    for name, own, _, _ in modules:
+        by_owner[get_owner(name, packages)] += own
+    return {
+        'phases': report['phases'],
+        'apps': report['apps'],
+        'modules': modules,
+        'by_owner': {owner: micros / 1000 for owner, micros in by_owner.most_common()},
+        'import_ms': sum(own for _, own, _, _ in modules) / 1000,
+    }
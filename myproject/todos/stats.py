@@ -0,0 +1,116 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, F
+from .caching import bump_task_version
+from .models import Task, TaskStats
+
+
+class StatusDeltas(Counter):
+    """
+    Pending changes to TaskStats, keyed by (user id, status)
+    """
+
+    def add(self, user_id, status, count=1):
+        self[(user_id, status)] += count
+
+    def remove(self, user_id, status, count=1):
+        self[(user_id, status)] -= count
+
+    def move(self, user_id, old_status, new_status):
+        if old_status != new_status:
+            self.remove(user_id, old_status)
+            self.add(user_id, new_status)
+
+    def apply(self):
+        apply_status_deltas(self)
+
+
+def apply_status_deltas(deltas):
+    """
+    Add each delta to its TaskStats row with F() arithmetic.
+
+    Rows are created on demand for positive deltas only; a negative delta
+    without a row means the counters already drifted (or the user is being
+    deleted) and is left for ``rebuild_task_stats`` to repair.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        for (user_id, status), delta in sorted(deltas.items()):
+            counters = TaskStats.objects.filter(user_id=user_id, status=status)
+            if counters.update(count=F('count') + delta) or delta < 0:
+                continue
+            # ignore_conflicts tolerates a concurrent first insert
+            TaskStats.objects.bulk_create(
+                [TaskStats(user_id=user_id, status=status, count=0)],
+                ignore_conflicts=True
+            )
+            counters.update(count=F('count') + delta)
+
+
+def set_task_status(queryset, status):
+    """
+    Move every task of ``queryset`` to ``status`` with a single UPDATE and
+    return how many changed.
+
+    The affected rows are read under a lock first, so the TaskStats deltas
+    match what the UPDATE changes; update() itself sends no model signals.
+    """
+    with transaction.atomic():
+        rows = list(
+            queryset.select_for_update().exclude(status=status)
+            .order_by().values_list('id', 'user_id', 'status')
+        )
+        if not rows:
+            return 0
+        changed = Task.objects.filter(id__in=[task_id for task_id, _, _ in rows]).update(status=status)
+        deltas = StatusDeltas()
+        for _, user_id, old_status in rows:
+            deltas.move(user_id, old_status, status)
+        deltas.apply()
+        bump_task_version(*{user_id for _, user_id, _ in rows})
+    return changed
+
+
+def get_status_counts(user):
+    """
+    Return {status: count} for every status choice, plus the total
+    """
+    counts = dict.fromkeys(Task.StatusChoices.values, 0)
+    counts.update(
+        TaskStats.objects.filter(user=user).values_list('status', 'count')
+    )
+    return {'total': sum(counts.values()), 'by_status': counts}
+
+
+def rebuild_task_stats(user_ids=None):
+    """
+    Recompute counters from the tasks table and return how many rows drifted
+    """
+    tasks = Task.objects.all()
+    stats = TaskStats.objects.all()
+    if user_ids is not None:
+        tasks = tasks.filter(user_id__in=user_ids)
+        stats = stats.filter(user_id__in=user_ids)
+
+    with transaction.atomic():
+        actual = {
+            (row['user_id'], row['status']): row['count']
+            for row in tasks.order_by().values('user_id', 'status').annotate(count=Count('id'))
+        }
+        stored = {
+            (user_id, status): count
+            for user_id, status, count in stats.values_list('user_id', 'status', 'count')
+        }
+        drifted = {
+            key for key in actual.keys() | stored.keys()
+            if actual.get(key, 0) != stored.get(key, 0)
+        }
+        stats.delete()
+        TaskStats.objects.bulk_create([
+            TaskStats(user_id=user_id, status=status, count=count)
+            for (user_id, status), count in actual.items()
+        ])
+    return len(drifted)
@@ -0,0 +1,362 @@
+import bisect
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Count, Q
+from .caching import bump_task_version, get_task_cache, get_task_version
+from .models import Task, Tag
+
+FACETS_KEY = 'todos:tag-facets:{user_id}:{version}:{status}'
+
+
+def clean_tag_refs(value):
+    """
+    Normalise a list of tag references to unique names and ids, in order.
+
+    A reference is a tag name, an existing tag id, or a rendered tag
+    object ``{'id': ..., 'name': ...}`` (the id wins when both are given),
+    so tags read from the API can be sent back unchanged.
+    """
+    if not isinstance(value, (list, tuple)):
+        raise ValidationError('Expected a list of tag names.')
+    max_length = Tag._meta.get_field('name').max_length
+    refs = []
+    for tag in value:
+        if isinstance(tag, dict):
+            tag = tag.get('id', tag.get('name'))
+        if isinstance(tag, bool):
+            raise ValidationError('Tags must be names or tag ids.')
+        if isinstance(tag, int):
+            refs.append(tag)
+            continue
+        if not isinstance(tag, str) or not tag.strip():
+            raise ValidationError('Tag names must be non-empty strings.')
+        tag = tag.strip()
+        if len(tag) > max_length:
+            raise ValidationError(f'Tag names are limited to {max_length} characters.')
+        refs.append(tag)
+    return list(dict.fromkeys(refs))
+
+
+class TagCache:
+    """
+    Bounded LRU mapping tag references (names, and ids known to exist) to
+    tag ids, with a TTL.
+
+    The cache is per process: renames and deletions made in this process
+    evict entries immediately through signals, while other processes
+    notice them at the latest after ``ttl`` seconds.
+    """
+
+    def __init__(self, max_size=None, ttl=None):
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self._max_size = max_size
+        self._ttl = ttl
+
+    @property
+    def max_size(self):
+        if self._max_size is not None:
+            return self._max_size
+        return getattr(settings, 'TASK_TAG_CACHE_SIZE', 4096)
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'TASK_TAG_CACHE_TTL', 300)
+
+    def get_many(self, refs):
+        """
+        Return {reference: tag id} for the cached ones among ``refs``
+        """
+        found = {}
+        now = time.monotonic()
+        with self.lock:
+            for ref in refs:
+                entry = self.entries.get(ref)
+                if entry is None:
+                    continue
+                expires, tag_id = entry
+                if expires <= now:
+                    del self.entries[ref]
+                    continue
+                self.entries.move_to_end(ref)
+                found[ref] = tag_id
+        return found
+
+    def set_many(self, tag_ids):
+        if self.max_size <= 0 or self.ttl <= 0:
+            return
+        expires = time.monotonic() + self.ttl
+        with self.lock:
+            for ref, tag_id in tag_ids.items():
+                self.entries[ref] = (expires, tag_id)
+                self.entries.move_to_end(ref)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def discard_tag(self, tag_id):
+        with self.lock:
+            for ref in [
+                ref for ref, (_, cached_id) in self.entries.items()
+                if cached_id == tag_id
+            ]:
+                del self.entries[ref]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+tag_cache = TagCache()
+
+
+class TagPrefixIndex:
+    """
+    In-memory index of tag names sorted case-insensitively, answering
+    prefix lookups with a binary search.
+
+    It is loaded on first use and then kept current incrementally: tags
+    written by this process are added, renamed or dropped once their
+    transaction commits. Writes made by other processes are picked up by
+    a full reload every ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl=None):
+        self.lock = threading.Lock()
+        # Sorted (folded name, name, id) entries, and the entry of each id
+        self.entries = []
+        self.by_id = {}
+        self.expires = None
+        self._ttl = ttl
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'TASK_TAG_INDEX_TTL', 300)
+
+    def load(self):
+        entries = sorted(
+            (name.casefold(), name, tag_id)
+            for tag_id, name in Tag.objects.values_list('id', 'name').iterator()
+        )
+        self.entries = entries
+        self.by_id = {entry[2]: entry for entry in entries}
+        self.expires = time.monotonic() + self.ttl
+
+    def _remove(self, tag_id):
+        entry = self.by_id.pop(tag_id, None)
+        if entry is not None:
+            index = bisect.bisect_left(self.entries, entry)
+            del self.entries[index]
+
+    def add_many(self, tags):
+        """
+        Add or rename the tags of {tag id: name}
+        """
+        with self.lock:
+            if self.expires is None:
+                # Not loaded yet: the first search reads them from the table
+                return
+            for tag_id, name in tags.items():
+                self._remove(tag_id)
+                entry = (name.casefold(), name, tag_id)
+                bisect.insort(self.entries, entry)
+                self.by_id[tag_id] = entry
+
+    def discard(self, tag_id):
+        with self.lock:
+            self._remove(tag_id)
+
+    def search(self, prefix, limit=10, tag_ids=None):
+        """
+        Return up to ``limit`` (id, name) pairs of the tags whose name
+        starts with ``prefix``, ignoring case, in name order, only among
+        ``tag_ids`` when given
+        """
+        prefix = prefix.casefold()
+        with self.lock:
+            if self.expires is None or self.expires <= time.monotonic():
+                self.load()
+            index = bisect.bisect_left(self.entries, (prefix,))
+            matches = []
+            while index < len(self.entries) and len(matches) < limit:
+                folded, name, tag_id = self.entries[index]
+                if not folded.startswith(prefix):
+                    break
+                if tag_ids is None or tag_id in tag_ids:
+                    matches.append((tag_id, name))
+                index += 1
+        return matches
+
+    def clear(self):
+        with self.lock:
+            self.entries = []
+            self.by_id = {}
+            self.expires = None
+
+
+tag_index = TagPrefixIndex()
+
+
+def get_tag_facets(user, status=None):
+    """
+    Return [{'id', 'name', 'count'}] for the tags on ``user``'s tasks,
+    optionally only those in ``status``, most used first.
+
+    The counts come from one grouped query over the through table. They
+    are cached under the user's task version marker, so any change to
+    the user's tasks or to a tag they use makes a fresh count, and for
+    at most ``TASK_TAG_FACETS_TTL`` seconds otherwise.
+    """
+    cache = get_task_cache()
+    key = FACETS_KEY.format(
+        user_id=user.pk, version=get_task_version(user.pk), status=status or ''
+    )
+    facets = cache.get(key)
+    if facets is not None:
+        return facets
+
+    links = Task.tags.through.objects.filter(task__user=user)
+    if status is not None:
+        links = links.filter(task__status=status)
+    facets = [
+        {'id': tag_id, 'name': name, 'count': count}
+        for tag_id, name, count in links.values_list('tag_id', 'tag__name').annotate(
+            count=Count('id')
+        ).order_by('-count', 'tag__name')
+    ]
+    cache.set(key, facets, timeout=getattr(settings, 'TASK_TAG_FACETS_TTL', 30))
+    return facets
+
+
+def resolve_tag_map(refs):
+    """
+    Return {reference: tag id} for ``refs`` (see ``clean_tag_refs``).
+
+    References in the cache cost nothing. The others are looked up with a
+    single query; names still missing are then created in bulk, tolerating
+    tags created concurrently under the unique constraint, and read back.
+    Unknown ids raise ValidationError.
+
+    Creating tags writes to the database, so call it inside the
+    transaction whose outcome decides whether they should exist.
+    """
+    resolved = lookup_tag_map(refs)
+    missing_names = [ref for ref in refs if resolved.get(ref) is None]
+    if missing_names:
+        resolved.update(create_tags(missing_names))
+    return resolved
+
+
+def lookup_tag_map(refs, known=None):
+    """
+    Return {reference: tag id} for the references of existing tags,
+    without creating any.
+
+    Unknown ids raise ValidationError, names of missing tags are left out.
+    ``known`` is an earlier result, where names already found missing may
+    map to None so they are not looked up again.
+    """
+    known = known or {}
+    resolved = {ref: known[ref] for ref in refs if ref in known}
+    resolved.update(tag_cache.get_many([ref for ref in refs if ref not in resolved]))
+    missing_ids = {ref for ref in refs if isinstance(ref, int) and ref not in resolved}
+    missing_names = [ref for ref in refs if isinstance(ref, str) and ref not in resolved]
+    if not missing_ids and not missing_names:
+        return resolved
+
+    found = {}
+    for tag_id, name in Tag.objects.filter(
+        Q(id__in=missing_ids) | Q(name__in=missing_names)
+    ).values_list('id', 'name'):
+        found[tag_id] = tag_id
+        found[name] = tag_id
+    unknown = sorted(missing_ids - found.keys())
+    if unknown:
+        raise ValidationError(f'Unknown tag ids: {unknown}')
+
+    # Tags seen by a transaction that rolls back must not be cached
+    transaction.on_commit(lambda: tag_cache.set_many(found))
+    resolved.update(found)
+    return resolved
+
+
+def create_tags(names):
+    """
+    Create the tags called ``names`` that do not exist yet and return
+    {name: tag id} for all of them.
+
+    One bulk INSERT ignoring conflicts on the unique name, so tags created
+    concurrently are reused, then one SELECT to read the ids back.
+    """
+    Tag.objects.bulk_create([Tag(name=name) for name in names], ignore_conflicts=True)
+    created = dict(Tag.objects.filter(name__in=names).values_list('name', 'id'))
+
+    def remember():
+        tag_cache.set_many(created)
+        # bulk_create sends no post_save for the prefix index
+        tag_index.add_many({tag_id: name for name, tag_id in created.items()})
+
+    transaction.on_commit(remember)
+    return created
+
+
+def resolve_tag_refs(ref_map):
+    """
+    Return the tag ids of an ordered {reference: tag id or None} map, as
+    validated by TagListField, creating the tags of the unresolved names
+    """
+    missing = [ref for ref, tag_id in ref_map.items() if tag_id is None]
+    created = create_tags(missing) if missing else {}
+    return [created[ref] if tag_id is None else tag_id for ref, tag_id in ref_map.items()]
+
+
+def set_task_tags(tag_sets):
+    """
+    Make the tags of each task in {task id: [tag ids]} exactly those given.
+
+    Reads the current through rows of all the tasks in one query, then
+    deletes the links that went away with one DELETE and inserts the new
+    ones with one bulk INSERT; links kept on both sides are not touched.
+    Bulk writes send no m2m_changed signals, so callers bump the owners'
+    version markers.
+    """
+    if not tag_sets:
+        return
+    through = Task.tags.through
+    current = {}
+    for row_id, task_id, tag_id in through.objects.filter(
+        task_id__in=list(tag_sets)
+    ).values_list('id', 'task_id', 'tag_id'):
+        current[(task_id, tag_id)] = row_id
+    wanted = {
+        (task_id, tag_id)
+        for task_id, tag_ids in tag_sets.items()
+        for tag_id in tag_ids
+    }
+    stale = [row_id for link, row_id in current.items() if link not in wanted]
+    if stale:
+        through.objects.filter(id__in=stale).delete()
+    added = sorted(wanted - current.keys())
+    if added:
+        through.objects.bulk_create([
+            through(task_id=task_id, tag_id=tag_id) for task_id, tag_id in added
+        ])
+
+
+def replace_task_tags(task, tag_ids):
+    """
+    Set the tags of a saved task and invalidate what rendered the old ones.
+    Call it inside the transaction that saves the task.
+    """
+    set_task_tags({task.id: tag_ids})
+    bump_task_version(task.user_id)
+    # Drop tags prefetched before the write
+    getattr(task, '_prefetched_objects_cache', {}).pop('tags', None)
@@ -0,0 +1,133 @@
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from ..admin import EstimatedCountPaginator
+from ..models import Task, Tag
+from ..stats import get_status_counts
+
+class AdminScalingTest(TestCase):
+    def setUp(self):
+        """
+        Log in a superuser and create tagged tasks
+        """
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            password='adminpass123'
+        )
+        self.client.force_login(self.admin)
+        self.home = Tag.objects.create(name='home')
+        self.work = Tag.objects.create(name='work')
+        self.add_tasks(5)
+
+    def add_tasks(self, count):
+        for index in range(count):
+            task = Task.objects.create(
+                user=self.admin, title=f'Task {index}', description='Admin'
+            )
+            task.tags.add(self.home, self.work)
+
+    def count_queries(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries.captured_queries), response
+
+    def test_task_changelist_uses_fixed_queries(self):
+        """
+        Test that the task changelist costs the same with more rows
+        """
+        url = reverse('admin:todos_task_changelist')
+        few, response = self.count_queries(url)
+        self.assertContains(response, 'home, work')
+
+        self.add_tasks(20)
+        many, _ = self.count_queries(url)
+        self.assertEqual(few, many)
+
+    def test_tag_changelist_shows_counts_with_fixed_queries(self):
+        """
+        Test that tag usage counts come from the changelist query
+        """
+        url = reverse('admin:todos_tag_changelist')
+        few, response = self.count_queries(url)
+        self.assertContains(response, '<td class="field-get_task_count">5</td>', html=True)
+
+        Tag.objects.bulk_create([Tag(name=f'extra-{index}') for index in range(10)])
+        many, response = self.count_queries(url, o='-2')
+        self.assertEqual(few, many)
+        self.assertContains(response, '<td class="field-get_task_count">0</td>', html=True)
+
+    def test_count_stops_at_cap(self):
+        """
+        Test that the paginator never counts past max_count
+        """
+        with mock.patch.object(EstimatedCountPaginator, 'max_count', 3):
+            paginator = EstimatedCountPaginator(Task.objects.filter(title__startswith='Task'), 2)
+            self.assertEqual(paginator.count, 3)
+            self.assertEqual(EstimatedCountPaginator(Task.objects.none(), 2).count, 0)
+
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse('admin:todos_task_changelist'))
+        counts = [
+            query['sql'] for query in queries.captured_queries
+            if 'COUNT(' in query['sql']
+        ]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('LIMIT 4', counts[0])
+
+    def test_status_action_is_one_update(self):
+        """
+        Test that a status action issues a single UPDATE and keeps the counters
+        """
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('admin:todos_task_changelist'), {
+                'action': 'mark_completed',
+                '_selected_action': list(Task.objects.values_list('id', flat=True)),
+            })
+        self.assertEqual(response.status_code, 302)
+
+        updates = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE "todos_task"')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            Task.objects.filter(status=Task.StatusChoices.COMPLETED).count(), 5
+        )
+        counts = get_status_counts(self.admin)['by_status']
+        self.assertEqual(counts[Task.StatusChoices.COMPLETED], 5)
+        self.assertEqual(counts[Task.StatusChoices.OPEN], 0)
+
+    def test_tags_use_autocomplete(self):
+        """
+        Test that the task form loads tags through the autocomplete widget
+        """
+        task = Task.objects.first()
+        response = self.client.get(reverse('admin:todos_task_change', args=[task.pk]))
+
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertNotContains(response, 'SelectFilter')
+
+    def test_tag_filter_lists_a_bounded_number_of_tags(self):
+        """
+        Test that the tag filter neither loads every tag nor loses the selected one
+        """
+        url = reverse('admin:todos_task_changelist')
+        few, _ = self.count_queries(url)
+
+        Tag.objects.bulk_create([Tag(name=f'extra-{index:02d}') for index in range(30)])
+        many, response = self.count_queries(url)
+        self.assertEqual(few, many)
+        self.assertNotContains(response, 'extra-25')
+
+        last = Tag.objects.get(name='extra-25')
+        Task.objects.first().tags.add(last)
+        _, response = self.count_queries(url, tag=last.id)
+        self.assertContains(response, 'extra-25')
+        self.assertEqual(response.context['cl'].result_count, 1)
+
+        response = self.client.get(url, {'tag': 'bogus'})
+        self.assertRedirects(response, url + '?e=1', fetch_redirect_response=False)
@@ -0,0 +1,246 @@
+from unittest import skipUnless
+from asgiref.sync import sync_to_async
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..authentication import issue_token, token_cache
+from ..caching import get_task_cache
+from ..models import Task, Tag
+from ..renderers import MessagePackRenderer
+
+class AsyncTaskViewTest(TestCase):
+    def setUp(self):
+        """
+        Create tagged tasks for two users and a token for the first one
+        """
+        self.user = User.objects.create_user(
+            username='asyncuser',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='otheruser',
+            password='testpass456'
+        )
+        self.tag1 = Tag.objects.create(name='Work')
+        self.tag2 = Tag.objects.create(name='Home')
+        self.task1 = Task.objects.create(
+            user=self.user,
+            title='First',
+            description='First task'
+        )
+        self.task1.tags.add(self.tag2, self.tag1)
+        self.task2 = Task.objects.create(
+            user=self.user,
+            title='Second',
+            description='Second task',
+            status=Task.StatusChoices.WORKING
+        )
+        self.foreign = Task.objects.create(
+            user=self.other,
+            title='Foreign',
+            description='Not yours'
+        )
+        _, self.key = issue_token(self.user)
+        self.headers = {'Authorization': f'Token {self.key}'}
+
+        self.sync_client = APIClient()
+        self.sync_client.credentials(HTTP_AUTHORIZATION=f'Token {self.key}')
+        get_task_cache().clear()
+        token_cache.clear()
+
+    async def test_list_matches_sync_endpoint(self):
+        """
+        Test that both list endpoints render identical JSON
+        """
+        response = await self.async_client.get(reverse('async-task-list'), headers=self.headers)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        sync_response = await self.get_sync(reverse('task-list'))
+        self.assertEqual(response.json()['results'], sync_response.json()['results'])
+
+    async def test_list_paginates_and_filters(self):
+        """
+        Test that cursors and filters behave like the sync endpoint
+        """
+        url = reverse('async-task-list')
+        first = await self.async_client.get(url, {'limit': 1}, headers=self.headers)
+        self.assertEqual([task['id'] for task in first.json()['results']], [self.task2.id])
+
+        second = await self.async_client.get(first.json()['next'], headers=self.headers)
+        self.assertEqual([task['id'] for task in second.json()['results']], [self.task1.id])
+        self.assertIsNone(second.json()['next'])
+
+        filtered = await self.async_client.get(url, {'status': 'WORKING'}, headers=self.headers)
+        self.assertEqual([task['id'] for task in filtered.json()['results']], [self.task2.id])
+
+        invalid = await self.async_client.get(url, {'status': 'BOGUS'}, headers=self.headers)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_search_results_are_paginated(self):
+        """
+        Test that the cursor of ranked search results can be followed
+        """
+        url = reverse('async-task-list')
+        first = await self.async_client.get(url, {'q': 'task', 'limit': 1}, headers=self.headers)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        second = await self.async_client.get(first.json()['next'], headers=self.headers)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        ids = [task['id'] for task in first.json()['results'] + second.json()['results']]
+        self.assertEqual(sorted(ids), sorted([self.task1.id, self.task2.id]))
+        self.assertNotIn('search_rank', second.json()['results'][0])
+        self.assertIsNone(second.json()['next'])
+
+    @override_settings(TASK_LIST_CACHE_ENABLED=True)
+    async def test_list_etag_and_cache(self):
+        """
+        Test conditional GETs and the server-side list cache
+        """
+        url = reverse('async-task-list')
+        response = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+        cached = await self.async_client.get(url, headers=self.headers)
+        self.assertEqual(cached['X-Cache'], 'HIT')
+
+        not_modified = await self.async_client.get(
+            url, headers={**self.headers, 'If-None-Match': response['ETag']}
+        )
+        self.assertEqual(not_modified.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_retrieve_matches_sync_endpoint(self):
+        """
+        Test that both detail endpoints render identical JSON
+        """
+        response = await self.async_client.get(
+            reverse('async-task-detail', args=[self.task1.id]), headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        sync_response = await self.get_sync(reverse('task-detail', args=[self.task1.id]))
+        self.assertEqual(response.json(), sync_response.json())
+
+    async def test_sparse_fields_match_sync_endpoint(self):
+        """
+        Test that ?fields= and ?expand= select the same fields on both APIs
+        """
+        for url, sync_url in (
+            (reverse('async-task-list'), reverse('task-list')),
+            (reverse('async-task-detail', args=[self.task1.id]), reverse('task-detail', args=[self.task1.id])),
+        ):
+            for query in ('?fields=id,title', '?fields=title&expand=tags,user'):
+                response = await self.async_client.get(url + query, headers=self.headers)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                sync_response = await self.get_sync(sync_url + query)
+                self.assertEqual(response.json(), sync_response.json(), url + query)
+
+        response = await self.async_client.get(
+            reverse('async-task-list') + '?fields=secret', headers=self.headers
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @skipUnless(MessagePackRenderer.available, 'msgpack is not installed')
+    async def test_renderer_is_negotiated(self):
+        """
+        Test that Accept and ?format= pick the renderer like the sync endpoint
+        """
+        url = reverse('async-task-detail', args=[self.task1.id])
+        response = await self.async_client.get(
+            url, headers={**self.headers, 'Accept': 'application/msgpack'}
+        )
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        sync_response = await sync_to_async(self.sync_client.get)(
+            reverse('task-detail', args=[self.task1.id]), HTTP_ACCEPT='application/msgpack'
+        )
+        self.assertEqual(response.content, sync_response.content)
+
+        response = await self.async_client.get(url + '?format=msgpack', headers=self.headers)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+
+        response = await self.async_client.get(
+            url, headers={**self.headers, 'Accept': 'text/csv'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+    async def test_other_users_task_is_not_found(self):
+        """
+        Test that tasks of other users are invisible
+        """
+        response = await self.async_client.get(
+            reverse('async-task-detail', args=[self.foreign.id]), headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {'detail': 'No Task matches the given query.'})
+
+    async def test_create_update_delete(self):
+        """
+        Test the write endpoints, including the status counters
+        """
+        created = await self.async_client.post(
+            reverse('async-task-list'),
+            {'title': 'New', 'description': 'Created async', 'timestamp': '2000-01-01T00:00:00Z'},
+            content_type='application/json',
+            headers=self.headers
+        )
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(created.json()['user'], {'id': self.user.id, 'username': 'asyncuser'})
+        self.assertNotEqual(created.json()['timestamp'], '2000-01-01T00:00:00Z')
+        url = reverse('async-task-detail', args=[created.json()['id']])
+
+        patched = await self.async_client.patch(
+            url, {'status': 'COMPLETED'}, content_type='application/json', headers=self.headers
+        )
+        self.assertEqual(patched.status_code, status.HTTP_200_OK)
+        self.assertEqual(patched.json()['status'], 'COMPLETED')
+        self.assertEqual(patched.json()['title'], 'New')
+
+        replaced = await self.async_client.put(
+            url,
+            {'title': 'Replaced', 'description': 'Put async'},
+            content_type='application/json',
+            headers=self.headers
+        )
+        self.assertEqual(replaced.json()['title'], 'Replaced')
+
+        counts = (await self.get_sync(reverse('task-stats'))).json()['by_status']
+        self.assertEqual(counts['COMPLETED'], 1)
+
+        deleted = await self.async_client.delete(url, headers=self.headers)
+        self.assertEqual(deleted.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(await Task.objects.filter(id=created.json()['id']).aexists())
+
+    async def test_invalid_data_is_rejected(self):
+        """
+        Test that validation errors use DRF's error format
+        """
+        response = await self.async_client.post(
+            reverse('async-task-list'),
+            {'description': 'No title'},
+            content_type='application/json',
+            headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('title', response.json())
+
+    async def test_unauthenticated_requests_are_rejected(self):
+        """
+        Test the 401 response and its authentication challenge
+        """
+        response = await self.async_client.get(reverse('async-task-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+
+        response = await self.async_client.get(
+            reverse('async-task-list'), headers={'Authorization': 'Token wrong'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    async def get_sync(self, url):
+        return await sync_to_async(self.sync_client.get)(url)
@@ -0,0 +1,142 @@
+import base64
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..authentication import TokenCache, hash_key, issue_token, token_cache
+from ..caching import get_task_cache
+from ..models import APIToken, Task
+
+class TokenAuthenticationTest(TestCase):
+    def setUp(self):
+        """
+        Issue a token for a user owning one task
+        """
+        self.user = User.objects.create_user(
+            username='tokenuser',
+            password='testpass123'
+        )
+        Task.objects.create(user=self.user, title='Mine', description='Mine')
+        self.token, self.key = issue_token(self.user, 'tests')
+
+        self.client = APIClient()
+        get_task_cache().clear()
+        token_cache.clear()
+
+    def get_tasks(self, key=None):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key or self.key}')
+        return self.client.get(reverse('task-list'))
+
+    def test_only_the_digest_is_stored(self):
+        """
+        Test that the raw key never reaches the database
+        """
+        self.assertEqual(self.token.digest, hash_key(self.key))
+        self.assertEqual(self.token.prefix, self.key[:8])
+        self.assertFalse(APIToken.objects.filter(digest=self.key).exists())
+
+    def test_token_authenticates(self):
+        """
+        Test that a valid token lists the owner's tasks
+        """
+        response = self.get_tasks()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    @override_settings(TASK_LIST_CACHE_ENABLED=True)
+    def test_verified_token_is_served_from_cache(self):
+        """
+        Test that repeat requests skip the token lookup
+        """
+        self.get_tasks()
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.key}')
+        # Only the cached list page lookup remains, which needs no SQL
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('task-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_invalid_token_is_rejected(self):
+        """
+        Test that an unknown key is refused
+        """
+        response = self.get_tasks('not-a-real-key')
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revocation_invalidates_cached_token(self):
+        """
+        Test that revoking a cached token takes effect immediately
+        """
+        self.assertEqual(self.get_tasks().status_code, status.HTTP_200_OK)
+
+        self.token.revoke()
+
+        self.assertEqual(self.get_tasks().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_token_is_rejected(self):
+        """
+        Test that deleting a cached token takes effect immediately
+        """
+        self.get_tasks()
+
+        APIToken.objects.filter(pk=self.token.pk).delete()
+
+        self.assertEqual(self.get_tasks().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        """
+        Test that deactivating the owner evicts their cached tokens
+        """
+        self.get_tasks()
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.get_tasks().status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_basic_authentication_still_works(self):
+        """
+        Test that existing Basic auth clients keep working
+        """
+        credentials = base64.b64encode(b'tokenuser:testpass123').decode('ascii')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Basic {credentials}')
+        response = self.client.get(reverse('task-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class TokenCacheTest(TestCase):
+    def setUp(self):
+        """
+        Create a user to cache entries for
+        """
+        self.user = User.objects.create_user(username='cached')
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """
+        Test that the cache never grows past its bound
+        """
+        cache = TokenCache(max_size=2, ttl=60)
+        cache.set('a', self.user, 'token-a')
+        cache.set('b', self.user, 'token-b')
+        cache.get('a')
+        cache.set('c', self.user, 'token-c')
+
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('c'))
+
+    def test_entries_expire(self):
+        """
+        Test that entries older than the TTL are dropped
+        """
+        cache = TokenCache(max_size=2, ttl=60)
+        cache.set('a', self.user, 'token-a')
+        expires, user, token = cache.entries['a']
+        cache.entries['a'] = (expires - 61, user, token)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache.entries), 0)
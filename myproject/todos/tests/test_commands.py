@@ -0,0 +1,346 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from ..importer import Checkpoint, TaskImporter
+from ..models import Task, Tag
+from ..overdue import mark_overdue
+from ..seeding import REFERENCE_TIME
+from ..stats import get_status_counts, rebuild_task_stats
+from datetime import timedelta
+
+class ImportTasksCommandTest(TestCase):
+    def setUp(self):
+        """
+        Create the importing user and a scratch directory for input files
+        """
+        self.user = User.objects.create_user(
+            username='importer',
+            password='testpass123'
+        )
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(content)
+        return path
+
+    def test_import_csv(self):
+        """
+        Test importing CSV rows with tags and a rejected row
+        """
+        path = self.write('tasks.csv', (
+            'title,description,status,due_date,tags\n'
+            'First,One,OPEN,2030-01-01T09:00:00Z,home|urgent\n'
+            'Second,Two,,,home\n'
+            ',Missing title,OPEN,,\n'
+        ))
+        Tag.objects.create(name='home')
+        out, err = StringIO(), StringIO()
+
+        call_command('import_tasks', path, user='importer', stdout=out, stderr=err)
+
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 2)
+        first = Task.objects.get(title='First')
+        self.assertEqual(sorted(first.tags.values_list('name', flat=True)), ['home', 'urgent'])
+        self.assertEqual(Task.objects.get(title='Second').status, Task.StatusChoices.OPEN)
+        self.assertIn('Row 3', err.getvalue())
+        self.assertIn('Imported 2 tasks from 3 rows (1 rejected)', out.getvalue())
+
+    def test_import_ndjson_resumes_from_checkpoint(self):
+        """
+        Test that a checkpoint skips rows committed by an earlier run
+        """
+        rows = [
+            {'title': f'Task {i}', 'description': 'Streamed', 'tags': [{'id': 1, 'name': 'x'}]}
+            for i in range(5)
+        ]
+        path = self.write('tasks.ndjson', ''.join(json.dumps(row) + '\n' for row in rows))
+        checkpoint = os.path.join(self.directory.name, 'import.checkpoint')
+        with open(checkpoint, 'w') as handle:
+            json.dump({'rows': 3, 'created': 3}, handle)
+
+        call_command(
+            'import_tasks', path, user='importer', checkpoint=checkpoint,
+            batch_size=1, stdout=StringIO()
+        )
+
+        titles = sorted(Task.objects.values_list('title', flat=True))
+        self.assertEqual(titles, ['Task 3', 'Task 4'])
+        self.assertFalse(os.path.exists(checkpoint))
+
+    def test_checkpoint_advances_on_commit(self):
+        """
+        Test that a batch is only recorded once its transaction commits
+        """
+        checkpoint = Checkpoint(os.path.join(self.directory.name, 'import.checkpoint'))
+        importer = TaskImporter(self.user, batch_size=1, checkpoint=checkpoint)
+        rows = ''.join(json.dumps({'title': f'Task {i}', 'description': 'x'}) + '\n' for i in range(2))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            importer.run(StringIO(rows), 'ndjson')
+            self.assertFalse(os.path.exists(checkpoint.path))
+
+        self.assertEqual(checkpoint.load(), {'rows': 2, 'created': 2, 'failed': 0})
+
+    def test_batches_use_constant_queries(self):
+        """
+        Test that a batch costs the same number of queries whatever its size
+        """
+        def run(count):
+            path = self.write(f'{count}.ndjson', ''.join(
+                json.dumps({'title': f'T{i}', 'description': 'D', 'tags': ['shared']}) + '\n'
+                for i in range(count)
+            ))
+            with CaptureQueriesContext(connection) as context:
+                call_command('import_tasks', path, user='importer', verbosity=0, stdout=StringIO())
+            return len(context.captured_queries)
+
+        Tag.objects.create(name='shared')
+        # The first import also creates the user's status counter row
+        run(1)
+        self.assertEqual(run(2), run(100))
+
+
+class MarkOverdueCommandTest(TestCase):
+    def setUp(self):
+        """
+        Create tasks on both sides of the due date in various statuses
+        """
+        self.user = User.objects.create_user(
+            username='late',
+            password='testpass123'
+        )
+        past = timezone.now() - timedelta(days=1)
+        future = timezone.now() + timedelta(days=1)
+        self.late_open = Task.objects.create(
+            user=self.user, title='Late open', description='x', due_date=past
+        )
+        self.late_review = Task.objects.create(
+            user=self.user, title='Late review', description='x', due_date=past,
+            status=Task.StatusChoices.PENDING_REVIEW
+        )
+        self.late_done = Task.objects.create(
+            user=self.user, title='Late done', description='x', due_date=past,
+            status=Task.StatusChoices.COMPLETED
+        )
+        self.upcoming = Task.objects.create(
+            user=self.user, title='Upcoming', description='x', due_date=future
+        )
+        self.undated = Task.objects.create(user=self.user, title='Undated', description='x')
+
+    def statuses(self):
+        return dict(Task.objects.values_list('title', 'status'))
+
+    def test_marks_only_active_late_tasks(self):
+        """
+        Test which tasks transition and the reported count
+        """
+        out = StringIO()
+        call_command('mark_overdue', batch_size=1, stdout=out)
+
+        self.assertIn('Marked 2 tasks overdue', out.getvalue())
+        self.assertEqual(self.statuses(), {
+            'Late open': Task.StatusChoices.OVERDUE,
+            'Late review': Task.StatusChoices.OVERDUE,
+            'Late done': Task.StatusChoices.COMPLETED,
+            'Upcoming': Task.StatusChoices.OPEN,
+            'Undated': Task.StatusChoices.OPEN,
+        })
+
+    def test_late_changes_are_picked_up(self):
+        """
+        Test that tasks given an earlier due date after a run still transition
+        """
+        self.assertEqual(mark_overdue(), 2)
+
+        backdated = Task.objects.create(
+            user=self.user, title='Backdated', description='x',
+            due_date=timezone.now() - timedelta(days=3)
+        )
+        self.late_done.status = Task.StatusChoices.OPEN
+        self.late_done.save()
+        self.upcoming.due_date = timezone.now() - timedelta(days=30)
+        self.upcoming.save()
+
+        self.assertEqual(mark_overdue(), 3)
+        self.assertEqual(mark_overdue(), 0)
+        backdated.refresh_from_db()
+        self.assertEqual(backdated.status, Task.StatusChoices.OVERDUE)
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite specific')
+    def test_batches_are_read_from_the_index_without_sorting(self):
+        """
+        Test that a batch stops after batch_size index rows instead of sorting every late task
+        """
+        with CaptureQueriesContext(connection) as queries:
+            mark_overdue(batch_size=1)
+        select = next(
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and 'LIMIT 1' in query['sql']
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + select)
+            plan = [row[-1] for row in cursor.fetchall()]
+
+        self.assertTrue(any('todos_task_status_due_idx' in step for step in plan), plan)
+        self.assertFalse(any('TEMP B-TREE' in step for step in plan), plan)
+
+    def test_batches_use_bounded_queries(self):
+        """
+        Test that each batch costs a fixed number of queries
+        """
+        with CaptureQueriesContext(connection) as one_batch:
+            mark_overdue(batch_size=10)
+        self.late_open.status = Task.StatusChoices.OPEN
+        self.late_open.save()
+        self.late_review.status = Task.StatusChoices.OPEN
+        self.late_review.save()
+        with CaptureQueriesContext(connection) as two_batches:
+            mark_overdue(batch_size=1)
+
+        per_batch = len(two_batches.captured_queries) - len(one_batch.captured_queries)
+        self.assertLessEqual(per_batch, 8)
+
+
+class StartupProfileCommandTest(TestCase):
+    def report(self, total):
+        return {
+            'phases': {'setup': total / 2, 'total': total},
+            'apps': ['todos'],
+            'modules': [('todos.models', 1000, 2000, 1)],
+            'by_owner': {'todos': 1.0},
+            'import_ms': 1.0,
+        }
+
+    def test_report_of_an_api_only_worker(self):
+        """
+        Test the report of a fresh API-only worker, whatever its timings
+        """
+        out = StringIO()
+        call_command('startup_profile', api_only=True, json=True, budget=float('inf'), stdout=out)
+
+        report = json.loads(out.getvalue())
+        self.assertNotIn('django.contrib.admin', report['apps'])
+        self.assertIn('todos', report['apps'])
+        self.assertIn('rest_framework', report['by_owner'])
+        self.assertIn('total', report['phases'])
+        self.assertGreater(report['import_ms'], 0)
+
+    def test_budget(self):
+        """
+        Test that the command passes within the budget and fails over it
+        """
+        with mock.patch(
+            'todos.management.commands.startup_profile.profile_startup',
+            return_value=self.report(400.0)
+        ):
+            out = StringIO()
+            call_command('startup_profile', budget=500, stdout=out)
+            self.assertIn('Startup took 400 ms, within the 500 ms budget', out.getvalue())
+
+            with self.assertRaisesMessage(CommandError, 'Startup took 400 ms, over the 300 ms budget'):
+                call_command('startup_profile', budget=300, stdout=StringIO())
+
+            with self.settings(STARTUP_BUDGET_MS=100):
+                with self.assertRaisesMessage(CommandError, 'over the 100 ms budget'):
+                    call_command('startup_profile', json=True, stdout=StringIO())
+
+
+class SeedTasksCommandTest(TestCase):
+    def dataset(self):
+        return list(
+            Task.objects.filter(user__username__startswith='seed-')
+            .order_by('user__username', 'id')
+            .values_list('user__username', 'title', 'status', 'due_date')
+        )
+
+    def test_seed_creates_tasks_tags_and_stats(self):
+        """
+        Test the generated users, tasks, tag links and TaskStats counters
+        """
+        out = StringIO()
+        call_command('seed_tasks', users=3, tasks_per_user=200, tags=20, batch_size=150, stdout=out)
+
+        self.assertIn('Created 600 tasks for 3 users', out.getvalue())
+        self.assertEqual(User.objects.filter(username__startswith='seed-').count(), 3)
+        for user in User.objects.filter(username__startswith='seed-'):
+            self.assertEqual(user.tasks.count(), 200)
+            self.assertFalse(user.has_usable_password())
+            self.assertEqual(get_status_counts(user)['total'], 200)
+        self.assertEqual(rebuild_task_stats(), 0)
+
+        # Active tasks are never generated past their due date
+        self.assertFalse(Task.objects.filter(
+            status=Task.StatusChoices.OPEN, due_date__lt=REFERENCE_TIME
+        ).exists())
+        # Zipf: the top ranked tag is used far more than the last one
+        usage = dict(
+            Tag.objects.filter(name__startswith='tag-')
+            .annotate(uses=Count('task')).values_list('name', 'uses')
+        )
+        self.assertGreater(usage['tag-1'], 5 * usage['tag-20'])
+
+    def test_same_seed_gives_same_data(self):
+        """
+        Test that a seed reproduces the dataset, due dates included, and
+        another seed does not
+        """
+        call_command('seed_tasks', users=2, tasks_per_user=50, seed=7, stdout=StringIO())
+        first = self.dataset()
+        Task.objects.all().delete()
+
+        call_command('seed_tasks', users=2, tasks_per_user=50, seed=7, batch_size=7, stdout=StringIO())
+        second = self.dataset()
+        Task.objects.all().delete()
+
+        call_command('seed_tasks', users=2, tasks_per_user=50, seed=8, stdout=StringIO())
+        self.assertEqual(first, second)
+        self.assertNotEqual(
+            [row[:3] for row in first], [row[:3] for row in self.dataset()]
+        )
+
+    def test_reference_time(self):
+        """
+        Test that the reference time only shifts the generated dates
+        """
+        call_command('seed_tasks', users=1, tasks_per_user=50, stdout=StringIO())
+        first = self.dataset()
+        Task.objects.all().delete()
+
+        call_command(
+            'seed_tasks', users=1, tasks_per_user=50, reference_time='2026-01-08T00:00:00Z',
+            stdout=StringIO()
+        )
+        week = timedelta(days=7)
+        self.assertEqual(
+            [row[:3] + (row[3] and row[3] + week,) for row in first], self.dataset()
+        )
+
+        with self.assertRaisesMessage(CommandError, '--reference-time must be'):
+            call_command('seed_tasks', reference_time='yesterday', stdout=StringIO())
+
+    def test_inserts_are_batched(self):
+        """
+        Test that tasks and their tags are inserted in bulk
+        """
+        with CaptureQueriesContext(connection) as queries:
+            call_command('seed_tasks', users=2, tasks_per_user=1000, batch_size=2000, stdout=StringIO())
+        self.assertLess(len(queries.captured_queries), 40)
+
+    def test_rejects_invalid_sizes(self):
+        """
+        Test that sizes below one are refused
+        """
+        with self.assertRaisesMessage(CommandError, '--workers must be at least 1'):
+            call_command('seed_tasks', workers=0, stdout=StringIO())
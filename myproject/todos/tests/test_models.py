@@ -2,6 +2,7 @@ from django.test import TestCase
 from django.contrib.auth.models import User
 from django.utils import timezone
 from ..models import Task, Tag
+from ..stats import get_status_counts, rebuild_task_stats
 from datetime import timedelta
 
 class TaskModelTest(TestCase):
@@ -119,3 +120,59 @@ class TagModelTest(TestCase):
         # Test unique constraint
         with self.assertRaises(Exception):
             Tag.objects.create(name='Unique Tag')
+
+class TaskStatsTest(TestCase):
+    def setUp(self):
+        """
+        Create a user whose counters start empty
+        """
+        self.user = User.objects.create_user(
+            username='counted',
+            password='testpass123'
+        )
+
+    def counts(self):
+        return get_status_counts(self.user)['by_status']
+
+    def test_counters_follow_creates_updates_and_deletes(self):
+        """
+        Test that saves and deletes keep the counters exact
+        """
+        task = Task.objects.create(user=self.user, title='A', description='A')
+        Task.objects.create(user=self.user, title='B', description='B')
+        self.assertEqual(self.counts()[Task.StatusChoices.OPEN], 2)
+
+        task.status = Task.StatusChoices.COMPLETED
+        task.save()
+        task.save()  # Saving again without a change must not move it twice
+        self.assertEqual(self.counts()[Task.StatusChoices.OPEN], 1)
+        self.assertEqual(self.counts()[Task.StatusChoices.COMPLETED], 1)
+
+        task.delete()
+        self.assertEqual(self.counts()[Task.StatusChoices.COMPLETED], 0)
+        self.assertEqual(get_status_counts(self.user)['total'], 1)
+
+    def test_deferred_status_changes_are_counted(self):
+        """
+        Test that a status assigned on a deferred instance is tracked
+        """
+        Task.objects.create(user=self.user, title='A', description='A')
+        task = Task.objects.only('id', 'user').get(user=self.user)
+
+        task.status = Task.StatusChoices.WORKING
+        task.save()
+
+        self.assertEqual(self.counts()[Task.StatusChoices.OPEN], 0)
+        self.assertEqual(self.counts()[Task.StatusChoices.WORKING], 1)
+
+    def test_rebuild_repairs_drift(self):
+        """
+        Test that rebuilding matches a GROUP BY over the tasks table
+        """
+        Task.objects.create(user=self.user, title='A', description='A')
+        Task.objects.filter(user=self.user).update(status=Task.StatusChoices.CANCELLED)
+
+        self.assertEqual(rebuild_task_stats(), 2)
+        self.assertEqual(self.counts()[Task.StatusChoices.OPEN], 0)
+        self.assertEqual(self.counts()[Task.StatusChoices.CANCELLED], 1)
+        self.assertEqual(rebuild_task_stats(), 0)
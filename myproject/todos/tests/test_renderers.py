@@ -0,0 +1,274 @@
+import datetime
+import decimal
+import gzip
+import io
+import json
+import uuid
+from unittest import mock, skipUnless
+from django.test import SimpleTestCase, TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils.functional import lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..caching import get_task_cache
+from ..middleware import CompressionMiddleware, GzipStream
+from ..models import Task, Tag
+from ..parsers import ORJSONParser
+from ..renderers import ORJSONRenderer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+class ORJSONRendererTest(SimpleTestCase):
+    def assertRendersLikeDRF(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type)
+        )
+
+    def test_output_matches_json_renderer(self):
+        """
+        Test datetimes, choices and the types DRF's encoder handles
+        """
+        self.assertRendersLikeDRF({
+            'aware': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'offset': datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone(datetime.timedelta(hours=2))),
+            'naive': datetime.datetime(2024, 5, 1, 12, 30),
+            'date': datetime.date(2024, 5, 1),
+            'time': datetime.time(8, 15),
+            'duration': datetime.timedelta(minutes=90),
+            'status': Task.StatusChoices.PENDING_REVIEW,
+            'decimal': decimal.Decimal('1.50'),
+            'uuid': uuid.UUID(int=1),
+            'lazy': lazy(lambda: 'translated', str)(),
+            'text': 'caf\u00e9 \u2028 \u2029 "quoted"',
+            'numbers': (1, 2.5, -3, True, None),
+            1: 'integer key',
+        })
+
+    def test_unsupported_data_falls_back(self):
+        """
+        Test that indented output and integers beyond 64 bits match too
+        """
+        self.assertRendersLikeDRF({'big': 2 ** 70})
+        self.assertRendersLikeDRF({'nested': {'a': [1, 2]}}, 'application/json; indent=4')
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+        with self.assertRaises(TypeError):
+            ORJSONRenderer().render({'object': object()})
+
+
+class ORJSONParserTest(SimpleTestCase):
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body))
+
+    def test_parses_like_json_parser(self):
+        """
+        Test that valid documents, escaped surrogates and errors match JSONParser
+        """
+        for body in (b'{"title": "caf\\u00e9", "tags": [1, "home"]}', b'"\\ud800"', b'[]'):
+            self.assertEqual(self.parse(ORJSONParser(), body), self.parse(JSONParser(), body))
+
+        for body in (b'{"title": NaN}', b'{"title": ', b''):
+            with self.assertRaises(ParseError):
+                self.parse(ORJSONParser(), body)
+
+
+class CompressionMiddlewareTest(TestCase):
+    def setUp(self):
+        """
+        Create enough tasks for a list page worth compressing
+        """
+        self.user = User.objects.create_user(
+            username='compressed',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        get_task_cache().clear()
+        tag = Tag.objects.create(name='bulk')
+        for index in range(30):
+            Task.objects.create(
+                user=self.user, title=f'Task {index}', description='Compressible ' * 10
+            ).tags.add(tag)
+
+    def test_list_is_gzipped_when_accepted(self):
+        """
+        Test that a large JSON body is gzipped and decodes to the same data
+        """
+        plain = self.client.get(reverse('task-list'))
+        self.assertFalse(plain.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', plain['Vary'])
+
+        response = self.client.get(reverse('task-list'), HTTP_ACCEPT_ENCODING='br;q=0.5, gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertLess(len(response.content), len(plain.content) / 3)
+        self.assertEqual(json.loads(gzip.decompress(response.content)), plain.json())
+
+    def test_small_bodies_are_not_compressed(self):
+        """
+        Test that a body below TASK_COMPRESSION_MIN_SIZE is sent as is
+        """
+        task = Task.objects.first()
+        response = self.client.get(
+            reverse('task-detail', args=[task.id]), HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_weak_etag_still_matches(self):
+        """
+        Test that the weakened ETag of a compressed page revalidates
+        """
+        url = reverse('task-list')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+        response = self.client.get(
+            url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_streamed_export_is_compressed(self):
+        """
+        Test that a streaming response is compressed chunk by chunk
+        """
+        response = self.client.get(
+            reverse('task-export'), HTTP_ACCEPT='application/x-ndjson', HTTP_ACCEPT_ENCODING='gzip'
+        )
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        lines = gzip.decompress(b''.join(response.streaming_content)).splitlines()
+        self.assertEqual(len(lines), 30)
+
+    def test_stream_flushes_by_size(self):
+        """
+        Test that row-sized chunks are not flushed one by one
+        """
+        rows = [json.dumps({'id': index, 'title': f'Task {index}'}).encode() + b'\n' for index in range(5000)]
+        stream = GzipStream()
+        parts = [part for part in (stream.process(row) for row in rows) if part]
+        parts.append(stream.finish())
+
+        body = b''.join(parts)
+        self.assertEqual(gzip.decompress(body), b''.join(rows))
+        self.assertLess(len(parts), len(rows) / 100)
+        self.assertLess(len(body), 1.2 * len(gzip.compress(b''.join(rows))))
+
+    def test_encoding_negotiation(self):
+        """
+        Test q-values, wildcards and the preference for brotli
+        """
+        middleware = CompressionMiddleware(lambda request: None)
+        with mock.patch('todos.middleware.brotli', mock.Mock()):
+            self.assertEqual(middleware.choose_encoding('gzip, deflate, br'), 'br')
+            self.assertEqual(middleware.choose_encoding('br;q=0.5, gzip'), 'gzip')
+            self.assertEqual(middleware.choose_encoding('*'), 'br')
+        self.assertEqual(middleware.choose_encoding('br'), None)
+        self.assertEqual(middleware.choose_encoding('*;q=0.1'), 'gzip')
+        self.assertEqual(middleware.choose_encoding('gzip;q=0, identity'), None)
+        self.assertEqual(middleware.choose_encoding(''), None)
+
+
+@skipUnless(msgpack is not None, 'msgpack is not installed')
+class MessagePackTest(TestCase):
+    def setUp(self):
+        """
+        Create a tagged task with a due date
+        """
+        self.user = User.objects.create_user(
+            username='binary',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        get_task_cache().clear()
+        self.task = Task.objects.create(
+            user=self.user, title='Packed', description='Binary',
+            due_date=datetime.datetime(2030, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc)
+        )
+        self.task.tags.add(Tag.objects.create(name='binary'))
+
+    def get(self, url, **params):
+        response = self.client.get(url, params, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        return response
+
+    def send(self, method, url, data):
+        return getattr(self.client, method)(
+            url, msgpack.packb(data, datetime=True),
+            content_type='application/msgpack', HTTP_ACCEPT='application/msgpack'
+        )
+
+    def unpack(self, content):
+        return msgpack.unpackb(content, timestamp=3)
+
+    def test_list_matches_json_with_native_timestamps(self):
+        """
+        Test that a page holds the JSON data, with datetimes as timestamps
+        """
+        packed = self.unpack(self.get(reverse('task-list')).content)['results'][0]
+        as_json = self.client.get(reverse('task-list')).json()['results'][0]
+
+        self.assertEqual(packed['due_date'], self.task.due_date)
+        self.assertIsInstance(packed['timestamp'], datetime.datetime)
+        self.assertEqual(
+            JSONRenderer().render(packed), JSONRenderer().render(as_json)
+        )
+
+    def test_retrieved_task_round_trips(self):
+        """
+        Test that a retrieved task can be sent back unchanged
+        """
+        url = reverse('task-detail', args=[self.task.id])
+        data = self.unpack(self.get(url).content)
+
+        response = self.send('put', url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.unpack(response.content), data)
+
+        created = self.send('post', reverse('task-list'), {
+            'title': 'New', 'description': 'Packed', 'due_date': data['due_date'], 'tags': ['binary']
+        })
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.unpack(created.content)['tags'], data['tags'])
+        self.assertEqual(Task.objects.get(title='New').due_date, self.task.due_date)
+
+    def test_batch(self):
+        """
+        Test that the batch endpoint takes and returns MessagePack
+        """
+        response = self.send('post', reverse('task-batch'), {'operations': [
+            {'op': 'create', 'data': {'title': 'Batched', 'description': 'x', 'due_date': self.task.due_date}},
+            {'op': 'delete', 'id': self.task.id},
+        ]})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = self.unpack(response.content)['results']
+        self.assertEqual(results[0]['data']['due_date'], self.task.due_date)
+        self.assertFalse(Task.objects.filter(id=self.task.id).exists())
+
+    def test_export_streams_packed_rows(self):
+        """
+        Test that the export writes one packed object per task
+        """
+        Task.objects.create(user=self.user, title='Second', description='x')
+        response = self.client.get(reverse('task-export'), {'format': 'msgpack'})
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+
+        unpacker = msgpack.Unpacker(timestamp=3)
+        unpacker.feed(b''.join(response.streaming_content))
+        self.assertEqual([row['title'] for row in unpacker], ['Second', 'Packed'])
+
+    def test_malformed_body_is_rejected(self):
+        """
+        Test that an undecodable body is a 400, not a server error
+        """
+        response = self.client.post(
+            reverse('task-list'), b'\xc1', content_type='application/msgpack'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,98 @@
+from django.test import TestCase, RequestFactory
+from django.contrib.admin.sites import site
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..caching import get_task_cache
+from ..models import Task
+from ..search import get_search_backend
+
+class TaskSearchTest(TestCase):
+    def setUp(self):
+        """
+        Create tasks with the search term in different fields
+        """
+        self.user = User.objects.create_user(
+            username='searcher',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        self.client.force_authenticate(user=self.user)
+
+        self.in_title = Task.objects.create(
+            user=self.user, title='Invoice for March', description='Send it'
+        )
+        self.in_description = Task.objects.create(
+            user=self.user, title='Accounting', description='Check the invoice totals'
+        )
+        Task.objects.create(user=self.user, title='Groceries', description='Milk')
+        Task.objects.create(
+            user=User.objects.create_user(username='other', password='testpass456'),
+            title='Invoice of someone else', description='Private'
+        )
+
+    def search(self, query):
+        response = self.client.get(reverse('task-list'), {'q': query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_search_is_ranked(self):
+        """
+        Test that title hits rank above description hits
+        """
+        results = self.search('invoice').data['results']
+
+        self.assertEqual(
+            [task['id'] for task in results],
+            [self.in_title.id, self.in_description.id]
+        )
+        self.assertNotIn('search_rank', results[0])
+
+    def test_index_follows_updates_and_deletes(self):
+        """
+        Test that the index stays in sync with writes
+        """
+        self.in_title.title = 'Receipt for March'
+        self.in_title.save()
+        self.in_description.delete()
+
+        self.assertEqual(self.search('invoice').data['results'], [])
+        self.assertEqual(len(self.search('receipt').data['results']), 1)
+
+    def test_search_results_are_paginated(self):
+        """
+        Test that following the cursor walks ranked results in order
+        """
+        first = self.client.get(reverse('task-list'), {'q': 'invoice', 'limit': 1})
+        second = self.client.get(first.data['next'])
+
+        self.assertEqual(first.data['results'][0]['id'], self.in_title.id)
+        self.assertEqual(second.data['results'][0]['id'], self.in_description.id)
+        self.assertIsNone(second.data['next'])
+
+    def test_query_syntax_is_escaped(self):
+        """
+        Test that search operators in user input are treated as text
+        """
+        for query in ('invoice OR', '"unbalanced', 'NEAR(', '*', 'title:x'):
+            self.search(query)
+
+    def test_admin_uses_search_backend(self):
+        """
+        Test that the admin changelist search goes through the same backend
+        """
+        request = RequestFactory().get('/admin/todos/task/')
+        model_admin = site._registry[Task]
+
+        queryset, may_have_duplicates = model_admin.get_search_results(
+            request, Task.objects.all(), 'invoice'
+        )
+
+        self.assertFalse(may_have_duplicates)
+        self.assertEqual(queryset.count(), 3)
+        self.assertEqual(
+            set(get_search_backend().filter(Task.objects.all(), 'march').values_list('id', flat=True)),
+            {self.in_title.id}
+        )
@@ -0,0 +1,88 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.request import Request
+from ..models import Task, Tag
+from ..serializers import TaskSerializer, TaskReadSerializer
+from datetime import timedelta
+
+class TaskReadSerializerTest(TestCase):
+    def setUp(self):
+        """
+        Create tasks covering every field variation the serializers render
+        """
+        self.user = User.objects.create_user(
+            username='reader',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='someone',
+            password='testpass456'
+        )
+        tags = [Tag.objects.create(name=name) for name in ('b-tag', 'a-tag', 'ünïcode')]
+
+        due = timezone.now().replace(microsecond=123456) + timedelta(days=3)
+        tagged = Task.objects.create(
+            user=self.user,
+            title='Tagged “quotes”',
+            description='Line one\nline two',
+            due_date=due,
+            status=Task.StatusChoices.PENDING_REVIEW
+        )
+        tagged.tags.add(tags[2], tags[0], tags[1])
+        Task.objects.create(
+            user=self.user,
+            title='Plain',
+            description='No due date and no tags'
+        )
+        Task.objects.create(
+            user=self.other,
+            title='Foreign',
+            description='Owned by somebody else',
+            status=Task.StatusChoices.OVERDUE
+        )
+
+        factory = APIRequestFactory()
+        request = factory.get('/api/tasks/')
+        force_authenticate(request, user=self.user)
+        self.request = Request(request)
+        self.request.user  # authenticate
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_output_matches_task_serializer(self):
+        """
+        Test that both serializers render byte-for-byte identical JSON
+        """
+        queryset = Task.objects.order_by('-timestamp', '-id')
+        context = {'request': self.request}
+
+        expected = TaskSerializer(
+            queryset.prefetch_related('tags'), many=True, context=context
+        ).data
+        # Tag order from a plain prefetch is unspecified; the API orders by id
+        for task in expected:
+            task['tags'] = sorted(task['tags'], key=lambda tag: tag['id'])
+
+        rows = TaskReadSerializer.prepare_queryset(queryset)
+        actual = TaskReadSerializer(rows, many=True, context=context).data
+
+        self.assertEqual(self.render(actual), self.render(expected))
+
+    def test_page_renders_with_constant_queries(self):
+        """
+        Test that rendering a page needs one query for tags only
+        """
+        rows = list(TaskReadSerializer.prepare_queryset(
+            Task.objects.filter(user=self.user)
+        ))
+
+        with self.assertNumQueries(1):
+            data = TaskReadSerializer(
+                rows, many=True, context={'request': self.request}
+            ).data
+
+        self.assertEqual(len(data), 2)
@@ -0,0 +1,379 @@
+from unittest import mock
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from ..authentication import issue_token, token_cache
+from ..caching import get_task_cache
+from ..models import Task, Tag
+from ..tags import TagCache, resolve_tag_map, resolve_tag_refs, tag_cache, tag_index
+
+class WritableTagsTest(TestCase):
+    def setUp(self):
+        """
+        Create a user with one tagged task and clear the process caches
+        """
+        self.user = User.objects.create_user(
+            username='tagger',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        get_task_cache().clear()
+        tag_cache.clear()
+
+        self.home = Tag.objects.create(name='home')
+        self.task = Task.objects.create(user=self.user, title='Tagged', description='x')
+        self.task.tags.add(self.home)
+
+    def tag_names(self, task):
+        return sorted(task.tags.values_list('name', flat=True))
+
+    def test_create_with_tag_names(self):
+        """
+        Test that names are resolved, missing tags created and rendered by id
+        """
+        response = self.client.post(reverse('task-list'), {
+            'title': 'New', 'description': 'Tagged by name', 'tags': ['home', ' urgent ', 'home']
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        task = Task.objects.get(title='New')
+        self.assertEqual(self.tag_names(task), ['home', 'urgent'])
+        self.assertEqual(
+            response.data['tags'],
+            [{'id': self.home.id, 'name': 'home'}, {'id': Tag.objects.get(name='urgent').id, 'name': 'urgent'}]
+        )
+        self.assertEqual(Tag.objects.filter(name='home').count(), 1)
+
+    def test_update_writes_only_the_difference(self):
+        """
+        Test that kept links are left alone and the rest is diffed in bulk
+        """
+        work = Tag.objects.create(name='work')
+        self.task.tags.add(work)
+        kept = Task.tags.through.objects.get(task=self.task, tag=self.home).id
+        url = reverse('task-detail', args=[self.task.id])
+
+        with self.assertNumQueries(12):
+            response = self.client.patch(url, {'tags': ['home', 'errands']}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([tag['name'] for tag in response.data['tags']], ['home', 'errands'])
+        self.assertEqual(self.tag_names(self.task), ['errands', 'home'])
+        self.assertEqual(Task.tags.through.objects.get(task=self.task, tag=self.home).id, kept)
+
+        # Omitting tags keeps them, an empty list clears them
+        self.client.patch(url, {'title': 'Renamed'}, format='json')
+        self.assertEqual(self.tag_names(self.task), ['errands', 'home'])
+        self.client.patch(url, {'tags': []}, format='json')
+        self.assertEqual(self.tag_names(self.task), [])
+
+    def test_rendered_tags_can_be_sent_back(self):
+        """
+        Test that the tag objects of a GET are accepted by a PUT
+        """
+        url = reverse('task-detail', args=[self.task.id])
+        data = self.client.get(url).data
+
+        response = self.client.put(url, {
+            'title': data['title'], 'description': data['description'], 'tags': data['tags']
+        }, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['tags'], data['tags'])
+
+    def test_invalid_tags_are_rejected(self):
+        """
+        Test the validation errors for malformed names and unknown ids
+        """
+        url = reverse('task-list')
+        for tags in ('home', [''], ['x' * 51], [12345], [True]):
+            response = self.client.post(url, {
+                'title': 'Bad', 'description': 'Bad', 'tags': tags
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, tags)
+            self.assertIn('tags', response.data)
+        self.assertFalse(Task.objects.filter(title='Bad').exists())
+
+    def test_rejected_writes_create_no_tags(self):
+        """
+        Test that tags named by an invalid request or batch are not created
+        """
+        response = self.client.post(reverse('task-list'), {
+            'title': 'x' * 500, 'description': 'Too long a title', 'tags': ['orphan']
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(reverse('task-batch'), {'atomic': True, 'operations': [
+            {'op': 'create', 'data': {'title': 'Fine', 'description': 'x', 'tags': ['stray']}},
+            {'op': 'create', 'data': {'description': 'No title', 'tags': ['stray']}},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.assertFalse(Tag.objects.filter(name__in=['orphan', 'stray']).exists())
+
+    def test_batch_accepts_names(self):
+        """
+        Test that a batch resolves the names of all its operations at once
+        """
+        def create_ops(count):
+            return [
+                {'op': 'create', 'data': {
+                    'title': f'Bulk {i}', 'description': 'Bulk', 'tags': ['home', f'batch-{i}']
+                }}
+                for i in range(count)
+            ]
+
+        with self.assertNumQueries(13):
+            response = self.client.post(
+                reverse('task-batch'), {'operations': create_ops(20)}, format='json'
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.tag_names(Task.objects.get(title='Bulk 3')), ['batch-3', 'home'])
+
+    def test_concurrently_created_tag_is_reused(self):
+        """
+        Test that losing the race to create a tag resolves to the winner's row
+        """
+        original = Tag.objects.filter
+        calls = []
+
+        def racing_filter(*args, **kwargs):
+            # Another request creates the tag right after our first lookup
+            if calls == [] and 'name__in' not in kwargs:
+                calls.append(True)
+                result = list(original(*args, **kwargs))
+                Tag.objects.create(name='raced')
+                return original(id__in=[tag.id for tag in result])
+            return original(*args, **kwargs)
+
+        with mock.patch.object(Tag.objects, 'filter', side_effect=racing_filter):
+            tag_ids = resolve_tag_map(['raced'])
+
+        self.assertEqual(tag_ids, {'raced': Tag.objects.get(name='raced').id})
+        self.assertEqual(Tag.objects.filter(name='raced').count(), 1)
+
+    def test_resolved_names_are_cached(self):
+        """
+        Test that committed names are served from the cache until the tag changes
+        """
+        with self.captureOnCommitCallbacks(execute=True):
+            resolve_tag_map(['home', 'fresh'])
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                resolve_tag_map(['home', self.home.id]), {'home': self.home.id, self.home.id: self.home.id}
+            )
+
+        self.home.name = 'house'
+        self.home.save()
+        with self.assertNumQueries(3):
+            # 'home' is looked up, then created again as a new tag
+            self.assertNotEqual(resolve_tag_map(['home']), {'home': self.home.id})
+
+        fresh = Tag.objects.get(name='fresh')
+        fresh.delete()
+        self.assertEqual(tag_cache.get_many(['fresh']), {})
+
+    def test_uncommitted_tags_are_not_cached(self):
+        """
+        Test that tags created by a transaction that may roll back stay uncached
+        """
+        tag_ids = resolve_tag_refs({'pending': None, 'home': self.home.id})
+        self.assertEqual(tag_ids, [Tag.objects.get(name='pending').id, self.home.id])
+        self.assertEqual(tag_cache.get_many(['pending']), {})
+
+    def test_cache_is_bounded(self):
+        """
+        Test that the least recently used entries are evicted
+        """
+        cache = TagCache(max_size=2, ttl=60)
+        cache.set_many({'a': 1, 'b': 2})
+        cache.get_many(['a'])
+        cache.set_many({'c': 3})
+        self.assertEqual(cache.get_many(['a', 'b', 'c']), {'a': 1, 'c': 3})
+
+
+class AsyncWritableTagsTest(TestCase):
+    def setUp(self):
+        """
+        Create a user with a token for the async endpoints
+        """
+        self.user = User.objects.create_user(
+            username='asynctagger',
+            password='testpass123'
+        )
+        _, key = issue_token(self.user)
+        self.headers = {'Authorization': f'Token {key}'}
+        get_task_cache().clear()
+        token_cache.clear()
+        tag_cache.clear()
+
+    async def test_async_create_and_update_with_tags(self):
+        """
+        Test that the async endpoints accept tag names like the sync ones
+        """
+        created = await self.async_client.post(
+            reverse('async-task-list'),
+            {'title': 'Async', 'description': 'Tagged', 'tags': ['alpha', 'beta']},
+            content_type='application/json',
+            headers=self.headers
+        )
+        self.assertEqual(created.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([tag['name'] for tag in created.json()['tags']], ['alpha', 'beta'])
+
+        patched = await self.async_client.patch(
+            reverse('async-task-detail', args=[created.json()['id']]),
+            {'tags': ['beta']},
+            content_type='application/json',
+            headers=self.headers
+        )
+        self.assertEqual(patched.status_code, status.HTTP_200_OK)
+        self.assertEqual([tag['name'] for tag in patched.json()['tags']], ['beta'])
+
+
+class TagFacetsTest(TestCase):
+    def setUp(self):
+        """
+        Create two users whose tasks share some tags
+        """
+        self.user = User.objects.create_user(
+            username='faceted',
+            password='testpass123'
+        )
+        other = User.objects.create_user(
+            username='other',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        get_task_cache().clear()
+
+        self.home, self.work, self.urgent = Tag.objects.bulk_create([
+            Tag(name='home'), Tag(name='work'), Tag(name='urgent')
+        ])
+        for index in range(3):
+            task = Task.objects.create(user=self.user, title=f'Work {index}', description='x')
+            task.tags.add(self.work)
+        done = Task.objects.create(
+            user=self.user, title='Chores', description='x', status=Task.StatusChoices.COMPLETED
+        )
+        done.tags.add(self.home, self.work)
+        Task.objects.create(user=other, title='Other', description='x').tags.add(self.urgent)
+        self.url = reverse('tag-facets')
+
+    def test_counts_come_from_one_query_and_are_cached(self):
+        """
+        Test the per-user counts, and that a repeated request is served from the cache
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [
+            {'id': self.work.id, 'name': 'work', 'count': 4},
+            {'id': self.home.id, 'name': 'home', 'count': 1},
+        ])
+
+        with self.assertNumQueries(0):
+            self.client.get(self.url)
+
+    def test_filtered_by_status(self):
+        """
+        Test that ?status= only counts the tasks in that status
+        """
+        response = self.client.get(self.url, {'status': Task.StatusChoices.COMPLETED})
+        self.assertEqual([(tag['name'], tag['count']) for tag in response.data], [('home', 1), ('work', 1)])
+
+        response = self.client.get(self.url, {'status': 'NOPE'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_task_changes_refresh_the_counts(self):
+        """
+        Test that tagging a task is reflected right away despite the cache
+        """
+        self.client.get(self.url)
+        Task.objects.filter(title='Work 0').get().tags.add(self.home)
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.data[1], {'id': self.home.id, 'name': 'home', 'count': 2})
+
+
+class TagSuggestTest(TestCase):
+    def setUp(self):
+        """
+        Create tags to complete and start from an unloaded index
+        """
+        self.user = User.objects.create_user(
+            username='suggested',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        tag_index.clear()
+        get_task_cache().clear()
+        self.task = Task.objects.create(user=self.user, title='Tagged', description='x')
+        self.task.tags.set(Tag.objects.bulk_create([
+            Tag(name=name) for name in ('Work', 'workshop', 'weekend', 'home', 'worker')
+        ]))
+        self.url = reverse('tag-suggest')
+
+    def suggest(self, prefix, **params):
+        response = self.client.get(self.url, {'prefix': prefix, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [tag['name'] for tag in response.data]
+
+    def test_prefix_lookup_ignores_case(self):
+        """
+        Test that matches come in name order, case-insensitively and up to ?limit=
+        """
+        self.assertEqual(self.suggest('WOR'), ['Work', 'worker', 'workshop'])
+        self.assertEqual(self.suggest('w', limit=2), ['weekend', 'Work'])
+        self.assertEqual(self.suggest('x'), [])
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_index_is_updated_incrementally(self):
+        """
+        Test that committed tag writes reach the index without reloading it
+        """
+        self.suggest('wo')
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name='workout')
+            Tag.objects.filter(name='worker').get().delete()
+            weekend = Tag.objects.get(name='weekend')
+            weekend.name = 'Worldwide'
+            weekend.save()
+            resolve_tag_map(['wool'])
+
+        self.task.tags.add(*Tag.objects.filter(name__in=['workout', 'wool']))
+
+        with mock.patch.object(tag_index, 'load', side_effect=AssertionError('reloaded')):
+            self.assertEqual(
+                self.suggest('wo'), ['wool', 'Work', 'workout', 'workshop', 'Worldwide']
+            )
+
+    def test_only_the_users_tags_are_suggested(self):
+        """
+        Test that tags used only by other users stay hidden
+        """
+        other = User.objects.create_user(username='neighbour', password='testpass456')
+        Task.objects.create(user=other, title='Private', description='x').tags.set([
+            Tag.objects.create(name='work-secret'), Tag.objects.get(name='workshop')
+        ])
+
+        self.assertEqual(self.suggest('work'), ['Work', 'worker', 'workshop'])
+        self.assertEqual(self.suggest('work', limit=1), ['Work'])
+
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.suggest('w'), ['work-secret', 'workshop'])
+
+    def test_repeated_suggestions_need_no_queries(self):
+        """
+        Test that once the facets are cached suggestions are served from memory
+        """
+        self.suggest('wo')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest('wo'), ['Work', 'worker', 'workshop'])
@@ -1,8 +1,22 @@
+import csv
+import json
 from django.test import TestCase
 from django.contrib.auth.models import User
 from django.urls import reverse
-from rest_framework.test import APIClient
+from django.test import override_settings
+from unittest import mock, skipUnless
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.utils import timezone
+from datetime import timedelta
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.request import Request
 from rest_framework import status
+from ..caching import get_task_cache, task_list_cache
+from ..batch import TaskBatch
+from ..filters import TaskFilterBackend
+from ..pagination import TaskCursorPagination
 from ..models import Task, Tag
 
 class TaskViewSetIntegrationTest(TestCase):
@@ -22,6 +36,7 @@ class TaskViewSetIntegrationTest(TestCase):
         
         # Create API client
         self.client = APIClient()
+        get_task_cache().clear()
         
         # Authenticate user1
         self.client.force_authenticate(user=self.user1)
@@ -71,7 +86,8 @@ class TaskViewSetIntegrationTest(TestCase):
         response = self.client.get(reverse('task-list'))
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)  # Only user1's tasks
+        self.assertEqual(len(response.data['results']), 2)  # Only user1's tasks
+        self.assertIsNone(response.data['next'])
     
     def test_retrieve_task(self):
         """
@@ -138,6 +154,19 @@ class TaskViewSetIntegrationTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         self.assertEqual(Task.objects.count(), 1)
     
+    def test_task_stats(self):
+        """
+        Test the per-status counts of the authenticated user
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('task-stats'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['by_status'][Task.StatusChoices.OPEN], 1)
+        self.assertEqual(response.data['by_status'][Task.StatusChoices.WORKING], 1)
+        self.assertEqual(response.data['by_status'][Task.StatusChoices.OVERDUE], 0)
+
     def test_cross_user_task_access(self):
         """
         Test that users cannot access tasks of other users
@@ -151,3 +180,792 @@ class TaskViewSetIntegrationTest(TestCase):
         )
         
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TaskPaginationTest(TestCase):
+    def setUp(self):
+        """
+        Create a user with enough tasks to span several pages
+        """
+        self.user = User.objects.create_user(
+            username='pager',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        self.client.force_authenticate(user=self.user)
+
+        # All tasks share one timestamp so that only id breaks the ties
+        Task.objects.bulk_create([
+            Task(user=self.user, title=f'Task {i}', description='Paged')
+            for i in range(7)
+        ])
+        Task.objects.filter(user=self.user).update(
+            timestamp=timezone.now() - timedelta(days=1)
+        )
+
+    def test_cursor_walks_every_task_once(self):
+        """
+        Test that following next links returns each task exactly once, newest first
+        """
+        seen = []
+        url = reverse('task-list') + '?limit=3'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 3)
+            seen.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+
+        expected = list(
+            Task.objects.filter(user=self.user)
+            .order_by('-timestamp', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_cursor_is_stable_when_new_tasks_arrive(self):
+        """
+        Test that tasks created after page one do not shift later pages
+        """
+        first = self.client.get(reverse('task-list') + '?limit=3')
+        Task.objects.create(user=self.user, title='Newer', description='Late')
+
+        second = self.client.get(first.data['next'])
+        ids = [task['id'] for task in second.data['results']]
+        expected = list(
+            Task.objects.filter(user=self.user)
+            .order_by('-timestamp', '-id')
+            .values_list('id', flat=True)[4:7]
+        )
+        self.assertEqual(ids, expected)
+
+    @override_settings(TASK_MAX_PAGE_SIZE=4)
+    def test_limit_is_capped(self):
+        """
+        Test that ?limit= cannot exceed the configured maximum
+        """
+        response = self.client.get(reverse('task-list') + '?limit=1000')
+
+        self.assertEqual(len(response.data['results']), 4)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_invalid_cursor(self):
+        """
+        Test that a tampered cursor is rejected
+        """
+        response = self.client.get(reverse('task-list') + '?cursor=not-a-cursor')
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cursor_with_wrong_types(self):
+        """
+        Test that well-formed cursors holding the wrong values are rejected
+        """
+        paginator = TaskCursorPagination()
+        for position in (
+            ['x', 1], [None, 'a'], [{}, 1], ['2024-05-01T12:00:00', 1],
+            ['2024-13-45T12:00:00+00:00', 1], [timezone.now().isoformat(), 1.5],
+            [timezone.now().isoformat(), True], [1, 2, 3],
+        ):
+            response = self.client.get(
+                reverse('task-list'), {'cursor': paginator.encode_cursor(position)}
+            )
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND, position)
+
+        response = self.client.get(
+            reverse('task-list'), {'q': 'task', 'cursor': paginator.encode_cursor(['best', 1])}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+# Measures the queries of a real render, so the list cache stays out of the way
+@override_settings(TASK_LIST_CACHE_ENABLED=False)
+class TaskQueryCountTest(TestCase):
+    def setUp(self):
+        """
+        Create a user and a small pool of tags to attach to tasks
+        """
+        self.user = User.objects.create_user(
+            username='counter',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        self.client.force_authenticate(user=self.user)
+        self.tags = Tag.objects.bulk_create([
+            Tag(name=f'tag-{i}') for i in range(3)
+        ])
+
+    def create_tagged_tasks(self, count):
+        """
+        Bulk create tasks that each carry every tag
+        """
+        tasks = Task.objects.bulk_create([
+            Task(user=self.user, title=f'Task {i}', description='Counted')
+            for i in range(count)
+        ])
+        Task.tags.through.objects.bulk_create([
+            Task.tags.through(task_id=task.id, tag_id=tag.id)
+            for task in tasks
+            for tag in self.tags
+        ])
+
+    def list_query_count(self):
+        """
+        Return the number of queries needed to render the whole list
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('task-list') + '?limit=10000')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    @override_settings(TASK_MAX_PAGE_SIZE=10000)
+    def test_list_query_count_is_constant(self):
+        """
+        Test that listing 10 or 10,000 tasks costs the same number of queries
+        """
+        self.create_tagged_tasks(10)
+        small_count, response = self.list_query_count()
+        self.assertEqual(len(response.data['results']), 10)
+
+        self.create_tagged_tasks(9990)
+        large_count, response = self.list_query_count()
+        self.assertEqual(len(response.data['results']), 10000)
+
+        self.assertEqual(small_count, large_count)
+        # One query for the page of tasks and one for all of their tags
+        self.assertEqual(large_count, 2)
+
+    def test_retrieve_query_count(self):
+        """
+        Test that the detail view needs no user lookup
+        """
+        self.create_tagged_tasks(1)
+        task = Task.objects.get(user=self.user)
+
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('task-detail', kwargs={'pk': task.id})
+            )
+
+        self.assertEqual(response.data['user']['username'], 'counter')
+        self.assertEqual(len(response.data['tags']), 3)
+
+
+# Inspects the SQL of real renders, so the list cache stays out of the way
+@override_settings(TASK_LIST_CACHE_ENABLED=False)
+class TaskSparseFieldsTest(TestCase):
+    def setUp(self):
+        """
+        Create a user with tagged tasks
+        """
+        self.user = User.objects.create_user(
+            username='sparse',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        self.client.force_authenticate(user=self.user)
+        self.tag = Tag.objects.create(name='mobile')
+        for i in range(3):
+            Task.objects.create(
+                user=self.user, title=f'Task {i}', description='Long text ' * 50
+            ).tags.add(self.tag)
+        self.task = Task.objects.latest('id')
+
+    def get(self, url, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, [query['sql'] for query in context.captured_queries]
+
+    def test_list_reads_only_requested_columns(self):
+        """
+        Test that ?fields= trims both the payload and the SELECT
+        """
+        response, queries = self.get(reverse('task-list'), fields='id,title,status,due_date', limit=2)
+
+        self.assertEqual(
+            response.data['results'][0],
+            {'id': self.task.id, 'title': 'Task 2', 'due_date': None, 'status': 'OPEN'}
+        )
+        # No tag query, and no description in the task query
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"description"', queries[0])
+
+        # The cursor still works without the timestamp being rendered
+        next_page = self.client.get(response.data['next'])
+        self.assertEqual([task['title'] for task in next_page.data['results']], ['Task 0'])
+
+    def test_expand_adds_nested_objects(self):
+        """
+        Test that ?expand= brings back the tags of a sparse selection
+        """
+        response, queries = self.get(reverse('task-list'), fields='id', expand='tags')
+
+        self.assertEqual(
+            response.data['results'][0],
+            {'id': self.task.id, 'tags': [{'id': self.tag.id, 'name': 'mobile'}]}
+        )
+        self.assertEqual(len(queries), 2)
+
+    def test_retrieve_defers_unrequested_columns(self):
+        """
+        Test that the detail view loads only the requested columns
+        """
+        url = reverse('task-detail', args=[self.task.id])
+        response, queries = self.get(url, fields='title,user')
+
+        self.assertEqual(response.data, {'user': {'id': self.user.id, 'username': 'sparse'}, 'title': 'Task 2'})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"description"', queries[0])
+
+        # Without ?fields= everything is rendered as before
+        response, queries = self.get(url)
+        self.assertEqual(len(response.data), 8)
+        self.assertEqual(len(queries), 2)
+
+    def test_unknown_fields_are_rejected(self):
+        """
+        Test the validation errors of ?fields= and ?expand=
+        """
+        response = self.client.get(reverse('task-list'), {'fields': 'id,secret'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('fields', response.data)
+
+        response = self.client.get(reverse('task-detail', args=[self.task.id]), {'expand': 'title'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('expand', response.data)
+
+
+class TaskBatchTest(TestCase):
+    def setUp(self):
+        """
+        Create a user with two tasks and a tag to attach
+        """
+        self.user = User.objects.create_user(
+            username='batcher',
+            password='testpass123'
+        )
+        self.other = User.objects.create_user(
+            username='outsider',
+            password='testpass456'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        self.client.force_authenticate(user=self.user)
+        self.tag = Tag.objects.create(name='Synced')
+        self.task1 = Task.objects.create(
+            user=self.user, title='Keep', description='To update'
+        )
+        self.task2 = Task.objects.create(
+            user=self.user, title='Drop', description='To delete'
+        )
+
+    def post_batch(self, operations, **extra):
+        return self.client.post(
+            reverse('task-batch'),
+            {'operations': operations, **extra},
+            format='json'
+        )
+
+    def test_mixed_operations(self):
+        """
+        Test that creates, updates and deletes are applied together
+        """
+        response = self.post_batch([
+            {'op': 'create', 'data': {
+                'title': 'Fresh', 'description': 'Batched', 'tags': [self.tag.id]
+            }},
+            {'op': 'update', 'id': self.task1.id, 'data': {
+                'status': Task.StatusChoices.COMPLETED
+            }},
+            {'op': 'delete', 'id': self.task2.id},
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        statuses = [result['status'] for result in response.data['results']]
+        self.assertEqual(statuses, [201, 200, 204])
+
+        created = Task.objects.get(title='Fresh')
+        self.assertEqual(created.user, self.user)
+        self.assertEqual(list(created.tags.all()), [self.tag])
+        self.assertEqual(response.data['results'][0]['data']['tags'][0]['name'], 'Synced')
+        self.task1.refresh_from_db()
+        self.assertEqual(self.task1.status, Task.StatusChoices.COMPLETED)
+        self.assertFalse(Task.objects.filter(id=self.task2.id).exists())
+
+        # Bulk writes keep the status counters in step
+        stats = self.client.get(reverse('task-stats')).data
+        self.assertEqual(stats['by_status'][Task.StatusChoices.OPEN], 1)
+        self.assertEqual(stats['by_status'][Task.StatusChoices.COMPLETED], 1)
+        self.assertEqual(stats['total'], 2)
+
+    def test_atomic_batch_rejects_everything(self):
+        """
+        Test that one invalid operation aborts an atomic batch
+        """
+        response = self.post_batch([
+            {'op': 'create', 'data': {'title': 'Valid', 'description': 'Ok'}},
+            {'op': 'update', 'id': self.task1.id, 'data': {'status': 'BOGUS'}},
+        ])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('status', response.data['results'][1]['errors'])
+        self.assertFalse(Task.objects.filter(title='Valid').exists())
+
+    def test_partial_batch_applies_valid_operations(self):
+        """
+        Test that a non-atomic batch applies what it can
+        """
+        foreign = Task.objects.create(
+            user=self.other, title='Foreign', description='Not yours'
+        )
+        response = self.post_batch([
+            {'op': 'create', 'data': {'title': 'Valid', 'description': 'Ok'}},
+            {'op': 'delete', 'id': foreign.id},
+        ], atomic=False)
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(response.data['results'][1]['status'], 404)
+        self.assertTrue(Task.objects.filter(title='Valid').exists())
+        self.assertTrue(Task.objects.filter(id=foreign.id).exists())
+
+    def test_updates_only_write_their_own_fields(self):
+        """
+        Test that a field set by one update is not rewritten on another task
+        from the snapshot loaded before the write
+        """
+        original_validate = TaskBatch.validate
+
+        def validate_then_edit(batch):
+            original_validate(batch)
+            # A concurrent request edits task2 after the batch loaded it
+            Task.objects.filter(id=self.task2.id).update(title='Edited elsewhere')
+
+        with mock.patch.object(TaskBatch, 'validate', validate_then_edit):
+            response = self.post_batch([
+                {'op': 'update', 'id': self.task1.id, 'data': {'title': 'Renamed'}},
+                {'op': 'update', 'id': self.task2.id, 'data': {'status': 'WORKING'}},
+            ])
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.task1.refresh_from_db()
+        self.task2.refresh_from_db()
+        self.assertEqual(self.task1.title, 'Renamed')
+        self.assertEqual(self.task2.title, 'Edited elsewhere')
+        self.assertEqual(self.task2.status, Task.StatusChoices.WORKING)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        """
+        Test that a larger batch issues the same number of queries
+        """
+        def create_ops(count):
+            return [
+                {'op': 'create', 'data': {
+                    'title': f'Bulk {i}', 'description': 'Bulk', 'tags': [self.tag.id]
+                }}
+                for i in range(count)
+            ]
+
+        with CaptureQueriesContext(connection) as small:
+            self.post_batch(create_ops(2))
+        with CaptureQueriesContext(connection) as large:
+            self.post_batch(create_ops(50))
+
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class TaskConditionalGetTest(TestCase):
+    def setUp(self):
+        """
+        Create a user with one task
+        """
+        self.user = User.objects.create_user(
+            username='poller',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        self.client.force_authenticate(user=self.user)
+        self.task = Task.objects.create(
+            user=self.user, title='Polled', description='Watched'
+        )
+
+    def test_unchanged_list_returns_304_without_queries(self):
+        """
+        Test that a matching If-None-Match skips the database entirely
+        """
+        first = self.client.get(reverse('task-list'))
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        etag = first['ETag']
+
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('task-list'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(second['ETag'], etag)
+
+    def test_etag_changes_on_save_delete_and_tags(self):
+        """
+        Test that task saves, deletes and tag changes all produce a new ETag
+        """
+        url = reverse('task-detail', kwargs={'pk': self.task.id})
+        etags = [self.client.get(url)['ETag']]
+
+        self.task.title = 'Renamed'
+        self.task.save()
+        etags.append(self.client.get(url)['ETag'])
+
+        tag = Tag.objects.create(name='Fresh')
+        self.task.tags.add(tag)
+        etags.append(self.client.get(url)['ETag'])
+
+        tag.name = 'Renamed tag'
+        tag.save()
+        etags.append(self.client.get(url)['ETag'])
+
+        Task.objects.create(user=self.user, title='Other', description='New')
+        etags.append(self.client.get(url)['ETag'])
+
+        self.assertEqual(len(set(etags)), len(etags))
+
+    def test_stale_etag_gets_fresh_body(self):
+        """
+        Test that an outdated If-None-Match is answered with the new list
+        """
+        etag = self.client.get(reverse('task-list'))['ETag']
+        self.client.post(
+            reverse('task-list'),
+            {'title': 'Another', 'description': 'Added'},
+            format='json'
+        )
+
+        response = self.client.get(reverse('task-list'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+@override_settings(TASK_LIST_CACHE_ENABLED=True)
+class TaskListCacheTest(TestCase):
+    def setUp(self):
+        """
+        Create a user with a tagged task and start from an empty cache
+        """
+        self.user = User.objects.create_user(
+            username='reader',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        task_list_cache.reset_stats()
+        self.client.force_authenticate(user=self.user)
+        self.tag = Tag.objects.create(name='Cached')
+        self.task = Task.objects.create(
+            user=self.user, title='Cached task', description='Read often'
+        )
+        self.task.tags.add(self.tag)
+
+    def test_repeated_list_is_served_from_cache(self):
+        """
+        Test that the second identical request does not touch the database
+        """
+        first = self.client.get(reverse('task-list'))
+        self.assertEqual(first['X-Cache'], 'MISS')
+
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse('task-list'))
+
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(task_list_cache.stats()['hits'], 1)
+        self.assertEqual(task_list_cache.stats()['misses'], 1)
+
+    def test_query_parameters_are_part_of_the_key(self):
+        """
+        Test that different pages are cached separately
+        """
+        self.client.get(reverse('task-list'))
+        response = self.client.get(reverse('task-list') + '?limit=1')
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_writes_invalidate_cached_pages(self):
+        """
+        Test that task, tag and m2m writes all evict the cached list
+        """
+        url = reverse('task-list')
+        self.client.get(url)
+
+        self.task.status = Task.StatusChoices.WORKING
+        self.task.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['status'], 'WORKING')
+
+        self.tag.name = 'Renamed'
+        self.tag.save()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['tags'][0]['name'], 'Renamed')
+
+        self.task.tags.remove(self.tag)
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['tags'], [])
+
+        self.task.delete()
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'], [])
+
+    def test_cache_is_per_user(self):
+        """
+        Test that one user's cached page is never served to another
+        """
+        self.client.get(reverse('task-list'))
+        other = User.objects.create_user(username='other', password='testpass456')
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get(reverse('task-list'))
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'], [])
+
+
+class TaskExportTest(TestCase):
+    def setUp(self):
+        """
+        Create a user with a handful of tagged tasks
+        """
+        self.user = User.objects.create_user(
+            username='exporter',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        self.client.force_authenticate(user=self.user)
+        tag = Tag.objects.create(name='Backup')
+        for i in range(5):
+            task = Task.objects.create(
+                user=self.user, title=f'Export {i}', description='Row'
+            )
+            task.tags.add(tag)
+        Task.objects.create(
+            user=User.objects.create_user(username='x', password='testpass456'),
+            title='Not mine', description='Hidden'
+        )
+
+    def test_ndjson_export_matches_list(self):
+        """
+        Test that every line is one task rendered like the list endpoint
+        """
+        response = self.client.get(reverse('task-export'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        exported = [json.loads(line) for line in lines]
+
+        listed = self.client.get(reverse('task-list')).json()['results']
+        self.assertEqual(exported, listed)
+
+    def test_csv_export(self):
+        """
+        Test the CSV variant selected through ?format=
+        """
+        response = self.client.get(reverse('task-export') + '?format=csv')
+
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        rows = list(csv.reader(
+            b''.join(response.streaming_content).decode().splitlines()
+        ))
+        self.assertEqual(rows[0][:2], ['id', 'user'])
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][6], 'Backup')
+
+    @override_settings(TASK_EXPORT_CHUNK_SIZE=2)
+    def test_export_fetches_tags_per_chunk(self):
+        """
+        Test that tags are loaded once per chunk rather than once per task
+        """
+        response = self.client.get(reverse('task-export'))
+
+        # One task query plus one tag query for each of the three chunks
+        with self.assertNumQueries(4):
+            lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), 5)
+
+
+class TaskImportEndpointTest(TestCase):
+    def setUp(self):
+        """
+        Create and authenticate the uploading user
+        """
+        self.user = User.objects.create_user(
+            username='uploader',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        self.client.force_authenticate(user=self.user)
+
+    def test_upload_ndjson(self):
+        """
+        Test that an uploaded file is imported for the requesting user
+        """
+        upload = SimpleUploadedFile(
+            'tasks.ndjson',
+            b'{"title": "Uploaded", "description": "From file", "tags": ["imported"]}\n'
+            b'{"title": "Bad", "description": "Bad status", "status": "NOPE"}\n'
+        )
+
+        response = self.client.post(
+            reverse('task-import-tasks'), {'file': upload}, format='multipart'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['failed'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+        task = Task.objects.get(title='Uploaded')
+        self.assertEqual(task.user, self.user)
+        self.assertEqual(task.tags.get().name, 'imported')
+
+    def test_upload_requires_file(self):
+        """
+        Test that a request without a file is rejected
+        """
+        response = self.client.post(reverse('task-import-tasks'), {}, format='multipart')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TaskFilterTest(TestCase):
+    def setUp(self):
+        """
+        Create tasks spread over statuses, due dates and tags
+        """
+        self.user = User.objects.create_user(
+            username='filterer',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        get_task_cache().clear()
+        self.client.force_authenticate(user=self.user)
+        self.home = Tag.objects.create(name='home')
+        self.work = Tag.objects.create(name='work')
+        now = timezone.now()
+
+        self.open_soon = Task.objects.create(
+            user=self.user, title='Open soon', description='A',
+            due_date=now + timedelta(days=1)
+        )
+        self.open_soon.tags.add(self.home, self.work)
+        self.working_later = Task.objects.create(
+            user=self.user, title='Working later', description='B',
+            status=Task.StatusChoices.WORKING, due_date=now + timedelta(days=30)
+        )
+        self.working_later.tags.add(self.work)
+        self.done_undated = Task.objects.create(
+            user=self.user, title='Done undated', description='C',
+            status=Task.StatusChoices.COMPLETED
+        )
+
+    def titles(self, query):
+        response = self.client.get(reverse('task-list') + query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return sorted(task['title'] for task in response.data['results'])
+
+    def test_status_accepts_several_values(self):
+        """
+        Test repeated and comma separated status values
+        """
+        self.assertEqual(self.titles('?status=OPEN'), ['Open soon'])
+        self.assertEqual(
+            self.titles('?status=OPEN&status=COMPLETED'), ['Done undated', 'Open soon']
+        )
+        self.assertEqual(
+            self.titles('?status=WORKING,COMPLETED'), ['Done undated', 'Working later']
+        )
+
+    def test_due_date_filters(self):
+        """
+        Test due date range and presence filters
+        """
+        cutoff = (timezone.now() + timedelta(days=7)).date().isoformat()
+        self.assertEqual(self.titles(f'?due_date_before={cutoff}'), ['Open soon'])
+        self.assertEqual(self.titles(f'?due_date_after={cutoff}'), ['Working later'])
+        self.assertEqual(self.titles('?has_due_date=false'), ['Done undated'])
+        self.assertEqual(
+            self.titles('?has_due_date=true'), ['Open soon', 'Working later']
+        )
+
+    def test_tag_filters(self):
+        """
+        Test any-of and all-of tag matching
+        """
+        tags = f'{self.home.id},{self.work.id}'
+        self.assertEqual(self.titles(f'?tags={tags}'), ['Open soon', 'Working later'])
+        self.assertEqual(self.titles(f'?tags={tags}&tags_match=all'), ['Open soon'])
+
+    def test_invalid_values_are_rejected(self):
+        """
+        Test that malformed filter values produce 400 responses
+        """
+        for query in ('?status=BOGUS', '?due_date_before=soon', '?has_due_date=maybe', '?tags=x'):
+            response = self.client.get(reverse('task-list') + query)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+
+class TaskFilterQueryPlanTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='planner',
+            password='testpass123'
+        )
+
+    def query_plan(self, query):
+        """
+        Return SQLite's plan for the list query produced by the filters
+        """
+        request = Request(APIRequestFactory().get('/api/tasks/' + query))
+        queryset = TaskFilterBackend().filter_queryset(
+            request, Task.objects.filter(user=self.user), view=None
+        ).order_by('-timestamp', '-id')[:51]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertUsesIndexes(self, plan, index=None):
+        for step in plan:
+            # A bare SCAN means reading a whole table
+            self.assertFalse(
+                step.startswith('SCAN') and 'INDEX' not in step,
+                f'table scan in {plan}'
+            )
+        if index is not None:
+            self.assertTrue(any(index in step for step in plan), plan)
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite specific')
+    def test_filters_use_indexes(self):
+        """
+        Test that every filter is answered from an index, never a table scan
+        """
+        self.assertUsesIndexes(
+            self.query_plan('?status=OPEN&due_date_before=2030-01-01'),
+            'todos_task_user_status_due_idx'
+        )
+        self.assertUsesIndexes(
+            self.query_plan('?due_date_after=2020-01-01&due_date_before=2030-01-01'),
+            'todos_task_user_due_idx'
+        )
+        self.assertUsesIndexes(self.query_plan('?status=OPEN,WORKING'))
+        self.assertUsesIndexes(self.query_plan('?has_due_date=false'))
+        self.assertUsesIndexes(self.query_plan('?tags=1,2'))
+        self.assertUsesIndexes(self.query_plan('?tags=1,2&tags_match=all'))
@@ -1,34 +1,129 @@
+import io
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import BasicAuthentication, SessionAuthentication
-from .models import Task
-from .serializers import TaskSerializer
+from django.db.models import Prefetch
+from django.http import StreamingHttpResponse
+from .authentication import CachedTokenAuthentication
+from .batch import BatchRequestSerializer, TaskBatch
+from .caching import CachedListMixin, ConditionalGetMixin
+from .export import iter_task_rows
+from .filters import TaskFilterBackend
+from .importer import FORMATS, TaskImporter, detect_format
+from .models import Task, Tag
+from .pagination import TaskCursorPagination
+from .parsers import MessagePackParser
+from .renderers import CSVRenderer, MessagePackRenderer, NDJSONRenderer
+from .search import TaskSearchFilter
+from .stats import get_status_counts
+from .serializers import (
+    TaskReadSerializer, TaskSerializer, get_field_selection, get_task_columns
+)
+from .tags import get_tag_facets, tag_index
 
-class TaskViewSet(viewsets.ModelViewSet):
+# MessagePack is only negotiated when the msgpack package is installed
+BINARY_RENDERERS = [MessagePackRenderer] if MessagePackRenderer.available else []
+BINARY_PARSERS = [MessagePackParser] if MessagePackParser.available else []
+
+class TaskViewSet(ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
     """
     A ViewSet for handling CRUD operations on Tasks.
     
     Provides the following endpoints:
-    - GET /tasks/: List all tasks
+    - GET /tasks/: List tasks, newest first, one cursor page at a time
     - GET /tasks/{id}/: Retrieve a specific task
     - POST /tasks/: Create a new task
     - PUT /tasks/{id}/: Update an entire task
     - PATCH /tasks/{id}/: Partially update a task
     - DELETE /tasks/{id}/: Delete a task
+    - POST /tasks/batch/: Create, update and delete many tasks at once
+    - GET /tasks/export/: Stream every task as NDJSON or CSV
+    - POST /tasks/import/: Bulk import tasks from an uploaded CSV/NDJSON file
+    - GET /tasks/stats/: Task counts per status
+
+    Besides JSON, the endpoints speak MessagePack when the request's
+    ``Accept`` or ``Content-Type`` is ``application/msgpack``.
+
+    List and retrieve responses carry ETags and honour If-None-Match, and
+    list pages are additionally cached server-side per user. Both accept
+    ``?fields=`` to render only some fields and ``?expand=`` to add the
+    nested user or tags to such a selection; the columns and tags that are
+    not rendered are not read either.
     """
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     
     # Add authentication and permission classes
-    authentication_classes = [BasicAuthentication, SessionAuthentication]
+    # Token first: BasicAuthentication runs the password hasher on every call
+    authentication_classes = [CachedTokenAuthentication, BasicAuthentication, SessionAuthentication]
     permission_classes = [IsAuthenticated]
 
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + BINARY_RENDERERS
+    parser_classes = api_settings.DEFAULT_PARSER_CLASSES + BINARY_PARSERS
+
+    # Keyset pagination on (timestamp, id), see todos.pagination
+    pagination_class = TaskCursorPagination
+
+    # ?status=, ?due_date_before=, ?due_date_after=, ?has_due_date=, ?tags=
+    # and ranked full-text search through ?q=
+    filter_backends = [TaskFilterBackend, TaskSearchFilter]
+
+    # Actions whose responses render nested tags and therefore need them
+    # prefetched in one query instead of one query per task
+    tag_prefetch_actions = ('list', 'retrieve', 'update', 'partial_update')
+
+    # Actions rendered by a dedicated read-only serializer instead of
+    # serializer_class; TaskReadSerializer builds list pages from values()
+    read_serializer_classes = {
+        'list': TaskReadSerializer,
+    }
+
+    # Actions honouring ?fields= and ?expand=
+    sparse_field_actions = ('list', 'retrieve')
+
+    def get_field_selection(self):
+        """
+        Return the fields requested through ?fields= and ?expand=, or None
+        """
+        if self.action not in self.sparse_field_actions:
+            return None
+        if not hasattr(self, '_field_selection'):
+            self._field_selection = get_field_selection(self.request.query_params)
+        return self._field_selection
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_field_selection()
+        return context
+
+    def get_serializer_class(self):
+        return self.read_serializer_classes.get(
+            self.action, super().get_serializer_class()
+        )
+
     def get_queryset(self):
         """
-        Ensure users can only see their own tasks
+        Ensure users can only see their own tasks, loading related rows
+        according to what the current action renders. The nested owner is
+        taken from request.user by the serializer, so no join is needed.
         """
-        return Task.objects.filter(user=self.request.user)
+        queryset = Task.objects.filter(user=self.request.user)
+        fields = self.get_field_selection()
+        serializer_class = self.get_serializer_class()
+        if hasattr(serializer_class, 'prepare_queryset'):
+            return serializer_class.prepare_queryset(queryset, fields)
+        if fields is not None:
+            queryset = queryset.only(*get_task_columns(fields))
+        if self.action in self.tag_prefetch_actions and (fields is None or 'tags' in fields):
+            queryset = queryset.prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.order_by('id'))
+            )
+        return queryset
 
     def perform_create(self, serializer):
         """
@@ -75,3 +170,131 @@ class TaskViewSet(viewsets.ModelViewSet):
             del request.data['timestamp']
         
         return super().partial_update(request, *args, **kwargs)
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        """
+        Apply a list of create/update/delete operations in one transaction.
+
+        Returns 200 when every operation succeeded, 400 when an atomic batch
+        was rejected and 207 when a non-atomic batch partially succeeded.
+        """
+        envelope = BatchRequestSerializer(data=request.data)
+        envelope.is_valid(raise_exception=True)
+
+        batch = TaskBatch(
+            request.user,
+            envelope.validated_data['operations'],
+            context=self.get_serializer_context()
+        )
+        atomic = envelope.get_atomic()
+        results = batch.run(atomic=atomic)
+
+        if not batch.failed:
+            response_status = status.HTTP_200_OK
+        elif atomic:
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response({'atomic': atomic, 'results': results}, status=response_status)
+
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer, *BINARY_RENDERERS])
+    def export(self, request):
+        """
+        Stream all of the user's tasks matching the list filters, newest first.
+
+        The format is negotiated from the Accept header or ``?format=``
+        (``ndjson`` by default, ``csv`` or ``msgpack``). Rows are produced
+        lazily, so memory use does not depend on the number of tasks.
+        """
+        renderer = request.accepted_renderer
+        queryset = self.filter_queryset(self.get_queryset()).order_by('-timestamp', '-id')
+        rows = iter_task_rows(queryset, context=self.get_serializer_context())
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f'{content_type}; charset={renderer.charset}'
+        response = StreamingHttpResponse(renderer.stream(rows), content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="tasks.{renderer.format}"'
+        return response
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_tasks(self, request):
+        """
+        Import tasks from a multipart ``file`` upload.
+
+        The upload is streamed from Django's upload handler through the
+        same batched importer as ``manage.py import_tasks``. The format is
+        taken from ``format`` in the form data or from the file name.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise ValidationError({'file': 'This field is required.'})
+        fmt = request.data.get('format') or detect_format(upload.name)
+        if fmt not in FORMATS:
+            raise ValidationError({'format': f'Expected one of {", ".join(FORMATS)}.'})
+
+        stream = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        summary = TaskImporter(request.user).run(stream, fmt)
+        response_status = status.HTTP_201_CREATED if summary['created'] else status.HTTP_200_OK
+        return Response(summary, status=response_status)
+
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Return the user's task counts per status from the TaskStats table
+        """
+        return Response(get_status_counts(request.user))
+
+
+class TagViewSet(viewsets.GenericViewSet):
+    """
+    Read-only tag helpers for the UI.
+
+    Provides the following endpoints:
+    - GET /tags/facets/: How many of the user's tasks carry each tag,
+      optionally only tasks in ``?status=``
+    - GET /tags/suggest/?prefix=: The user's tag names starting with a
+      prefix, for autocompletion, at most ``?limit=`` of them
+    """
+    queryset = Tag.objects.all()
+    authentication_classes = [CachedTokenAuthentication, BasicAuthentication, SessionAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    # Default and maximum number of suggestions
+    suggest_limit = 10
+    max_suggest_limit = 50
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Return the tag counts of the user's tasks, most used first
+        """
+        task_status = request.query_params.get('status') or None
+        if task_status is not None and task_status not in Task.StatusChoices.values:
+            raise ValidationError({'status': f'Unknown status: {task_status}'})
+        return Response(get_tag_facets(request.user, task_status))
+
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """
+        Return the user's tags whose name starts with ``?prefix=``,
+        ignoring case.
+
+        Served from the in-memory ``tag_index``, narrowed to the tags on
+        the user's tasks (the cached facets) so that the names other
+        users gave their tags never show up.
+        """
+        prefix = request.query_params.get('prefix', '').strip()
+        if not prefix:
+            raise ValidationError({'prefix': 'This parameter is required.'})
+        try:
+            limit = int(request.query_params.get('limit', self.suggest_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'Expected an integer.'})
+        limit = max(1, min(limit, self.max_suggest_limit))
+        tag_ids = {facet['id'] for facet in get_tag_facets(request.user)}
+        return Response([
+            {'id': tag_id, 'name': name}
+            for tag_id, name in tag_index.search(prefix, limit, tag_ids)
+        ])
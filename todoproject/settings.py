@@ -75,14 +75,48 @@ WSGI_APPLICATION = 'todoproject.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
+#
+# Configured from DATABASE_URL (SQLite file next to manage.py when unset).
+# DB_CONN_MAX_AGE keeps connections open across requests and
+# DB_CONN_HEALTH_CHECKS pings a reused connection before the request uses
+# it. For PostgreSQL, DB_POOL=True switches to psycopg 3's connection pool
+# (sized by DB_POOL_MIN_SIZE/DB_POOL_MAX_SIZE), which replaces persistent
+# connections. SQLite connections get WAL and the pragmas below unless
+# SQLITE_TUNING=False.
 
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': dj_database_url.config(
+        default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+        conn_max_age=int(os.environ.get('DB_CONN_MAX_AGE', '60')),
+        conn_health_checks=os.environ.get('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+    )
 }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    if os.environ.get('DB_POOL', 'False') == 'True':
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+            'timeout': int(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        }
+elif (DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3'
+        and os.environ.get('SQLITE_TUNING', 'True') == 'True'):
+    DATABASES['default'].setdefault('OPTIONS', {}).update({
+        # WAL lets readers run alongside the single writer; NORMAL only
+        # syncs at checkpoints, which is durable enough in WAL mode
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            f"PRAGMA mmap_size={os.environ.get('SQLITE_MMAP_SIZE', '134217728')};"
+            f"PRAGMA busy_timeout={os.environ.get('SQLITE_BUSY_TIMEOUT', '5000')};"
+            'PRAGMA temp_store=MEMORY;'
+        ),
+        # Take the write lock when the transaction starts, so two
+        # transactions never deadlock upgrading their read locks
+        'transaction_mode': 'IMMEDIATE',
+    })
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators